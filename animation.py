@@ -0,0 +1,166 @@
+import assets
+import atlas
+
+# 애니메이션 클립
+# 스프라이트 시트(Sheet)는 로드할 때 프레임마다 clip_draw 영역 (left, bottom, w, h) 표를 한 번 만들어 둡니다.
+# 클립(Clip)은 시트와 프레임 길이(초), 반복 여부만 가진 공유 정의이고,
+# 재생 상태(경과 시간, 현재 프레임)는 인스턴스마다 Player가 가집니다.
+# 그릴 때는 표에서 현재 프레임의 영역을 꺼내 그대로 넘기므로 프레임 좌표 계산이 없습니다.
+#
+# 시트의 프레임 순서는 pico2d의 clip_draw 좌표와 같습니다: 왼쪽 아래 프레임이 0번이고,
+# 한 줄의 오른쪽으로 진행한 뒤 위 줄로 올라갑니다. (세로 한 줄 시트는 아래에서 위로)
+#
+# 사용법:
+#   run = animation.Clip(animation.Sheet('resources/B_witch_run.png', (32, 48), draw_size=(100, 100)), 0.1)
+#   player = animation.Player(run)   # 처음 재생할 때 시트를 로드
+#   player.update(dt)                # 실제 경과 시간(초)으로 프레임 진행
+#   player.draw(x, y)                # player.draw(x, y, flip='h')는 좌우 반전
+
+
+def frame_rects(left, bottom, width, height, frame_w, frame_h, count=None):
+    """(left, bottom)부터 width x height 영역을 frame_w x frame_h 격자로 나눈 프레임 영역 표"""
+    cols = max(1, width // frame_w)
+    rows = max(1, height // frame_h)
+    n = cols * rows if count is None else min(count, cols * rows)
+    return tuple((left + (i % cols) * frame_w, bottom + (i // cols) * frame_h, frame_w, frame_h)
+                 for i in range(n))
+
+
+class Sheet:
+    """프레임 크기가 일정한 스프라이트 시트.
+      - frame_size: 프레임 하나의 원본 크기 (w, h). None이면 이미지 전체가 한 프레임
+      - draw_size: 화면에 그리는 프레임 크기. None이면 원본 크기
+        (미리 크기를 바꿔 둔 캐시(rawcache)가 최신이면 그 이미지를 로드해 확대 없이 그림)
+      - count: 프레임 수. None이면 격자에 들어가는 만큼
+    이미지는 load()(또는 처음 재생할 때) 공유 에셋 관리자로 로드하고 unload()로 반납합니다.
+    """
+
+    __slots__ = ('path', 'frame_size', 'draw_size', 'count', 'image', 'rects', '_loaded_path')
+
+    def __init__(self, path, frame_size=None, draw_size=None, count=None):
+        self.path = path
+        self.frame_size = frame_size
+        self.draw_size = draw_size
+        self.count = count
+        self.image = None
+        self.rects = ()
+        self._loaded_path = None
+
+    def texture_path(self):
+        """실제로 로드할 파일 (씬 선언과 미리 로드 목록용)"""
+        return atlas.image_path(self._source()[0])
+
+    def _source(self):
+        if self.draw_size is None:
+            return self.path, self.frame_size
+        return assets.scaled_path(self.path, self.frame_size, self.draw_size)
+
+    @property
+    def loaded(self):
+        return self.image is not None
+
+    def load(self):
+        if self.image is not None:
+            return
+        path, frame_size = self._source()
+        sprite = atlas.get_sprite(path)
+        fw, fh = frame_size or (sprite.w, sprite.h)
+        self.rects = frame_rects(sprite.left, sprite.bottom, sprite.w, sprite.h, fw, fh, self.count)
+        self.image = sprite.image
+        self._loaded_path = path
+
+    def unload(self):
+        if self.image is None:
+            return
+        atlas.release_sprite(self._loaded_path)
+        self.image = None
+        self.rects = ()
+        self._loaded_path = None
+
+    def __len__(self):
+        return len(self.rects)
+
+    def __repr__(self):
+        return '<Sheet {} frames={} {}>'.format(self.path, len(self.rects), 'loaded' if self.image else 'unloaded')
+
+
+class Clip:
+    """시트를 frame_time초 간격으로 재생하는 클립. loop가 False면 마지막 프레임에서 멈춥니다."""
+
+    __slots__ = ('name', 'sheet', 'frame_time', 'loop')
+
+    def __init__(self, sheet, frame_time, loop=True, name=None):
+        self.name = name
+        self.sheet = sheet
+        self.frame_time = frame_time
+        self.loop = loop
+
+    @property
+    def duration(self):
+        return self.frame_time * len(self.sheet)
+
+
+class Player:
+    """클립 하나의 재생 상태. speed는 재생 속도 배율입니다."""
+
+    __slots__ = ('clip', 'time', 'frame', 'speed', 'done')
+
+    def __init__(self, clip=None):
+        self.clip = None
+        self.time = 0.0
+        self.frame = 0
+        self.speed = 1.0
+        self.done = False
+        if clip is not None:
+            self.play(clip)
+
+    def play(self, clip, restart=False):
+        """clip을 처음부터 재생합니다. 이미 재생 중인 클립이면 restart가 True일 때만 처음으로 돌아갑니다.
+        시트가 아직 로드되지 않았으면 지금 로드합니다."""
+        if clip is self.clip and not restart:
+            return
+        clip.sheet.load()
+        self.clip = clip
+        self.time = 0.0
+        self.frame = 0
+        self.done = False
+
+    def stop(self):
+        """재생을 멈춥니다. (클립의 시트를 반납하기 전에)"""
+        self.clip = None
+
+    def update(self, dt):
+        """dt초만큼 진행합니다."""
+        clip = self.clip
+        if clip is None or self.done:
+            return
+        count = len(clip.sheet.rects)
+        self.time += dt * self.speed
+        frame = int(self.time / clip.frame_time)
+        if frame < count:
+            self.frame = frame
+        elif clip.loop:
+            # 오래 재생해도 시간이 커지지 않도록 한 바퀴를 뺌
+            self.time %= clip.frame_time * count
+            self.frame = int(self.time / clip.frame_time) % count
+        else:
+            self.frame = count - 1
+            self.done = True
+
+    @property
+    def rect(self):
+        """현재 프레임의 clip_draw 영역 (left, bottom, w, h)"""
+        return self.clip.sheet.rects[self.frame]
+
+    def draw(self, x, y, w=None, h=None, flip=''):
+        """현재 프레임을 (x, y) 중심에 그립니다. 크기를 주지 않으면 시트의 draw_size(없으면 원본 크기)."""
+        sheet = self.clip.sheet
+        left, bottom, fw, fh = sheet.rects[self.frame]
+        if w is None:
+            w, h = sheet.draw_size or (fw, fh)
+        if flip:
+            sheet.image.clip_composite_draw(left, bottom, fw, fh, 0, flip, x, y, w, h)
+        else:
+            sheet.image.clip_draw(left, bottom, fw, fh, x, y, w, h)
+
+# end of animation.py
@@ -0,0 +1,194 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import atlas_build
+import pngio
+import rawcache
+
+# 오프라인 에셋 빌드
+# 1. 텍스처 아틀라스가 원본과 맞지 않으면 다시 만듭니다. (atlas_build.py)
+# 2. rawcache의 목록에 있는 PNG를 raw RGBA로 풀어 캐시 폴더(.asset_cache)에 씁니다.
+#    SCALED_IMAGES는 화면에 그리는 크기로 미리 바꾼 변형(최근접 이웃)을 씁니다.
+# 캐시 파일 이름은 원본 내용 + 변형의 해시라서 바뀐 것만 다시 씁니다.
+#
+# 예)
+#   python asset_build.py            # 바뀐 것만 다시 빌드
+#   python asset_build.py --clean    # 캐시를 지우고 모두 다시 빌드
+#   python asset_build.py --check    # 캐시가 최신인지만 확인 (다르면 종료 코드 1)
+#   python asset_build.py --check-load   # 캔버스를 열고 캐시 파일을 모두 실제로 텍스처로 올려 봄
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description='build texture atlases and the pre-decoded sprite cache')
+    parser.add_argument('--check', action='store_true', help='빌드하지 않고 아틀라스와 캐시가 최신인지만 확인')
+    parser.add_argument('--clean', action='store_true', help='캐시 폴더의 raw 파일을 지우고 모두 다시 빌드')
+    parser.add_argument('--check-load', action='store_true',
+                        help='캔버스를 열고 raw 파일을 모두 gfx.decode_raw -> upload_image로 올려 봄')
+    parser.add_argument('--cache-dir', default=rawcache.CACHE_DIR, help='캐시 폴더')
+    return parser.parse_args(argv)
+
+
+def targets():
+    """원본 상대 경로 -> [(프레임 크기, 화면 크기), ...] (native는 (None, None))"""
+    result = {}
+    for path in rawcache.expand(rawcache.NATIVE_IMAGES):
+        result.setdefault(path, []).append((None, None))
+    for pattern, frame_size, draw_size in rawcache.SCALED_IMAGES:
+        for path in rawcache.expand([pattern]):
+            result.setdefault(path, []).append((frame_size, draw_size))
+    return result
+
+
+def scale(w, h, rgba, frame_size, draw_size):
+    """frame_size 프레임이 draw_size가 되도록 이미지 전체를 최근접 이웃으로 크기를 바꿉니다.
+    프레임 격자가 그대로 유지되므로 프레임 (col, row)는 draw_size 단위로 잘라 그리면 됩니다."""
+    fw, fh = frame_size or (w, h)
+    dw, dh = draw_size
+    out_w = max(1, round(w * dw / fw))
+    out_h = max(1, round(h * dh / fh))
+    xs = [min(w - 1, (x * 2 + 1) * fw // (dw * 2)) * 4 for x in range(out_w)]
+    out = bytearray(out_w * out_h * 4)
+    pos = 0
+    for y in range(out_h):
+        sy = min(h - 1, (y * 2 + 1) * fh // (dh * 2))
+        row = rgba[sy * w * 4:(sy + 1) * w * 4]
+        for sx in xs:
+            out[pos:pos + 4] = row[sx:sx + 4]
+            pos += 4
+    return out_w, out_h, out
+
+
+def _digest(content_sha1, key):
+    return hashlib.sha1('{}:{}:{}'.format(rawcache.FORMAT_VERSION, content_sha1, key).encode()).hexdigest()
+
+
+def build(cache_dir=rawcache.CACHE_DIR, clean=False):
+    """캐시를 빌드하고 manifest의 sources dict를 반환합니다."""
+    os.makedirs(cache_dir, exist_ok=True)
+    if clean:
+        for name in os.listdir(cache_dir):
+            if rawcache.is_raw(name):
+                os.remove(os.path.join(cache_dir, name))
+    sources = {}
+    written = reused = 0
+    for rel, variants in targets().items():
+        src = os.path.join(rawcache.BASE_DIR, rel)
+        with open(src, 'rb') as f:
+            content_sha1 = hashlib.sha1(f.read()).hexdigest()
+        st = os.stat(src)
+        decoded = None
+        entry = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha1': content_sha1, 'variants': {}}
+        for frame_size, draw_size in variants:
+            key = rawcache.variant_key(frame_size, draw_size)
+            name = _digest(content_sha1, key) + rawcache.EXTENSION
+            raw_path = os.path.join(cache_dir, name)
+            if os.path.exists(raw_path):
+                # 같은 내용의 같은 변형이 이미 있음
+                w, h = _raw_size(raw_path)
+                reused += 1
+            else:
+                if decoded is None:
+                    decoded = pngio.read_png(src)
+                w, h, rgba = decoded
+                if draw_size is not None:
+                    w, h, rgba = scale(w, h, rgba, frame_size, draw_size)
+                rawcache.write_raw(raw_path, w, h, rgba)
+                written += 1
+            entry['variants'][key] = {'file': name, 'w': w, 'h': h}
+        sources[rel] = entry
+    with open(os.path.join(cache_dir, rawcache.MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump({'version': rawcache.MANIFEST_VERSION, 'sources': sources}, f, indent=1, sort_keys=True)
+        f.write('\n')
+    removed = _remove_unused(cache_dir, sources)
+    print('sprite cache: {} written, {} unchanged, {} removed -> {}'.format(written, reused, removed, cache_dir))
+    return sources
+
+
+def _raw_size(raw_path):
+    with open(raw_path, 'rb') as f:
+        _, _, _, w, h = rawcache.HEADER.unpack(f.read(rawcache.HEADER_SIZE))
+    return w, h
+
+
+def _remove_unused(cache_dir, sources):
+    """manifest에 없는 raw 파일(원본이 바뀌기 전의 캐시)을 지웁니다."""
+    used = {v['file'] for entry in sources.values() for v in entry['variants'].values()}
+    removed = 0
+    for name in os.listdir(cache_dir):
+        if rawcache.is_raw(name) and name not in used:
+            os.remove(os.path.join(cache_dir, name))
+            removed += 1
+    return removed
+
+
+def check(cache_dir=rawcache.CACHE_DIR):
+    """캐시가 원본과 맞지 않는 항목의 설명 목록을 반환합니다. 비어 있으면 최신입니다."""
+    sources = rawcache.load_manifest(cache_dir)
+    problems = []
+    for rel, variants in targets().items():
+        entry = sources.get(rel)
+        if entry is None:
+            problems.append('캐시에 없음: ' + rel)
+            continue
+        st = os.stat(os.path.join(rawcache.BASE_DIR, rel))
+        if st.st_size != entry['size'] or st.st_mtime_ns != entry['mtime_ns']:
+            problems.append('바뀐 파일: ' + rel)
+            continue
+        for frame_size, draw_size in variants:
+            variant = entry['variants'].get(rawcache.variant_key(frame_size, draw_size))
+            if variant is None or not os.path.exists(os.path.join(cache_dir, variant['file'])):
+                problems.append('변형이 없음: {} {}'.format(rel, rawcache.variant_key(frame_size, draw_size)))
+    return problems + rawcache.check_mappings(cache_dir)
+
+
+def check_load(cache_dir=rawcache.CACHE_DIR):
+    """게임과 같은 경로(gfx.decode_raw -> gfx.upload_image)로 raw 파일을 모두 텍스처로 올려 봅니다.
+    매핑을 닫지 못하거나 텍스처를 만들 수 없는 파일의 설명 목록을 반환합니다. pico2d(SDL)가 필요합니다."""
+    from pico2d import open_canvas, close_canvas
+    import gfx
+    problems = []
+    open_canvas(64, 64)
+    try:
+        for name in sorted(os.listdir(cache_dir)):
+            if not rawcache.is_raw(name):
+                continue
+            try:
+                gfx.upload_image(gfx.decode_raw(os.path.join(cache_dir, name)))
+            except (IOError, BufferError) as ex:
+                problems.append('텍스처로 올릴 수 없음: {} ({})'.format(name, ex))
+        if gfx._mapped:
+            problems.append('닫히지 않은 매핑 {}개'.format(len(gfx._mapped)))
+    finally:
+        close_canvas()
+    return problems
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    if args.check_load:
+        problems = check_load(args.cache_dir)
+        for line in problems:
+            print(line)
+        print('raw 파일 로드: {}'.format('실패' if problems else '정상'))
+        return 1 if problems else 0
+    if args.check:
+        problems = atlas_build.check() + check(args.cache_dir)
+        for line in problems:
+            print(line)
+        if problems:
+            print('에셋 빌드가 최신이 아닙니다. python asset_build.py로 다시 만드세요.')
+            return 1
+        print('에셋 빌드가 최신입니다.')
+        return 0
+    if atlas_build.check():
+        atlas_build.build()
+    build(args.cache_dir, clean=args.clean)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
+
+# end of asset_build.py
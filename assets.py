@@ -0,0 +1,224 @@
+from pico2d import *
+import os
+import time
+from collections import OrderedDict
+import gfx
+import rawcache
+
+# 공유 에셋 관리자
+# 이미지와 폰트를 (경로, 크기) 키로 한 번만 로드해서 모든 모듈이 같이 씁니다.
+# - get_image()/get_font()는 참조 카운트를 1 늘리고, release_image()/release_font()는 1 줄입니다.
+# - 참조 카운트가 0인 항목은 바로 버리지 않고 LRU 순서로 남겨 두었다가,
+#   예상 메모리 사용량이 memory_budget을 넘을 때 오래된 것부터 내보냅니다.
+# - 사용 중인(참조 카운트 > 0) 항목은 예산을 넘어도 내보내지 않습니다.
+# - 미리 디코드한 캐시(rawcache)가 최신인 이미지는 PNG 대신 raw 파일을 메모리 매핑해서 올립니다.
+
+# 에셋 경로의 기준 디렉터리 (상대 경로는 이 폴더 기준으로 해석)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 기본 메모리 예산 (바이트)
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+# 폰트 하나의 예상 메모리 사용량 (글리프 캐시 포함, 대략값)
+FONT_COST = 256 * 1024
+
+memory_budget = DEFAULT_MEMORY_BUDGET
+
+# 파일을 새로 로드할 때마다 불리는 함수 listener(경로, 폰트 크기 또는 None, 걸린 초, 미리 로드 여부)
+# (startup이 시작 시간 보고서를 만들 때 설정함)
+load_listener = None
+
+# key -> _Entry, 앞쪽이 가장 오래 전에 사용된 항목
+_entries = OrderedDict()
+# 현재 캐시에 올라와 있는 에셋의 예상 메모리 합계
+_resident_bytes = 0
+
+
+class _Entry:
+    __slots__ = ('asset', 'refcount', 'cost')
+
+    def __init__(self, asset, cost):
+        self.asset = asset
+        self.refcount = 0
+        self.cost = cost
+
+
+def resolve_path(path):
+    """상대 경로를 프로젝트 폴더 기준의 절대 경로로 바꿉니다."""
+    if os.path.isabs(path):
+        return os.path.normpath(path)
+    return os.path.normpath(os.path.join(BASE_DIR, path))
+
+
+def _image_cost(image):
+    try:
+        return image.w * image.h * 4
+    except Exception:
+        return 0
+
+
+def _acquire(key, loader, cost_func):
+    global _resident_bytes
+    entry = _entries.get(key)
+    if entry is None:
+        started = time.perf_counter()
+        asset = loader()
+        if load_listener is not None:
+            load_listener(key[0], key[1], time.perf_counter() - started)
+        entry = _Entry(asset, cost_func(asset))
+        _entries[key] = entry
+        _resident_bytes += entry.cost
+    else:
+        _entries.move_to_end(key)
+    entry.refcount += 1
+    _evict()
+    return entry.asset
+
+
+def _release(key):
+    entry = _entries.get(key)
+    if entry is None or entry.refcount <= 0:
+        return
+    entry.refcount -= 1
+    if entry.refcount == 0:
+        _evict()
+
+
+def _evict():
+    """메모리 예산을 넘으면 사용하지 않는 항목을 LRU 순서로 내보냅니다."""
+    global _resident_bytes
+    if _resident_bytes <= memory_budget:
+        return
+    for key in list(_entries.keys()):
+        if _resident_bytes <= memory_budget:
+            break
+        entry = _entries[key]
+        if entry.refcount > 0:
+            continue
+        del _entries[key]
+        _resident_bytes -= entry.cost
+
+
+def _raw_path(full_path):
+    """full_path 대신 읽을 raw 캐시 파일. 없으면 None"""
+    if rawcache.is_raw(full_path):
+        return full_path
+    return rawcache.lookup(full_path)
+
+
+def _load_image(full_path):
+    raw = _raw_path(full_path)
+    if raw is None:
+        return load_image(full_path)
+    return gfx.upload_image(gfx.decode_raw(raw))
+
+
+def decode_image(path):
+    """path의 이미지를 텍스처로 올리기 전 단계까지 읽습니다. (작업 스레드용, gfx.upload_image()로 올림)"""
+    full_path = resolve_path(path)
+    raw = _raw_path(full_path)
+    if raw is None:
+        return gfx.decode_image(full_path)
+    return gfx.decode_raw(raw)
+
+
+def scaled_path(path, frame_size=None, draw_size=None):
+    """frame_size 크기의 프레임을 draw_size 크기로 그릴 때 로드할 경로와 그 이미지 안의 프레임 크기를 반환합니다.
+    화면 크기로 미리 바꿔 둔 캐시가 최신이면 (raw 파일 경로, draw_size), 아니면 (path, frame_size).
+    frame_size가 None이면 이미지 전체가 한 프레임입니다."""
+    raw = rawcache.lookup(resolve_path(path), frame_size, draw_size)
+    if raw is None:
+        return path, frame_size
+    return raw, draw_size
+
+
+def get_image(path):
+    """공유 이미지를 반환합니다. 같은 경로는 한 번만 로드됩니다. open_canvas() 이후에 호출해야 합니다."""
+    full_path = resolve_path(path)
+    return _acquire((full_path, None), lambda: _load_image(full_path), _image_cost)
+
+
+def get_font(path, size=20):
+    """공유 폰트를 반환합니다. (경로, 크기)가 같으면 한 번만 로드됩니다."""
+    full_path = resolve_path(path)
+    return _acquire((full_path, size), lambda: load_font(full_path, size), lambda font: FONT_COST)
+
+
+def has_image(path):
+    """path의 이미지가 캐시에 올라와 있으면 True (참조 카운트와 관계없음)"""
+    return (resolve_path(path), None) in _entries
+
+
+def put_image(path, image, load_seconds=None):
+    """다른 곳에서 로드한 이미지(예: preloader가 미리 올린 텍스처)를 참조 카운트 0으로 캐시에 넣습니다.
+    이후 get_image(path)는 다시 로드하지 않고 이 이미지를 돌려줍니다. 이미 있으면 넣지 않고 False를 반환합니다.
+    load_seconds를 주면 로드 시간 기록(load_listener)에 남깁니다."""
+    global _resident_bytes
+    key = (resolve_path(path), None)
+    if key in _entries:
+        return False
+    if load_listener is not None and load_seconds is not None:
+        load_listener(key[0], None, load_seconds, True)
+    entry = _Entry(image, _image_cost(image))
+    _entries[key] = entry
+    _resident_bytes += entry.cost
+    _evict()
+    return True
+
+
+def release_image(path):
+    """get_image()로 얻은 이미지를 더 이상 쓰지 않음을 알립니다."""
+    _release((resolve_path(path), None))
+
+
+def release_font(path, size=20):
+    """get_font()로 얻은 폰트를 더 이상 쓰지 않음을 알립니다."""
+    _release((resolve_path(path), size))
+
+
+def _purge(key):
+    global _resident_bytes
+    entry = _entries.get(key)
+    if entry is None or entry.refcount > 0:
+        return False
+    del _entries[key]
+    _resident_bytes -= entry.cost
+    return True
+
+
+def purge_image(path):
+    """참조가 남아 있지 않은 이미지를 예산과 관계없이 바로 내보냅니다. 아직 쓰는 곳이 있으면 그대로 둡니다.
+    내보냈으면 True를 반환합니다."""
+    return _purge((resolve_path(path), None))
+
+
+def purge_font(path, size=20):
+    """참조가 남아 있지 않은 폰트를 바로 내보냅니다."""
+    return _purge((resolve_path(path), size))
+
+
+def set_memory_budget(budget_bytes):
+    """메모리 예산을 바꾸고, 넘는 만큼 사용하지 않는 항목을 내보냅니다."""
+    global memory_budget
+    memory_budget = max(0, int(budget_bytes))
+    _evict()
+
+
+def stats():
+    """캐시 상태 요약을 반환합니다."""
+    in_use = sum(1 for e in _entries.values() if e.refcount > 0)
+    return {
+        'entries': len(_entries),
+        'in_use': in_use,
+        'idle': len(_entries) - in_use,
+        'resident_bytes': _resident_bytes,
+        'memory_budget': memory_budget,
+    }
+
+
+def clear():
+    """모든 캐시 항목을 버립니다. (close_canvas() 전에 호출)"""
+    global _resident_bytes
+    _entries.clear()
+    _resident_bytes = 0
+
+# end of assets.py
@@ -0,0 +1,110 @@
+import json
+import os
+import assets
+
+# 텍스처 아틀라스 색인
+# atlas_build.py가 만든 resources/atlas/atlas.json을 읽어, 원본 스프라이트 경로를
+# 아틀라스 텍스처와 그 안의 영역으로 바꿔 줍니다. 색인이나 아틀라스 이미지가 없으면
+# 원본 파일을 그대로 쓰므로(영역 = 이미지 전체) 부르는 쪽은 아틀라스 유무를 신경 쓰지 않아도 됩니다.
+# 환경 변수 NO_ATLAS=1이면 색인을 읽지 않습니다. (원본 파일과 비교할 때)
+#
+# 사용법:
+#   sprite = atlas.get_sprite('resources/tiles/grass1.png')   # 아틀라스 텍스처의 참조를 얻음
+#   sprite.draw(x, y, 50, 50)                                 # 영역만 clip_draw
+#   atlas.release_sprite('resources/tiles/grass1.png')
+#   atlas.image_path(path)     # 로드/미리 로드/반납에 쓸 실제 파일 경로
+
+INDEX_PATH = os.path.join(assets.BASE_DIR, 'resources', 'atlas', 'atlas.json')
+ENABLED = os.environ.get('NO_ATLAS', '') in ('', '0')
+
+# 원본 절대 경로 -> Region. 처음 찾을 때 색인을 읽음
+_regions = None
+
+
+class Region:
+    """아틀라스 안의 영역. left/bottom은 clip_draw 좌표(왼쪽 아래 원점)입니다."""
+
+    __slots__ = ('image_path', 'left', 'bottom', 'w', 'h')
+
+    def __init__(self, image_path, left, bottom, w, h):
+        self.image_path = image_path
+        self.left = left
+        self.bottom = bottom
+        self.w = w
+        self.h = h
+
+
+class Sprite:
+    """이미지와 그 안의 영역. 아틀라스가 없으면 영역은 이미지 전체입니다."""
+
+    __slots__ = ('image', 'left', 'bottom', 'w', 'h')
+
+    def __init__(self, image, left, bottom, w, h):
+        self.image = image
+        self.left = left
+        self.bottom = bottom
+        self.w = w
+        self.h = h
+
+    def draw(self, x, y, w=None, h=None):
+        """영역을 (x, y) 중심에 w x h 크기로 그립니다. 크기를 주지 않으면 원본 크기."""
+        self.image.clip_draw(self.left, self.bottom, self.w, self.h, x, y,
+                             self.w if w is None else w, self.h if h is None else h)
+
+
+def _load_index(path=INDEX_PATH):
+    regions = {}
+    if not ENABLED or not os.path.exists(path):
+        return regions
+    with open(path, encoding='utf-8') as f:
+        index = json.load(f)
+    sheets = {}
+    for name, info in index.get('atlases', {}).items():
+        image_path = assets.resolve_path(info['image'])
+        # 아틀라스 이미지가 빠진 그룹은 원본 파일로 그림
+        if os.path.exists(image_path):
+            sheets[name] = (image_path, info['height'])
+    for source, s in index.get('sprites', {}).items():
+        sheet = sheets.get(s['atlas'])
+        if sheet is None:
+            continue
+        image_path, atlas_h = sheet
+        # 색인은 왼쪽 위 원점 픽셀 좌표, clip_draw는 왼쪽 아래 원점
+        regions[assets.resolve_path(source)] = Region(image_path, s['x'], atlas_h - s['y'] - s['h'], s['w'], s['h'])
+    return regions
+
+
+def find(path):
+    """path가 아틀라스에 들어 있으면 Region, 아니면 None"""
+    global _regions
+    if _regions is None:
+        _regions = _load_index()
+    return _regions.get(assets.resolve_path(path))
+
+
+def image_path(path):
+    """path를 그릴 때 실제로 로드하는 파일: 아틀라스에 있으면 아틀라스 이미지, 아니면 path 그대로"""
+    region = find(path)
+    return path if region is None else region.image_path
+
+
+def get_sprite(path):
+    """path의 Sprite를 반환합니다. 텍스처는 공유 에셋 관리자로 로드되므로 release_sprite()로 반납하세요."""
+    region = find(path)
+    if region is None:
+        image = assets.get_image(path)
+        return Sprite(image, 0, 0, image.w, image.h)
+    image = assets.get_image(region.image_path)
+    return Sprite(image, region.left, region.bottom, region.w, region.h)
+
+
+def release_sprite(path):
+    assets.release_image(image_path(path))
+
+
+def reload():
+    """색인을 다음 조회 때 다시 읽습니다. (atlas_build.py로 다시 만든 뒤)"""
+    global _regions
+    _regions = None
+
+# end of atlas.py
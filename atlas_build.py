@@ -0,0 +1,182 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import pngio
+
+# 텍스처 아틀라스 빌드
+# 작은 스프라이트(과일, 아이템, 잔디 타일)를 그룹마다 큰 텍스처 한 장으로 묶고,
+# 원본 경로 -> 아틀라스 안의 영역을 resources/atlas/atlas.json에 기록합니다.
+# 게임은 atlas.py로 이 색인을 읽어 원본 파일 대신 아틀라스의 영역을 clip_draw로 그립니다.
+# (파일 수백 개 대신 몇 장만 로드하고, 같은 그룹의 스프라이트는 같은 텍스처라 렌더 큐에서 한 묶음이 됨)
+#
+# 스프라이트 사이에는 PADDING 픽셀 간격을 두고 가장자리 픽셀을 늘려 채워서,
+# 확대해서 그릴 때 옆 스프라이트의 픽셀이 번지지 않게 합니다.
+# 색인에는 원본 파일의 sha1도 남기므로 --check로 원본이 바뀌었는지 확인할 수 있습니다.
+#
+# 예)
+#   python atlas_build.py            # 아틀라스와 색인 다시 만들기
+#   python atlas_build.py --check    # 색인이 원본과 맞는지만 확인 (다르면 종료 코드 1)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = os.path.join(BASE_DIR, 'resources', 'atlas')
+INDEX_NAME = 'atlas.json'
+INDEX_VERSION = 1
+
+# 아틀라스 이름 -> 원본 파일 패턴 (프로젝트 폴더 기준)
+GROUPS = {
+    'fruits': ['resources/fruits_16x16/fruit_*.png'],
+    'items': ['resources/item/*.png'],
+    'tiles': ['resources/tiles/grass*.png'],
+}
+
+PADDING = 1
+# 아틀라스 한 장의 최대 크기 (픽셀). 오래된 GPU도 받는 크기
+MAX_SIZE = 2048
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description='pack sprites into texture atlases with a JSON index')
+    parser.add_argument('--check', action='store_true', help='다시 만들지 않고 색인이 최신인지만 확인')
+    parser.add_argument('--output', default=OUTPUT_DIR, help='아틀라스와 색인을 쓸 폴더')
+    return parser.parse_args(argv)
+
+
+def _next_pow2(n):
+    size = 1
+    while size < n:
+        size *= 2
+    return size
+
+
+def _rel(path):
+    return os.path.relpath(path, BASE_DIR).replace(os.sep, '/')
+
+
+def _sha1(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def sources():
+    """아틀라스 이름 -> 원본 파일의 상대 경로 목록 (정렬됨)"""
+    groups = {}
+    for name, patterns in GROUPS.items():
+        paths = set()
+        for pattern in patterns:
+            paths.update(_rel(p) for p in glob.glob(os.path.join(BASE_DIR, pattern)))
+        groups[name] = sorted(paths)
+    return groups
+
+
+def pack(sizes):
+    """(w, h) 목록을 선반(shelf) 방식으로 배치합니다.
+    반환: (아틀라스 너비, 높이, 각 크기의 왼쪽 위 (x, y) 목록). 간격(PADDING)을 포함해 배치합니다."""
+    cell = [(w + 2 * PADDING, h + 2 * PADDING) for w, h in sizes]
+    area = sum(w * h for w, h in cell)
+    width = _next_pow2(max(max(w for w, _ in cell), int(area ** 0.5)))
+    # 높은 것부터 놓아 선반마다 남는 공간을 줄임
+    order = sorted(range(len(cell)), key=lambda i: (-cell[i][1], -cell[i][0], i))
+    while True:
+        positions = [None] * len(cell)
+        x = y = shelf_h = 0
+        for i in order:
+            w, h = cell[i]
+            if x + w > width:
+                x = 0
+                y += shelf_h
+                shelf_h = 0
+            positions[i] = (x + PADDING, y + PADDING)
+            x += w
+            shelf_h = max(shelf_h, h)
+        height = _next_pow2(y + shelf_h)
+        if height <= width or width >= MAX_SIZE:
+            break
+        width *= 2
+    if width > MAX_SIZE or height > MAX_SIZE:
+        raise ValueError('아틀라스가 {}x{}로 최대 크기 {}를 넘습니다'.format(width, height, MAX_SIZE))
+    return width, height, positions
+
+
+def _blit(dst, dst_w, src, src_w, src_h, x, y):
+    """src를 (x, y)에 복사하고 가장자리 픽셀을 PADDING만큼 바깥으로 늘립니다."""
+    row_bytes = src_w * 4
+    for row in range(-PADDING, src_h + PADDING):
+        src_row = min(max(row, 0), src_h - 1)
+        line = src[src_row * row_bytes:(src_row + 1) * row_bytes]
+        line = line[:4] * PADDING + line + line[-4:] * PADDING
+        start = ((y + row) * dst_w + x - PADDING) * 4
+        dst[start:start + len(line)] = line
+
+
+def build(output=OUTPUT_DIR):
+    """모든 그룹의 아틀라스 PNG와 색인을 만들고 색인 dict를 반환합니다."""
+    os.makedirs(output, exist_ok=True)
+    index = {'version': INDEX_VERSION, 'padding': PADDING, 'atlases': {}, 'sprites': {}}
+    for name, paths in sources().items():
+        if not paths:
+            continue
+        images = [pngio.read_png(os.path.join(BASE_DIR, p)) for p in paths]
+        width, height, positions = pack([(w, h) for w, h, _ in images])
+        pixels = bytearray(width * height * 4)
+        for (w, h, src), (x, y) in zip(images, positions):
+            _blit(pixels, width, src, w, h, x, y)
+        image_path = os.path.join(output, name + '.png')
+        pngio.write_png(image_path, width, height, pixels)
+        index['atlases'][name] = {'image': _rel(image_path), 'width': width, 'height': height}
+        for path, (w, h, _), (x, y) in zip(paths, images, positions):
+            index['sprites'][path] = {'atlas': name, 'x': x, 'y': y, 'w': w, 'h': h,
+                                      'sha1': _sha1(os.path.join(BASE_DIR, path))}
+        print('{}: {} sprites -> {} ({}x{})'.format(name, len(paths), _rel(image_path), width, height))
+    with open(os.path.join(output, INDEX_NAME), 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+        f.write('\n')
+    return index
+
+
+def check(output=OUTPUT_DIR):
+    """색인이 원본 파일과 맞지 않는 항목의 설명 목록을 반환합니다. 비어 있으면 최신입니다."""
+    index_path = os.path.join(output, INDEX_NAME)
+    if not os.path.exists(index_path):
+        return ['{}가 없습니다'.format(_rel(index_path))]
+    with open(index_path, encoding='utf-8') as f:
+        index = json.load(f)
+    problems = []
+    if index.get('version') != INDEX_VERSION:
+        problems.append('색인 버전이 다릅니다: {}'.format(index.get('version')))
+    sprites = index.get('sprites', {})
+    expected = {p for paths in sources().values() for p in paths}
+    for path in sorted(expected - set(sprites)):
+        problems.append('새 파일: ' + path)
+    for path in sorted(set(sprites) - expected):
+        problems.append('없어진 파일: ' + path)
+    for path in sorted(expected & set(sprites)):
+        if sprites[path]['sha1'] != _sha1(os.path.join(BASE_DIR, path)):
+            problems.append('바뀐 파일: ' + path)
+    for name, info in index.get('atlases', {}).items():
+        if not os.path.exists(os.path.join(BASE_DIR, info['image'])):
+            problems.append('아틀라스 이미지가 없습니다: ' + info['image'])
+    return problems
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    if args.check:
+        problems = check(args.output)
+        for line in problems:
+            print(line)
+        if problems:
+            print('아틀라스가 최신이 아닙니다. python atlas_build.py로 다시 만드세요.')
+            return 1
+        print('아틀라스가 최신입니다.')
+        return 0
+    build(args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
+
+# end of atlas_build.py
@@ -0,0 +1,412 @@
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+# 엔드투엔드 프레임 시간 벤치마크
+# source.init / handle_events / update / render를 스크립트 입력으로 N 프레임 동안 돌리고
+# 프레임 시간(mean/p95/p99), 초당 프레임 수, 프레임당 할당량, 그리기 호출 수를 보고합니다.
+#
+# 예)
+#   python benchmark.py                       # full 시나리오, 헤드리스
+#   python benchmark.py collect --frames 2000
+#   python benchmark.py full --stress-items 5000 --stress-npcs 200
+#   python benchmark.py --list
+#
+# 스크립트 입력을 넣기 위해 헤드리스 백엔드(headless_pico2d)로 실행합니다.
+
+SIM_DT = 0.05  # main.py와 같은 고정 스텝 (프레임마다 한 번 update)
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description='scripted end-to-end frame-time benchmark')
+    parser.add_argument('scenario', nargs='?', default='full', help='실행할 시나리오 (--list로 목록 확인)')
+    parser.add_argument('--list', action='store_true', help='시나리오 목록 출력')
+    parser.add_argument('--frames', type=int, default=None,
+                        help='실행할 프레임 수. 시나리오가 먼저 끝나면 입력 없이 나머지를 채움 (기본: 시나리오 끝까지)')
+    parser.add_argument('--seed', type=int, default=1, help='random 시드')
+    parser.add_argument('--stress-items', type=int, default=0, help='맵에 추가로 뿌릴 과일 수')
+    parser.add_argument('--stress-npcs', type=int, default=0, help='맵에 추가로 둘 NPC 수')
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help='tracemalloc으로 프레임당 임시 할당량 측정 (프레임 시간이 느려짐)')
+    parser.add_argument('--json', metavar='PATH', help='결과를 JSON으로 저장')
+    return parser.parse_args(argv)
+
+
+# --- 스크립트 입력 ---
+class Bot:
+    """키 입력을 흉내 내는 스크립트 플레이어. 각 동작은 프레임마다 한 번 yield하는 제너레이터입니다."""
+
+    # 목표 지점 도착 판정 반경과 축별 데드존 (witch는 프레임당 5픽셀 이동)
+    ARRIVE_RADIUS = 8
+    DEADZONE = 3
+    # 이 프레임 수 동안 위치가 그대로면 막힌 것으로 보고 포기
+    STUCK_FRAMES = 20
+
+    def __init__(self, pico2d, source):
+        self.pico2d = pico2d
+        self.source = source
+        self.keys_down = set()
+
+    def press(self, key):
+        if key not in self.keys_down:
+            self.keys_down.add(key)
+            self.pico2d.push_key(key, True)
+
+    def release(self, key):
+        if key in self.keys_down:
+            self.keys_down.discard(key)
+            self.pico2d.push_key(key, False)
+
+    def release_all(self):
+        for key in list(self.keys_down):
+            self.release(key)
+
+    def tap(self, key):
+        """한 프레임 안에 눌렀다 뗍니다."""
+        self.pico2d.push_key(key, True)
+        self.pico2d.push_key(key, False)
+        yield
+
+    def wait(self, frames):
+        for _ in range(frames):
+            yield
+
+    def wait_seconds(self, seconds):
+        yield from self.wait(int(math.ceil(seconds / SIM_DT)))
+
+    def _steer(self, dx, dy):
+        p = self.pico2d
+        for positive, negative, d in ((p.SDLK_RIGHT, p.SDLK_LEFT, dx), (p.SDLK_UP, p.SDLK_DOWN, dy)):
+            if d > self.DEADZONE:
+                self.release(negative)
+                self.press(positive)
+            elif d < -self.DEADZONE:
+                self.release(positive)
+                self.press(negative)
+            else:
+                self.release(positive)
+                self.release(negative)
+
+    def walk_to(self, x, y, until=None, max_frames=1000):
+        """(x, y)까지 걸어갑니다. until()이 True가 되면 일찍 멈춥니다."""
+        witch = self.source.witch
+        last_pos = None
+        still = 0
+        for _ in range(max_frames):
+            if until is not None and until():
+                break
+            dx = x - witch.x
+            dy = y - witch.y
+            if math.hypot(dx, dy) <= self.ARRIVE_RADIUS:
+                break
+            pos = (round(witch.x), round(witch.y))
+            still = still + 1 if pos == last_pos else 0
+            if still >= self.STUCK_FRAMES:
+                break
+            last_pos = pos
+            self._steer(dx, dy)
+            yield
+        self.release_all()
+        yield
+
+    def walk_path(self, points, until=None):
+        for x, y in points:
+            yield from self.walk_to(x, y, until=until)
+            if until is not None and until():
+                break
+
+    def select_slot(self, index):
+        yield from self.tap(self.pico2d.SDLK_0 + index)
+
+    def find_slot(self, predicate):
+        for i, it in enumerate(self.source.witch.inventory):
+            if it is not None and predicate(it):
+                return i
+        return None
+
+
+# --- 시나리오 단계 ---
+def step_start(bot):
+    """시작 페이지를 잠시 보여 준 뒤 E로 게임 시작."""
+    yield from bot.wait(10)
+    yield from bot.tap(bot.pico2d.SDLK_e)
+
+
+def step_collect(bot):
+    """map의 과일을 가까운 것부터 모두 줍습니다. (인벤토리가 차면 멈춤)"""
+    source = bot.source
+    witch = source.witch
+    while source.world_items and witch.has_space():
+        target = min(source.world_items, key=lambda it: math.hypot(it.x - witch.x, it.y - witch.y))
+        yield from bot.walk_to(target.x, target.y, until=lambda: target not in source.world_items)
+        if target in source.world_items:
+            # 닿지 못하는 위치: 건너뜀
+            source.remove_world_item(target)
+
+
+def step_to_pot(bot):
+    """map의 arrow를 밟아 pot 방으로 이동."""
+    source = bot.source
+    yield from bot.walk_to(source.arrow_x, source.arrow_y, until=lambda: source.current_map == 'pot')
+
+
+def step_to_map(bot):
+    """pot 방의 arrow를 밟아 map으로 돌아감."""
+    source = bot.source
+    pot = sys.modules['pot']
+    yield from bot.walk_path([(pot.POT_X, 430), (pot.ARROW_X, pot.ARROW_Y)],
+                             until=lambda: source.current_map == 'map')
+
+
+def _give_fruits(bot, fruit_id, count):
+    import pool
+    witch = bot.source.witch
+    for _ in range(count):
+        item = pool.fruits.acquire(fruit_id)
+        if not witch.has_space(item):
+            pool.release(item)
+            break
+        witch.add_to_inventory(item)
+
+
+def _count(bot, fruit_id):
+    return bot.source.witch.count_item(fruit_id)
+
+
+def step_craft(bot, potions=3, fruit_ids=('grape', 'peach')):
+    """pot 근처에서 같은 과일 3개씩 넣어 물약을 만들고, pot 아래에 생긴 물약을 줍습니다."""
+    source = bot.source
+    pot = sys.modules['pot']
+    near_pot = (pot.POT_X, pot.POT_Y + 115)
+    side_x = pot.POT_X + 170
+    for _ in range(potions):
+        # 가장 많이 가진 과일로 만들고, 모자라면 인벤토리에 채워 넣음 (스크립트 준비 단계)
+        fruit_id = max(fruit_ids, key=lambda f: _count(bot, f))
+        have = _count(bot, fruit_id)
+        capacity = sys.modules['recipes'].capacity()
+        if have < capacity:
+            _give_fruits(bot, fruit_id, capacity - have)
+        yield from bot.walk_to(*near_pot)
+        for _ in range(capacity):
+            slot = source.witch.inventory.find(fruit_id)
+            if slot is None:
+                break
+            yield from bot.select_slot(slot)
+            yield from bot.tap(bot.pico2d.SDLK_e)
+        # 제작 대기 후 생성된 물약 줍기 (pot 몸통을 피해 옆으로 돌아 아래쪽에서 접근)
+        yield from bot.wait_seconds(pot.crafting_delay + SIM_DT * 2)
+        for item in list(source.pot_world_items):
+            picked = lambda: item not in source.pot_world_items
+            yield from bot.walk_path([(side_x, near_pot[1]), (side_x, 80), (item.x, min(item.y, 140))],
+                                     until=picked)
+            # 왔던 길로 pot 위쪽에 돌아감
+            yield from bot.walk_path([(side_x, source.witch.y), (side_x, near_pot[1]), near_pot])
+
+
+def step_gift(bot):
+    """NPC에게 가서 가진 item(물약)을 모두 건넵니다."""
+    source = bot.source
+    if not source.npcs:
+        return
+    npc = next(iter(source.npcs))
+    yield from bot.walk_to(npc.x - 60, npc.y)
+    while source.game_state == 'game':
+        slot = bot.find_slot(lambda it: getattr(it, 'item_type', None) == 'item')
+        if slot is None:
+            break
+        item = source.witch.inventory[slot]
+        yield from bot.select_slot(slot)
+        yield from bot.tap(bot.pico2d.SDLK_e)
+        if source.witch.inventory[slot] is item:
+            # 전달되지 않음 (NPC와 멀리 있음)
+            break
+
+
+def _sequence(*steps):
+    def scenario(bot):
+        for step in steps:
+            yield from step(bot)
+    return scenario
+
+
+SCENARIOS = {
+    'startpage': ('시작 페이지를 보여 주고 E로 시작', _sequence(step_start)),
+    'collect': ('map의 과일 모두 줍기', _sequence(step_start, step_collect)),
+    'to_pot': ('arrow를 밟아 pot 방으로 이동', _sequence(step_start, step_to_pot)),
+    'craft': ('pot 방에서 물약 3개 제작', _sequence(step_start, step_to_pot, step_craft)),
+    'gift': ('물약을 만들어 map의 NPC에게 선물',
+             _sequence(step_start, step_to_pot, step_craft, step_to_map, step_gift)),
+    'full': ('과일 줍기 -> pot 방 -> 물약 3개 제작 -> map 복귀 -> NPC 선물',
+             _sequence(step_start, step_collect, step_to_pot, step_craft, step_to_map, step_gift)),
+}
+
+
+# --- 스트레스 모드 ---
+def add_stress_entities(source, items, npcs, width=800, height=600):
+    """맵에 과일 items개와 NPC npcs개를 무작위 위치에 추가합니다."""
+    import pool
+    from npc import NPC
+    fruit_ids = ['apple', 'grape', 'banana', 'peach', 'strawberry']
+    for _ in range(items):
+        f = pool.fruits.acquire(random.choice(fruit_ids))
+        source.spawn_world_item(f, random.randint(0, width), random.randint(0, height))
+    for _ in range(npcs):
+        n = NPC.from_id('girl1_idle', load_image_now=True)
+        source.spawn_npc(n, random.randint(0, width), random.randint(0, height))
+
+
+# --- 측정 ---
+def _percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(p / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def run(scenario_name, frames=None, seed=1, stress_items=0, stress_npcs=0, trace_alloc=False):
+    """시나리오를 실행하고 결과 dict를 반환합니다. pico2d(또는 헤드리스 백엔드)가 이미 준비되어 있어야 합니다."""
+    import pico2d
+    import source
+
+    random.seed(seed)
+    source.init(800, 600)
+    if stress_items or stress_npcs:
+        # 게임 월드는 게임을 시작해야 만들어지므로 스트레스 엔티티를 넣기 전에 먼저 시작
+        source.start_game()
+        add_stress_entities(source, stress_items, stress_npcs)
+
+    bot = Bot(pico2d, source)
+    script = SCENARIOS[scenario_name][1](bot)
+    script_done = False
+
+    frame_times = []
+    net_blocks = []
+    transient_bytes = []
+    draw_calls = []
+    stats = getattr(pico2d, 'stats', None)
+    frames_drawn = stats.frame_no if stats is not None else 0
+
+    if trace_alloc:
+        tracemalloc.start()
+    frame = 0
+    try:
+        while True:
+            if frames is not None and frame >= frames:
+                break
+            if not script_done:
+                try:
+                    next(script)
+                except StopIteration:
+                    script_done = True
+                    if frames is None:
+                        break
+
+            if trace_alloc:
+                tracemalloc.reset_peak()
+                traced_before = tracemalloc.get_traced_memory()[0]
+            blocks_before = sys.getallocatedblocks()
+            t0 = time.perf_counter()
+
+            running = source.handle_events()
+            result = source.update(SIM_DT)
+            source.render()
+
+            elapsed = time.perf_counter() - t0
+            net_blocks.append(sys.getallocatedblocks() - blocks_before)
+            if trace_alloc:
+                transient_bytes.append(tracemalloc.get_traced_memory()[1] - traced_before)
+            frame_times.append(elapsed)
+            # 이번 프레임에 화면을 갱신한 경우만 (정적 화면은 다시 그리지 않음)
+            if stats is not None and stats.frame_no > frames_drawn:
+                frames_drawn = stats.frame_no
+                draw_calls.append(stats.frame_draw_calls[-1])
+            frame += 1
+            if not running or result == False:
+                break
+    finally:
+        if trace_alloc:
+            tracemalloc.stop()
+
+    final_state = {
+        'game_state': source.game_state,
+        'current_map': source.current_map,
+        'inventory': ['{} x{}'.format(name, n) if n > 1 else name
+                      for _, name, n in source.witch.inventory_summary() if name is not None],
+        'npc_heart': [n.heart for n in list(source.npcs)[:1]],
+        'world_items': len(source.world_items),
+    }
+    pool_stats = sys.modules['pool'].stats()
+    source.cleanup()
+
+    times = sorted(frame_times)
+    total = sum(frame_times)
+    result = {
+        'scenario': scenario_name,
+        'frames': len(frame_times),
+        'seed': seed,
+        'stress_items': stress_items,
+        'stress_npcs': stress_npcs,
+        'mean_ms': (total / len(times) * 1000.0) if times else 0.0,
+        'p95_ms': _percentile(times, 95) * 1000.0,
+        'p99_ms': _percentile(times, 99) * 1000.0,
+        'max_ms': (times[-1] * 1000.0) if times else 0.0,
+        'fps': (len(times) / total) if total > 0 else 0.0,
+        'net_blocks_per_frame': (sum(net_blocks) / len(net_blocks)) if net_blocks else 0.0,
+        'draw_calls_per_frame': (sum(draw_calls) / len(draw_calls)) if draw_calls else None,
+        'final_state': final_state,
+        'pools': pool_stats,
+    }
+    if trace_alloc:
+        result['transient_kib_per_frame'] = sum(transient_bytes) / len(transient_bytes) / 1024.0 if transient_bytes else 0.0
+    return result
+
+
+def report(result):
+    print('scenario: {scenario}  frames: {frames}  seed: {seed}  stress items/npcs: {stress_items}/{stress_npcs}'
+          .format(**result))
+    print('frame time  mean {mean_ms:.3f} ms  p95 {p95_ms:.3f} ms  p99 {p99_ms:.3f} ms  max {max_ms:.3f} ms'
+          .format(**result))
+    print('frames/sec  {:.1f} (uncapped)'.format(result['fps']))
+    alloc = 'allocations  net {:+.2f} blocks/frame'.format(result['net_blocks_per_frame'])
+    if 'transient_kib_per_frame' in result:
+        alloc += ', transient {:.2f} KiB/frame (tracemalloc)'.format(result['transient_kib_per_frame'])
+    print(alloc)
+    if result['draw_calls_per_frame'] is not None:
+        print('draw calls  {:.1f} /frame'.format(result['draw_calls_per_frame']))
+    for name, counts in result['pools'].items():
+        print('pool {:<7} created {created}  reused {reused}  released {released}  dropped {dropped}  free {free}'.format(name, **counts))
+    print('final state  {}'.format(result['final_state']))
+
+
+def main(argv=None):
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    if args.list:
+        for name, (description, _) in SCENARIOS.items():
+            print('{:<10} {}'.format(name, description))
+        return 0
+    if args.scenario not in SCENARIOS:
+        print('알 수 없는 시나리오: {} (--list로 목록 확인)'.format(args.scenario))
+        return 2
+
+    import headless_pico2d
+    headless_pico2d.install()
+
+    # 상대 경로 리소스('resources/...')가 이 폴더 기준으로 열리도록
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    result = run(args.scenario, frames=args.frames, seed=args.seed,
+                 stress_items=args.stress_items, stress_npcs=args.stress_npcs,
+                 trace_alloc=args.tracemalloc)
+    report(result)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
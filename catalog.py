@@ -0,0 +1,161 @@
+import os
+
+# 리소스 카탈로그
+# 시작 시 resources 폴더를 한 번만 훑어서 과일/아이템/NPC 항목 표를 만들어 둡니다.
+# Fruit, Item, NPC는 카탈로그 ID로 생성되며, 생성할 때 파일 시스템에 접근하지 않습니다.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESOURCES_DIR = os.path.join(BASE_DIR, 'resources')
+
+# kind -> (resources 하위 폴더, 기본 item_type)
+KIND_DIRS = {
+    'fruit': ('fruits_16x16', 'source'),
+    'item': ('item', 'item'),
+    'npc': ('npc', None),
+}
+
+# 메타데이터 표: 파일명(확장자 제외) -> 속성
+# 여기에 없는 파일은 파일명을 이름으로 쓰고 kind의 기본값을 따릅니다.
+METADATA = {
+    'fruit': {
+        'fruit_000': {'name': 'apple'},
+        'fruit_003': {'name': 'grape'},
+        'fruit_007': {'name': 'banana'},
+        'fruit_012': {'name': 'peach'},
+        'fruit_015': {'name': 'strawberry'},
+    },
+    'item': {
+        # heart: NPC에게 주었을 때 오르는 호감도
+        'red_1': {'heart': 10},
+        'green_1': {'heart': 5},
+        'blue_1': {'heart': 3},
+    },
+    'npc': {},
+}
+
+# 메타데이터에 heart가 없는 아이템의 기본 호감도 증가량
+DEFAULT_HEART = 1
+
+
+class CatalogEntry:
+    """카탈로그 항목 하나. 이미지 경로와 게임 속성을 미리 계산해 둡니다."""
+    __slots__ = ('id', 'kind', 'name', 'filename', 'path', 'index', 'item_type', 'heart')
+
+    def __init__(self, entry_id, kind, name, filename, path, index=None, item_type=None, heart=DEFAULT_HEART):
+        self.id = entry_id
+        self.kind = kind
+        self.name = name
+        self.filename = filename
+        self.path = path
+        self.index = index
+        self.item_type = item_type
+        self.heart = heart
+
+    def __repr__(self):
+        return '<CatalogEntry id={!r} kind={!r} filename={!r}>'.format(self.id, self.kind, self.filename)
+
+
+# id -> CatalogEntry
+_entries = {}
+# (kind, filename) -> CatalogEntry
+_by_filename = {}
+# 과일 인덱스 -> CatalogEntry
+_fruit_by_index = {}
+_built = False
+
+
+def _fruit_index(stem):
+    if stem.startswith('fruit_'):
+        try:
+            return int(stem[6:9])
+        except ValueError:
+            return None
+    return None
+
+
+def build(resources_dir=RESOURCES_DIR):
+    """리소스 폴더를 한 번 훑어서 카탈로그를 만듭니다. 이미 만들었으면 다시 만듭니다."""
+    global _built
+    _entries.clear()
+    _by_filename.clear()
+    _fruit_by_index.clear()
+
+    for kind, (subdir, default_type) in KIND_DIRS.items():
+        folder = os.path.join(resources_dir, subdir)
+        try:
+            names = sorted(e.name for e in os.scandir(folder) if e.is_file())
+        except FileNotFoundError:
+            continue
+        meta_table = METADATA.get(kind, {})
+        for filename in names:
+            stem, ext = os.path.splitext(filename)
+            if ext.lower() != '.png':
+                continue
+            meta = meta_table.get(stem, {})
+            name = meta.get('name', stem)
+            entry = CatalogEntry(
+                # 이름이 정해진 항목은 이름을 ID로, 나머지는 파일명을 ID로 사용
+                entry_id=name,
+                kind=kind,
+                name=name,
+                filename=filename,
+                path=os.path.join(folder, filename),
+                index=_fruit_index(stem) if kind == 'fruit' else None,
+                item_type=meta.get('item_type', default_type),
+                heart=meta.get('heart', DEFAULT_HEART),
+            )
+            _entries.setdefault(entry.id, entry)
+            _by_filename[(kind, filename)] = entry
+            if entry.index is not None:
+                _fruit_by_index[entry.index] = entry
+
+    _built = True
+
+
+def ensure_built():
+    if not _built:
+        build()
+
+
+def get(entry_id):
+    """ID로 항목을 찾습니다. 없으면 FileNotFoundError를 발생시킵니다."""
+    ensure_built()
+    entry = _entries.get(entry_id)
+    if entry is None:
+        raise FileNotFoundError('카탈로그에 없는 리소스입니다: {}'.format(entry_id))
+    return entry
+
+
+def get_by_filename(kind, filename):
+    """kind 폴더의 파일명으로 항목을 찾습니다. 없으면 FileNotFoundError를 발생시킵니다."""
+    ensure_built()
+    entry = _by_filename.get((kind, filename))
+    if entry is None:
+        raise FileNotFoundError('카탈로그에 없는 {} 리소스입니다: {}'.format(kind, filename))
+    return entry
+
+
+def get_fruit(index):
+    """과일 인덱스(fruit_NNN.png의 NNN)로 항목을 찾습니다."""
+    ensure_built()
+    entry = _fruit_by_index.get(index)
+    if entry is None:
+        raise FileNotFoundError('카탈로그에 없는 과일 인덱스입니다: {}'.format(index))
+    return entry
+
+
+def heart_value(name):
+    """아이템 이름에 해당하는 호감도 증가량을 반환합니다."""
+    ensure_built()
+    entry = _entries.get(name)
+    if entry is None or entry.kind != 'item':
+        return DEFAULT_HEART
+    return entry.heart
+
+
+def entries(kind=None):
+    """카탈로그 항목 목록을 반환합니다. kind를 주면 해당 종류만 반환합니다."""
+    ensure_built()
+    return [e for e in _entries.values() if kind is None or e.kind == kind]
+
+# end of catalog.py
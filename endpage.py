@@ -1,4 +1,6 @@
 from pico2d import *
+import assets
+import labels
 
 # 엔딩 페이지 이미지
 endpage_image = None
@@ -8,8 +10,10 @@ font = None
 def load_endpage():
     """엔딩 페이지 이미지를 로드합니다."""
     global endpage_image, font
-    endpage_image = load_image('resources/tiles/end_page.png')
-    font = load_font('ENCR10B.TTF', 40)
+    if endpage_image is None:
+        endpage_image = assets.get_image('resources/tiles/end_page.png')
+    if font is None:
+        font = assets.get_font('ENCR10B.TTF', 40)
 
 def draw_endpage():
     """엔딩 페이지를 화면에 그립니다."""
@@ -19,9 +23,14 @@ def draw_endpage():
 
     # "GAME END" 문구 출력
     if font:
-        font.draw(310, 510, 'GAME END', (255, 255, 255))
+        labels.draw_label(font, 310, 510, 'GAME END', (255, 255, 255))
 
 def cleanup_endpage():
     """엔딩 페이지 리소스를 정리합니다."""
-    global endpage_image
-    endpage_image = None
+    global endpage_image, font
+    if endpage_image is not None:
+        assets.release_image('resources/tiles/end_page.png')
+        endpage_image = None
+    if font is not None:
+        assets.release_font('ENCR10B.TTF', 40)
+        font = None
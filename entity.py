@@ -0,0 +1,126 @@
+import os
+import assets
+import atlas
+import catalog
+
+# 월드 엔티티 공통 기반
+# Fruit / Item / NPC가 함께 쓰는 카탈로그 항목 결정, 이미지 로드/반납, 위치를 모았습니다.
+# 이미지는 atlas.get_sprite()로 얻으므로 아틀라스에 묶인 스프라이트는 아틀라스 텍스처를 공유하고,
+# 그 안의 영역(clip_x, clip_y, w, h)만 clip_draw로 그립니다.
+# 모든 엔티티는 __slots__로 필요한 속성만 가지므로 인스턴스마다 __dict__가 없고,
+# 속성 조회가 dict 탐색 대신 고정 위치 접근이 됩니다. (수만 개의 월드 오브젝트 대비)
+#
+# 하위 클래스는 필요한 속성만 __slots__에 덧붙이고, 아래 클래스 속성으로 어떤 처리가 필요한지 알립니다.
+#   KIND      카탈로그 종류 ('fruit', 'item', 'npc')
+#   animated  True인 인스턴스만 매 update()마다 애니메이션 진행 대상이 됨 (source.animated_items)
+#   DRAW_SIZE 항상 같은 크기로 그리면 (w, h). 화면 크기로 미리 바꿔 둔 캐시(rawcache)가 있으면 그 이미지를 로드함
+
+
+class Entity:
+    """카탈로그 항목 하나를 이미지로 가진 월드 엔티티.
+
+    생성자 인자:
+      - entry_or_name: catalog.CatalogEntry, 파일명('blue_1.png') 또는 이름('blue_1')
+      - name: (선택) 인스턴스 이름. 주지 않으면 카탈로그의 이름을 사용합니다.
+      - load_image_now: True면 생성 시 즉시 이미지를 로드합니다. open_canvas() 이후에만 안전합니다.
+        False면 처음 그릴 때(또는 load()를 부를 때) 로드합니다.
+        하위 클래스가 자기 속성을 정한 뒤 로드해야 하면 False를 넘기고 직접 load()를 부릅니다.
+
+    카탈로그에 없는 항목이면 FileNotFoundError를 발생시킵니다.
+    """
+
+    __slots__ = ('entry', 'name', 'filename', 'path', 'item_type', 'image', 'clip_x', 'clip_y', 'w', 'h', 'x', 'y')
+
+    KIND = None
+    animated = False
+    DRAW_SIZE = None
+
+    def __init__(self, entry_or_name, name=None, load_image_now=True):
+        entry = self._resolve(entry_or_name)
+        self.entry = entry
+        self.filename = entry.filename
+        # 이름 우선순위: 인자 name > 카탈로그 이름
+        self.name = name or entry.name
+        self.path = entry.path
+        # 아이템 타입 (source: pot에 투입 가능, item: NPC에게 전달 가능)
+        self.item_type = entry.item_type
+
+        # 이미지 객체, 이미지 안의 영역 (왼쪽 아래 원점), 크기
+        self.image = None
+        self.clip_x = 0
+        self.clip_y = 0
+        self.w = None
+        self.h = None
+
+        # 기본 좌표 (월드에 놓을 때 source.spawn_world_item 등이 정함)
+        self.x = 0
+        self.y = 0
+
+        if load_image_now:
+            self.load()
+
+    @classmethod
+    def _resolve(cls, entry_or_name):
+        """생성자 인자를 카탈로그 항목으로 바꿉니다."""
+        if isinstance(entry_or_name, catalog.CatalogEntry):
+            return entry_or_name
+        if not isinstance(entry_or_name, str):
+            raise TypeError('{} expects a str or CatalogEntry, got {!r}'.format(cls.__name__, entry_or_name))
+        filename = os.path.basename(entry_or_name)
+        if os.path.splitext(filename)[1] != '.png':
+            # 이름만 줬다면 .png를 붙인다
+            filename += '.png'
+        return catalog.get_by_filename(cls.KIND, filename)
+
+    def load(self):
+        """이미지를 로드합니다. 같은 이미지(아틀라스)는 공유 에셋 관리자를 통해 한 번만 로드됩니다."""
+        if self.image is not None:
+            return
+        sprite = atlas.get_sprite(self.load_path(self.path))
+        self.image = sprite.image
+        self.clip_x = sprite.left
+        self.clip_y = sprite.bottom
+        self.w = sprite.w
+        self.h = sprite.h
+
+    def unload(self):
+        """공유 이미지의 참조를 반납합니다. 더 이상 쓰지 않는 인스턴스에서 호출하세요."""
+        if self.image is None:
+            return
+        atlas.release_sprite(self.load_path(self.path))
+        self.image = None
+
+    @classmethod
+    def load_path(cls, path):
+        """path 대신 실제로 로드할 경로 (DRAW_SIZE 크기로 미리 바꿔 둔 캐시가 있으면 그 파일)"""
+        if cls.DRAW_SIZE is None:
+            return path
+        return assets.scaled_path(path, None, cls.DRAW_SIZE)[0]
+
+    def draw_image(self, x, y, w, h):
+        """이미지 영역을 (x, y) 중심에 w x h 크기로 그립니다."""
+        self.image.clip_draw(self.clip_x, self.clip_y, self.w, self.h, x, y, w, h)
+
+    def reset(self, name=None):
+        """풀에서 다시 꺼낼 때 새로 만든 것과 같은 상태로 되돌립니다. 이미지는 그대로 둡니다."""
+        self.name = name or self.entry.name
+        self.x = 0
+        self.y = 0
+
+    def update(self, dt):
+        """애니메이션이 있는 엔티티만 오버라이드합니다. (animated = True) dt는 경과 시간(초)"""
+        pass
+
+    @classmethod
+    def from_id(cls, entry_id, name=None, load_image_now=True, **kwargs):
+        """카탈로그 ID(예: 'apple', 'red_1', 'girl1_idle')로 생성합니다."""
+        return cls(catalog.get(entry_id), name=name, load_image_now=load_image_now, **kwargs)
+
+    @classmethod
+    def from_filename(cls, filename, name=None, load_image_now=True, **kwargs):
+        return cls(filename, name=name, load_image_now=load_image_now, **kwargs)
+
+    def __repr__(self):
+        return '<{} name={!r} filename={!r} path={!r}>'.format(type(self).__name__, self.name, self.filename, self.path)
+
+# end of entity.py
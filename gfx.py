@@ -0,0 +1,129 @@
+import ctypes
+from pico2d import *
+import pico2d.pico2d as _pico2d
+import rawcache
+
+# pico2d가 직접 제공하지 않는 렌더링 보조 기능 모음.
+# renderer는 open_canvas() 이후에 설정되므로 항상 _pico2d.renderer로 참조합니다.
+
+
+def create_target_image(width, height):
+    """렌더 타깃으로 사용할 수 있는 빈 Image를 생성합니다. open_canvas() 이후에 호출해야 합니다."""
+    texture = SDL_CreateTexture(_pico2d.renderer, SDL_PIXELFORMAT_RGBA8888,
+                                SDL_TEXTUREACCESS_TARGET, width, height)
+    if not texture:
+        raise IOError('렌더 타깃 텍스처를 생성할 수 없습니다: {}x{}'.format(width, height))
+    SDL_SetTextureBlendMode(texture, SDL_BLENDMODE_BLEND)
+    return Image(texture)
+
+
+def bake_image(width, height, draw_func):
+    """draw_func()가 그리는 내용을 width x height 크기의 텍스처 하나로 구워서 반환합니다.
+    draw_func 안에서는 평소처럼 캔버스 좌표(왼쪽 아래가 (0,0))로 그리면 됩니다.
+    캔버스와 같은 크기로 구울 때 좌표가 그대로 일치합니다.
+    """
+    image = create_target_image(width, height)
+    renderer = _pico2d.renderer
+    SDL_SetRenderTarget(renderer, image.texture)
+    try:
+        # 투명하게 비운 뒤 그리기
+        SDL_SetRenderDrawColor(renderer, 0, 0, 0, 0)
+        SDL_RenderClear(renderer)
+        draw_func()
+    finally:
+        SDL_SetRenderTarget(renderer, None)
+    return image
+
+
+def render_text(font, text, color=(0, 0, 0)):
+    """pico2d Font로 문자열을 한 번 래스터화해서 Image로 반환합니다.
+    Font.draw()가 매번 하는 작업(글리프 렌더링 + 텍스처 생성)을 한 번만 하기 위한 함수입니다.
+    """
+    sdl_color = SDL_Color(color[0], color[1], color[2])
+    surface = TTF_RenderUTF8_Blended(font.font, text.encode('utf-8'), sdl_color)
+    if not surface:
+        raise IOError('문자열을 렌더링할 수 없습니다: {!r}'.format(text))
+    texture = SDL_CreateTextureFromSurface(_pico2d.renderer, surface)
+    SDL_FreeSurface(surface)
+    if not texture:
+        raise IOError('문자열 텍스처를 생성할 수 없습니다: {!r}'.format(text))
+    return Image(texture)
+
+
+def decode_image(path):
+    """PNG 파일을 SDL 서피스(메모리의 픽셀)로 디코드합니다.
+    렌더러를 쓰지 않으므로 작업 스레드에서 호출해도 됩니다. 결과는 upload_image()나 free_decoded()로 넘겨야 합니다.
+    """
+    surface = IMG_Load(path.encode('utf-8'))
+    if not surface:
+        raise IOError('이미지를 디코드할 수 없습니다: {}'.format(path))
+    return surface
+
+
+# decode_raw()가 만든 서피스 주소 -> rawcache.RawMapping. 서피스를 해제할 때 함께 닫음
+_mapped = {}
+
+
+def decode_raw(path):
+    """rawcache의 RGBA 파일을 메모리 매핑해서 SDL 서피스로 만듭니다. 픽셀을 복사하거나 디코드하지 않습니다.
+    decode_image()처럼 작업 스레드에서 호출해도 되고, 결과는 upload_image()나 free_decoded()로 넘겨야 합니다.
+    """
+    try:
+        mapping = rawcache.RawMapping(path)
+    except (OSError, ValueError) as ex:
+        raise IOError('raw 이미지를 읽을 수 없습니다: {} ({})'.format(path, ex))
+    surface = SDL_CreateRGBSurfaceWithFormatFrom(mapping.address, mapping.w, mapping.h, 32, mapping.w * 4,
+                                                 SDL_PIXELFORMAT_RGBA32)
+    if not surface:
+        mapping.close()
+        raise IOError('raw 이미지로 서피스를 만들 수 없습니다: {}'.format(path))
+    _mapped[ctypes.addressof(surface.contents)] = mapping
+    return surface
+
+
+def _free_surface(surface):
+    key = ctypes.addressof(surface.contents)
+    SDL_FreeSurface(surface)
+    mapping = _mapped.pop(key, None)
+    if mapping is not None:
+        mapping.close()
+
+
+def upload_image(surface):
+    """decode_image()/decode_raw()의 서피스를 텍스처로 올려 Image로 반환합니다. 서피스는 해제됩니다.
+    렌더러를 쓰므로 메인 스레드에서만 호출해야 합니다.
+    """
+    try:
+        texture = SDL_CreateTextureFromSurface(_pico2d.renderer, surface)
+    finally:
+        _free_surface(surface)
+    if not texture:
+        raise IOError('텍스처를 생성할 수 없습니다')
+    return Image(texture)
+
+
+def free_decoded(surface):
+    """올리지 않을 서피스를 해제합니다."""
+    _free_surface(surface)
+
+
+def wait_for_event(timeout):
+    """입력/윈도우 이벤트가 올 때까지 최대 timeout초 동안 잠듭니다.
+    이벤트를 큐에서 꺼내지 않으므로 이어서 get_events()로 그대로 읽을 수 있습니다.
+    이벤트가 왔으면 True, 시간이 다 되었으면 False를 반환합니다.
+    """
+    return SDL_WaitEventTimeout(None, int(timeout * 1000)) == 1
+
+
+# 헤드리스 백엔드(headless_pico2d)가 pico2d로 설치되어 있으면 SDL을 직접 쓰는 함수들을 백엔드 구현으로 바꿈
+if getattr(_pico2d, 'HEADLESS', False):
+    create_target_image = _pico2d.create_target_image
+    bake_image = _pico2d.bake_image
+    render_text = _pico2d.render_text
+    wait_for_event = _pico2d.wait_for_event
+    decode_image = _pico2d.decode_image
+    decode_raw = _pico2d.decode_raw
+    upload_image = _pico2d.upload_image
+    free_decoded = _pico2d.free_decoded
+
+# end of gfx.py
@@ -0,0 +1,392 @@
+import os
+import struct
+import sys
+import time
+from collections import Counter, deque
+import rawcache
+
+# 헤드리스 pico2d 백엔드
+# 이 프로젝트가 쓰는 pico2d API(load_image, load_font, Image.draw/clip_draw/...,
+# get_events, 캔버스 함수)를 SDL 창 없이 흉내 냅니다. 아무것도 그리지 않고
+# 그리기 호출, 텍스처 사용량, 프레임별 호출 수만 기록합니다.
+#
+# 게임 모듈을 import하기 전에 install()을 호출하면 `from pico2d import *`가 이 모듈을 가져옵니다.
+#   import headless_pico2d
+#   headless_pico2d.install()
+#   import source
+# main.py는 환경 변수 PICO2D_HEADLESS=1 이면 자동으로 설치합니다.
+
+HEADLESS = True
+
+# --- SDL 상수 (pico2d가 sdl2에서 다시 내보내는 값과 동일) ---
+SDL_QUIT = 0x100
+SDL_KEYDOWN = 0x300
+SDL_KEYUP = 0x301
+SDL_MOUSEMOTION = 0x400
+SDL_MOUSEBUTTONDOWN = 0x401
+SDL_MOUSEBUTTONUP = 0x402
+SDL_MOUSEWHEEL = 0x403
+
+SDLK_RETURN = 13
+SDLK_ESCAPE = 27
+SDLK_SPACE = 32
+SDLK_TAB = 9
+SDLK_BACKSPACE = 8
+SDLK_RIGHT = 1073741903
+SDLK_LEFT = 1073741904
+SDLK_DOWN = 1073741905
+SDLK_UP = 1073741906
+SDLK_LCTRL = 1073742048
+SDLK_LSHIFT = 1073742049
+SDLK_LALT = 1073742050
+SDLK_RCTRL = 1073742052
+SDLK_RSHIFT = 1073742053
+SDLK_RALT = 1073742054
+
+# SDLK_0 ~ SDLK_9, SDLK_a ~ SDLK_z
+for _i in range(10):
+    globals()['SDLK_{}'.format(_i)] = ord('0') + _i
+for _c in 'abcdefghijklmnopqrstuvwxyz':
+    globals()['SDLK_' + _c] = ord(_c)
+# SDLK_F1 ~ SDLK_F12
+for _i in range(12):
+    globals()['SDLK_F{}'.format(_i + 1)] = 1073741882 + _i
+del _i, _c
+
+
+# --- 기록 ---
+class DrawStats:
+    """그리기 호출 기록. update_canvas()마다 한 프레임이 끝납니다."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.frame_no = 0
+        # 현재 프레임 값
+        self.draw_calls = 0
+        self.textures = set()
+        # 프레임별 기록 (update_canvas() 시점에 추가)
+        self.frame_draw_calls = []
+        self.frame_texture_counts = []
+        # 누적 값
+        self.total_draw_calls = 0
+        self.texture_uses = Counter()
+        self.method_counts = Counter()
+        self.images_loaded = Counter()
+        self.fonts_loaded = Counter()
+        # record_calls가 True이면 모든 호출을 (frame_no, texture, method, args)로 보관
+        self.record_calls = False
+        self.calls = []
+
+    def record(self, texture, method, args):
+        self.draw_calls += 1
+        self.total_draw_calls += 1
+        self.textures.add(texture)
+        self.texture_uses[texture] += 1
+        self.method_counts[method] += 1
+        if self.record_calls:
+            self.calls.append((self.frame_no, texture, method, args))
+
+    def end_frame(self):
+        self.frame_draw_calls.append(self.draw_calls)
+        self.frame_texture_counts.append(len(self.textures))
+        self.draw_calls = 0
+        self.textures = set()
+        self.frame_no += 1
+
+
+stats = DrawStats()
+
+# delay()가 실제로 잠들지 여부 (기본은 최대 속도로 실행)
+realtime = False
+
+canvas_width = 800
+canvas_height = 600
+lattice_on = True
+audio_on = False
+
+_event_queue = deque()
+_start_time = time.perf_counter()
+
+
+def install():
+    """sys.modules에 이 모듈을 pico2d로 등록합니다. 게임 모듈 import 전에 호출해야 합니다."""
+    module = sys.modules[__name__]
+    sys.modules['pico2d'] = module
+    sys.modules['pico2d.pico2d'] = module
+    # `import pico2d.pico2d as ...`가 속성 조회로도 찾을 수 있도록 (__all__에는 넣지 않음)
+    module.pico2d = module
+    return module
+
+
+# --- 캔버스 ---
+def open_canvas(w=800, h=600, sync=False, full=False):
+    global canvas_width, canvas_height
+    canvas_width, canvas_height = w, h
+
+
+def close_canvas():
+    pass
+
+
+def resize_canvas(w, h):
+    global canvas_width, canvas_height
+    canvas_width, canvas_height = w, h
+
+
+def get_canvas_width():
+    return canvas_width
+
+
+def get_canvas_height():
+    return canvas_height
+
+
+def clear_canvas():
+    pass
+
+
+def clear_canvas_now():
+    pass
+
+
+def update_canvas():
+    stats.end_frame()
+
+
+def show_lattice():
+    global lattice_on
+    lattice_on = True
+
+
+def hide_lattice():
+    global lattice_on
+    lattice_on = False
+
+
+def show_cursor():
+    pass
+
+
+def hide_cursor():
+    pass
+
+
+def print_fps():
+    pass
+
+
+def debug_print(str):
+    pass
+
+
+def draw_rectangle(x1, y1, x2, y2, r=255, g=0, b=0, a=255, filled=False):
+    stats.record('<primitive>', 'draw_rectangle', (x1, y1, x2, y2))
+
+
+def draw_line(x1, y1, x2, y2, r=0, g=0, b=0, a=255):
+    stats.record('<primitive>', 'draw_line', (x1, y1, x2, y2))
+
+
+def draw_circle(x, y, radius, r=0, g=0, b=0, a=255, filled=False):
+    stats.record('<primitive>', 'draw_circle', (x, y, radius))
+
+
+def clamp(minimum, x, maximum):
+    return max(minimum, min(x, maximum))
+
+
+def delay(sec):
+    if realtime:
+        time.sleep(sec)
+
+
+def get_time():
+    return time.perf_counter() - _start_time
+
+
+# --- 이벤트 ---
+class Event:
+    """Pico2D Event Class"""
+    def __init__(self, evt_type, key=None):
+        self.type = evt_type
+        self.key = key
+        self.button = None
+        self.x = None
+        self.y = None
+
+
+def push_event(event):
+    """다음 get_events()에서 돌려줄 이벤트를 넣습니다."""
+    _event_queue.append(event)
+
+
+def push_key(key, down=True):
+    push_event(Event(SDL_KEYDOWN if down else SDL_KEYUP, key))
+
+
+def push_quit():
+    push_event(Event(SDL_QUIT))
+
+
+def get_events():
+    events = list(_event_queue)
+    _event_queue.clear()
+    return events
+
+
+def has_pending_events():
+    return bool(_event_queue)
+
+
+# --- 이미지 / 폰트 ---
+def _png_size(path):
+    """PNG 헤더(IHDR)에서 크기만 읽습니다. PNG가 아니면 (0, 0)."""
+    with open(path, 'rb') as f:
+        header = f.read(24)
+    if len(header) == 24 and header[:8] == b'\x89PNG\r\n\x1a\n':
+        return struct.unpack('>II', header[16:24])
+    return 0, 0
+
+
+class Image:
+    """Pico2D Image Class (헤드리스). texture 대신 이름만 가지고 그리기 호출을 기록합니다."""
+
+    def __init__(self, name, w=0, h=0):
+        self.texture = name
+        self.name = name
+        self.w, self.h = w, h
+
+    def _record(self, method, args):
+        stats.record(self.name, method, args)
+
+    def rotate_draw(self, rad, x, y, w=None, h=None):
+        self._record('rotate_draw', (rad, x, y, w, h))
+
+    def composite_draw(self, rad, flip, x, y, w=None, h=None):
+        self._record('composite_draw', (rad, flip, x, y, w, h))
+
+    def draw(self, x, y, w=None, h=None):
+        self._record('draw', (x, y, w, h))
+
+    def draw_to_origin(self, x, y, w=None, h=None):
+        self._record('draw_to_origin', (x, y, w, h))
+
+    def clip_draw(self, left, bottom, width, height, x, y, w=None, h=None):
+        self._record('clip_draw', (left, bottom, width, height, x, y, w, h))
+
+    def clip_composite_draw(self, left, bottom, width, height, rad, flip, x, y, w=None, h=None):
+        self._record('clip_composite_draw', (left, bottom, width, height, rad, flip, x, y, w, h))
+
+    def clip_draw_to_origin(self, left, bottom, width, height, x, y, w=None, h=None):
+        self._record('clip_draw_to_origin', (left, bottom, width, height, x, y, w, h))
+
+    def draw_now(self, x, y, w=None, h=None):
+        self._record('draw_now', (x, y, w, h))
+
+    def opacify(self, o):
+        pass
+
+    def clip_image(self, left, bottom, width, height):
+        return Image('{}[{},{},{},{}]'.format(self.name, left, bottom, width, height), width, height)
+
+    def __repr__(self):
+        return '<headless Image {!r} {}x{}>'.format(self.name, self.w, self.h)
+
+
+def load_image(name):
+    if not os.path.exists(name):
+        print('cannot load %s' % name)
+        raise IOError
+    w, h = _png_size(name)
+    stats.images_loaded[name] += 1
+    return Image(name, w, h)
+
+
+class Font:
+    def __init__(self, name, size=20):
+        if not os.path.exists(name):
+            print('cannot load %s' % name)
+            raise IOError
+        self.font = None
+        self.name = name
+        self.size = size
+
+    def draw(self, x, y, str, color=(0, 0, 0)):
+        stats.record('<font:{}:{}>'.format(os.path.basename(self.name), self.size), 'font_draw', (x, y, str))
+
+
+def load_font(name, size=20):
+    stats.fonts_loaded[(name, size)] += 1
+    return Font(name, size)
+
+
+def load_music(name):
+    raise IOError
+
+
+def load_wav(name):
+    raise IOError
+
+
+# --- gfx 모듈이 SDL을 직접 쓰는 기능의 헤드리스 구현 ---
+def create_target_image(width, height):
+    return Image('<target {}x{}>'.format(width, height), width, height)
+
+
+def bake_image(width, height, draw_func):
+    # 구울 때의 그리기 호출도 기록에 남음 (다시 굽는 횟수를 셀 수 있도록)
+    image = create_target_image(width, height)
+    draw_func()
+    return image
+
+
+def render_text(font, text, color=(0, 0, 0)):
+    size = getattr(font, 'size', 20)
+    stats.record('<font:{}:{}>'.format(os.path.basename(getattr(font, 'name', '')), size), 'render_text', (text,))
+    return Image('<text {!r}>'.format(text), int(len(text) * size * 0.6), size)
+
+
+def decode_image(path):
+    # 작업 스레드에서 불려도 되도록 파일만 읽음 (픽셀 대신 크기만 가진 값을 돌려줌)
+    if not os.path.exists(path):
+        raise IOError('이미지를 디코드할 수 없습니다: {}'.format(path))
+    with open(path, 'rb') as f:
+        f.read()
+    w, h = _png_size(path)
+    return (path, w, h, None)
+
+
+def decode_raw(path):
+    # rawcache 파일: 실제 백엔드와 같은 메모리 매핑을 만들고, 올리거나 버릴 때 닫음
+    try:
+        mapping = rawcache.RawMapping(path)
+    except (OSError, ValueError) as ex:
+        raise IOError('raw 이미지를 읽을 수 없습니다: {} ({})'.format(path, ex))
+    return (path, mapping.w, mapping.h, mapping)
+
+
+def upload_image(decoded):
+    path, w, h, mapping = decoded
+    if mapping is not None:
+        mapping.close()
+    stats.images_loaded[path] += 1
+    return Image(path, w, h)
+
+
+def free_decoded(decoded):
+    mapping = decoded[3]
+    if mapping is not None:
+        mapping.close()
+
+
+def wait_for_event(timeout):
+    # 잠들지 않고, 대기 중인 이벤트가 있는지만 알려 줌
+    return has_pending_events()
+
+
+__all__ = [name for name in list(globals())
+           if not name.startswith('_') and name not in ('os', 'struct', 'sys', 'time', 'Counter', 'deque')]
+
+# end of headless_pico2d.py
@@ -0,0 +1,239 @@
+from heapq import heappop, heappush
+
+# 인벤토리
+# 슬롯마다 같은 종류(이름)의 아이템을 stack_limit개까지 쌓아 둡니다. (슬롯 = 아이템 목록, 빈 슬롯은 None)
+# 기본값은 1로, 지금처럼 아이템 하나가 한 슬롯을 씁니다. 가방/상자처럼 쌓아야 하는 곳만 크게 주세요.
+# 쌓인 아이템도 엔티티를 그대로 보관하므로, 꺼낸 아이템을 pot에 넣거나 풀(pool)에 돌려줄 수 있습니다.
+#
+# 칸이 수백 개여도 슬롯을 훑지 않도록 색인을 함께 유지합니다.
+#   - 빈 슬롯: 번호의 최소 힙. 가장 앞의 빈 슬롯을 바로 찾음 (교환으로 찬 슬롯은 꺼낼 때 건너뜀)
+#   - 종류별 개수: count('grape') >= 3 확인이 O(1)
+#   - 종류별 아직 덜 찬 슬롯: 같은 종류를 주우면 그 슬롯에 쌓음
+#
+# 사용법:
+#   bag = Inventory(200, stack_limit=99)
+#   index = bag.add(fruit)          # 쌓을 슬롯 또는 가장 앞의 빈 슬롯. 가득 차면 InventoryFull
+#   bag.has('grape', 3)             # 포도 3개 이상
+#   item = bag.remove(index)        # 그 슬롯의 맨 위 아이템 하나를 꺼냄
+#   bag[index], bag.count_at(index) # 맨 위 아이템(없으면 None), 쌓인 개수
+#   for item in bag: ...            # 슬롯 순서대로 맨 위 아이템 (빈 슬롯은 None)
+
+# 한 슬롯에 쌓을 수 있는 기본 개수 (1이면 쌓지 않음)
+STACK_LIMIT = 1
+
+
+class InventoryFull(ValueError):
+    """넣을 슬롯이 없음"""
+
+
+def item_key(item):
+    """쌓을 때 같은 종류로 보는 키: 아이템 이름 (레시피와 같은 기준)"""
+    return getattr(item, 'name', None) or getattr(item, 'filename', None) or repr(item)
+
+
+class Inventory:
+    """capacity칸 인벤토리. 같은 이름의 아이템은 한 슬롯에 stack_limit개까지 쌓입니다."""
+
+    def __init__(self, capacity, stack_limit=STACK_LIMIT):
+        self.capacity = capacity
+        self.stack_limit = stack_limit
+        self._slots = [None] * capacity
+        # 빈 슬롯 후보의 최소 힙. 실제로 비었는지는 꺼낼 때 확인
+        # (교환으로 찬 슬롯이 남을 수 있으나, 칸 수의 두 배를 넘으면 다시 만듦)
+        self._free = list(range(capacity))
+        self._free_count = capacity
+        # 키 -> 전체 개수 (한 번 넣은 종류는 0이 되어도 남음)
+        self._counts = {}
+        # 키 -> {슬롯: None} 그 종류가 아직 덜 찬 슬롯 / 가득 찬 슬롯 (넣은 순서를 유지하는 집합)
+        # 한 번 만든 집합은 비어도 남겨 두어, 같은 종류를 다시 넣을 때 집합을 새로 만들지 않음
+        self._open = {}
+        self._full = {}
+
+    def _check(self, index):
+        if not 0 <= index < self.capacity:
+            raise IndexError('Inventory index out of range')
+
+    def _push_free(self, index):
+        free = self._free
+        heappush(free, index)
+        if len(free) > 2 * self.capacity:
+            self._compact_free()
+
+    def _compact_free(self):
+        # 교환으로 찬 슬롯이 쌓였음: 지금 빈 슬롯만으로 다시 만듦 (번호 순서라 그대로 힙)
+        self._free = [i for i, stack in enumerate(self._slots) if stack is None]
+
+    def _place(self, index, stack, key):
+        """stack이 들어간 슬롯 index를 종류별 색인에 넣습니다."""
+        table = self._open if len(stack) < self.stack_limit else self._full
+        slots = table.get(key)
+        if slots is None:
+            table[key] = {index: None}
+        else:
+            slots[index] = None
+
+    def _unplace(self, index, key):
+        slots = self._open.get(key)
+        if slots is not None and slots.pop(index, 0) is None:
+            return
+        self._full[key].pop(index, None)
+
+    def add(self, item):
+        """item을 같은 종류가 덜 찬 슬롯에 쌓거나, 없으면 가장 앞의 빈 슬롯에 넣고 슬롯 번호를 반환합니다.
+        넣을 곳이 없으면 InventoryFull(ValueError)."""
+        key = item_key(item)
+        open_slots = self._open.get(key)
+        if open_slots:
+            index = next(iter(open_slots))
+            stack = self._slots[index]
+            stack.append(item)
+            self._counts[key] += 1
+            if len(stack) >= self.stack_limit:
+                del open_slots[index]
+                self._place(index, stack, key)
+            return index
+        slots = self._slots
+        free = self._free
+        while free:
+            index = heappop(free)
+            if slots[index] is None:
+                break
+        else:
+            raise InventoryFull('Inventory is full')
+        self._free_count -= 1
+        slots[index] = [item]
+        counts = self._counts
+        counts[key] = counts.get(key, 0) + 1
+        # _place()를 풀어 씀: 새 슬롯은 stack_limit가 1일 때만 곧바로 가득 참
+        table = self._open if self.stack_limit > 1 else self._full
+        key_slots = table.get(key)
+        if key_slots is None:
+            table[key] = {index: None}
+        else:
+            key_slots[index] = None
+        return index
+
+    def remove(self, index):
+        """슬롯 index의 맨 위 아이템 하나를 꺼내 반환합니다. 비어 있으면 None."""
+        if not 0 <= index < self.capacity:
+            raise IndexError('Inventory index out of range')
+        slots = self._slots
+        stack = slots[index]
+        if stack is None:
+            return None
+        item = stack.pop()
+        key = item_key(item)
+        self._counts[key] -= 1
+        if len(stack) == self.stack_limit - 1:
+            # 가득 찼던 슬롯
+            del self._full[key][index]
+            if stack:
+                self._open[key][index] = None
+                return item
+        elif stack:
+            return item
+        else:
+            del self._open[key][index]
+        slots[index] = None
+        self._free_count += 1
+        free = self._free
+        heappush(free, index)
+        if len(free) > 2 * self.capacity:
+            self._compact_free()
+        return item
+
+    def _key_slots(self, key):
+        return list(self._open.get(key, ())) + list(self._full.get(key, ()))
+
+    def take(self, key, n=1):
+        """key 종류의 아이템 n개를 뒤쪽 슬롯부터 꺼내 목록으로 반환합니다. 모자라면 꺼내지 않고 ValueError."""
+        if self._counts.get(key, 0) < n:
+            raise ValueError('not enough {!r}: {} < {}'.format(key, self._counts.get(key, 0), n))
+        taken = []
+        while len(taken) < n:
+            index = max(self._key_slots(key))
+            taken.append(self.remove(index))
+        return taken
+
+    def swap(self, i, j):
+        """두 슬롯의 내용(쌓인 아이템 전체)을 바꿉니다."""
+        self._check(i)
+        self._check(j)
+        slots = self._slots
+        a, b = slots[i], slots[j]
+        if a is None and b is None or i == j:
+            return
+        if a is not None:
+            self._unplace(i, item_key(a[0]))
+        if b is not None:
+            self._unplace(j, item_key(b[0]))
+        slots[i], slots[j] = b, a
+        if b is not None:
+            self._place(i, b, item_key(b[0]))
+        if a is not None:
+            self._place(j, a, item_key(a[0]))
+        # 한쪽만 차 있었으면 그 슬롯이 이제 빈 슬롯
+        if a is None:
+            self._push_free(j)
+        elif b is None:
+            self._push_free(i)
+
+    def get(self, index):
+        """슬롯 index의 맨 위 아이템 (비어 있으면 None)"""
+        if not 0 <= index < self.capacity:
+            raise IndexError('Inventory index out of range')
+        stack = self._slots[index]
+        return None if stack is None else stack[-1]
+
+    __getitem__ = get
+
+    def count_at(self, index):
+        """슬롯 index에 쌓인 개수"""
+        self._check(index)
+        stack = self._slots[index]
+        return 0 if stack is None else len(stack)
+
+    def count(self, key):
+        """key 종류의 전체 개수 O(1)"""
+        return self._counts.get(key, 0)
+
+    def has(self, key, n=1):
+        return self._counts.get(key, 0) >= n
+
+    def find(self, key):
+        """key 종류가 들어 있는 가장 앞 슬롯 번호, 없으면 None"""
+        slots = self._key_slots(key)
+        return min(slots) if slots else None
+
+    def has_space(self, item=None):
+        """빈 슬롯이 있는지. item을 주면 그 종류를 쌓을 자리도 셉니다."""
+        if self._free_count:
+            return True
+        return item is not None and bool(self._open.get(item_key(item)))
+
+    @property
+    def free_slots(self):
+        return self._free_count
+
+    def __iter__(self):
+        for stack in self._slots:
+            yield None if stack is None else stack[-1]
+
+    def __len__(self):
+        """들어 있는 아이템 수 (쌓인 것 포함)"""
+        return sum(self._counts.values())
+
+    def counts(self):
+        """종류 -> 개수 dict 사본 (개수가 0인 종류는 뺌)"""
+        return {key: n for key, n in self._counts.items() if n}
+
+    def clear(self):
+        """모두 비우고 꺼낸 아이템 목록을 반환합니다."""
+        items = [it for stack in self._slots if stack is not None for it in stack]
+        self.__init__(self.capacity, self.stack_limit)
+        return items
+
+    def __repr__(self):
+        return '<Inventory {}/{} slots {}>'.format(self.capacity - self._free_count, self.capacity, self.counts())
+
+# end of inventory.py
@@ -1,89 +1,75 @@
 from pico2d import *
-import os
+import animation
+import render_queue
+from entity import Entity
 
-class Item:
+class Item(Entity):
     """Item 클래스: resources/item/ 폴더의 개별 이미지를 각각 다른 인스턴스로 가질 수 있습니다.
 
     생성자 인자:
-      - filename_or_name: 파일명('blue_1.png') 또는 이름('blue_1')을 허용합니다.
+      - filename_or_name: 파일명('blue_1.png'), 이름('blue_1') 또는 catalog.CatalogEntry를 허용합니다.
       - name: (선택) 인스턴스 이름. 주지 않으면 파일명에서 추출합니다.
       - load_image_now: True면 생성 시 즉시 이미지를 로드합니다. 기본은 True.
-      - frame_size: (w,h)로 스프라이트 시트일 경우 프레임 크기를 지정하면 update()로 애니메이션 가능.
-    """
+      - frame_size: (w,h)로 스프라이트 시트일 경우 프레임 크기를 지정하면 update(dt)로 애니메이션 가능.
+        프레임 영역 표는 이미지를 로드할 때 한 번 만듭니다.
 
-    def __init__(self, filename_or_name, name=None, load_image_now=True, frame_size=None):
-        self._module_dir = os.path.dirname(__file__)
-        self._items_dir = os.path.join(self._module_dir, 'resources', 'item')
+    경로와 속성은 카탈로그에서 가져오므로 생성할 때 파일 시스템에 접근하지 않습니다.
+    카탈로그에 없는 아이템이면 FileNotFoundError를 발생시킵니다.
+    """
 
-        # 결정된 파일명
-        if os.path.splitext(filename_or_name)[1] == '.png':
-            self.filename = os.path.basename(filename_or_name)
-        else:
-            # 사용자가 이름만 줬다면 .png를 붙인다
-            self.filename = filename_or_name + '.png'
+    __slots__ = ('frame_size', 'frame', 'frame_time', 'rects')
 
-        # 이름 우선순위: 인자 name > 파일명에서 추출
-        if name:
-            self.name = name
-        else:
-            self.name = os.path.splitext(self.filename)[0]
+    KIND = 'item'
 
-        # 경로
-        self.path = os.path.join(self._items_dir, self.filename)
+    # 월드에 그릴 때의 배율
+    draw_scale = 1.0
+    # 스프라이트 시트 프레임 하나의 길이 (초)
+    FRAME_TIME = 0.05
 
-        # 이미지 객체, 크기
-        self.image = None
-        self.w = None
-        self.h = None
+    def __init__(self, filename_or_name, name=None, load_image_now=True, frame_size=None):
+        Entity.__init__(self, filename_or_name, name=name, load_image_now=False)
 
         # 애니메이션 프레임 관련 옵션
         self.frame_size = frame_size  # (fw, fh) or None
         self.frame = 0
-        self.frame_count = 1
+        self.frame_time = 0.0
+        # 프레임별 clip_draw 영역 (left, bottom, w, h). 시트가 아니면 비어 있음
+        self.rects = ()
 
         if load_image_now:
             self.load()
 
-        # 기본 좌표
-        self.x = 0
-        self.y = 0
-
-        # 아이템 타입 (NPC에게 전달 가능한 item)
-        self.item_type = 'item'
+    @property
+    def animated(self):
+        """스프라이트 시트의 프레임이 2개 이상이면 매 update()마다 프레임을 진행합니다."""
+        return len(self.rects) > 1
 
     def load(self):
         """이미지를 로드합니다. open_canvas() 이후에 호출해야 안전합니다."""
         if self.image is not None:
             return
-        if not os.path.exists(self.path):
-            raise FileNotFoundError('아이템 이미지 파일을 찾을 수 없습니다: {}'.format(self.path))
-        self.image = load_image(self.path)
-        try:
-            self.w = self.image.w
-            self.h = self.image.h
-        except Exception:
-            self.w = None
-            self.h = None
-
-        # 프레임 크기가 지정되어 있다면 프레임 수 계산
+        Entity.load(self)
+
+        # 프레임 크기가 지정되어 있다면 이미지(아틀라스 영역) 안의 프레임 영역 표를 만듦
         if self.frame_size and self.w and self.h:
             fw, fh = self.frame_size
-            cols = self.w // fw
-            rows = self.h // fh
-            self.frame_count = max(1, cols * rows)
+            self.rects = animation.frame_rects(self.clip_x, self.clip_y, self.w, self.h, fw, fh)
 
-    @classmethod
-    def from_filename(cls, filename, name=None, load_image_now=True, frame_size=None):
-        return cls(filename, name=name, load_image_now=load_image_now, frame_size=frame_size)
+    def reset(self, name=None):
+        Entity.reset(self, name)
+        self.frame = 0
+        self.frame_time = 0.0
 
     @classmethod
     def from_name(cls, name, load_image_now=True, frame_size=None):
         return cls(name, name=name, load_image_now=load_image_now, frame_size=frame_size)
 
-    def update(self):
-        """프레임 애니메이션(있을 경우)을 진행합니다."""
-        if self.frame_count > 1:
-            self.frame = (self.frame + 1) % self.frame_count
+    def update(self, dt=FRAME_TIME):
+        """프레임 애니메이션(있을 경우)을 dt(초)만큼 진행합니다."""
+        count = len(self.rects)
+        if count > 1:
+            self.frame_time = (self.frame_time + dt) % (self.FRAME_TIME * count)
+            self.frame = int(self.frame_time / self.FRAME_TIME) % count
 
     def draw(self, x=None, y=None, scale=1.0):
         """아이템을 그립니다. 좌표를 주지 않으면 인스턴스의 x,y를 사용합니다."""
@@ -94,22 +80,33 @@ class Item:
         dx = self.x if x is None else x
         dy = self.y if y is None else y
 
-        if self.frame_size and self.w and self.h:
-            fw, fh = self.frame_size
-            cols = self.w // fw
-            # frame -> (col, row)
-            col = self.frame % cols
-            row = self.frame // cols
-            left = col * fw
-            bottom = row * fh
+        if self.rects:
+            left, bottom, fw, fh = self.rects[self.frame]
             self.image.clip_draw(left, bottom, fw, fh, dx, dy, int(fw*scale), int(fh*scale))
         else:
             if self.w is not None and self.h is not None:
-                self.image.draw(dx, dy, int(self.w*scale), int(self.h*scale))
+                self.draw_image(dx, dy, int(self.w*scale), int(self.h*scale))
             else:
                 self.image.draw(dx, dy)
 
-    def __repr__(self):
-        return '<Item name={!r} filename={!r} path={!r}>'.format(self.name, self.filename, self.path)
+    def submit_draw(self, queue, scale=None, layer=render_queue.LAYER_ITEMS):
+        """draw()와 같은 그리기 명령을 렌더 큐에 제출합니다."""
+        if self.image is None:
+            self.load()
+        if scale is None:
+            scale = self.draw_scale
+        image = self.image
+        x, y = self.x, self.y
+
+        if self.rects:
+            left, bottom, fw, fh = self.rects[self.frame]
+            dw, dh = int(fw * scale), int(fh * scale)
+            queue.submit(layer, 0, image, image.clip_draw, (left, bottom, fw, fh, x, y, dw, dh), x, y, dw, dh)
+        elif self.w is not None and self.h is not None:
+            dw, dh = int(self.w * scale), int(self.h * scale)
+            queue.submit(layer, 0, image, image.clip_draw,
+                         (self.clip_x, self.clip_y, self.w, self.h, x, y, dw, dh), x, y, dw, dh)
+        else:
+            queue.submit_call(layer, 0, image.draw, (x, y))
 
 # end of item.py
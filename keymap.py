@@ -0,0 +1,100 @@
+import json
+import os
+from pico2d import *
+
+# 키 매핑
+# 입력 이벤트를 (게임 상태, 이벤트 종류, 키 코드) -> 핸들러 표로 한 번에 찾아 처리합니다.
+# 동작(Action)은 이름과 눌렀을 때/뗐을 때 핸들러, 동작하는 게임 상태로 정의하고,
+# 어떤 키가 어떤 동작인지는 바인딩 표(동작 이름 -> 키 이름 목록)로 따로 정합니다.
+# 바인딩은 keymap.json(또는 환경 변수 KEYMAP_PATH의 파일)로 바꿀 수 있습니다. 파일에 적은 동작만 바뀝니다.
+#   {"move_up": ["UP", "w", "i"], "interact": ["e", "RETURN"]}
+# 키 이름은 pico2d의 SDLK_ 상수에서 앞의 'SDLK_'를 뺀 이름입니다. (예: 'UP', 'a', 'F3', 'LSHIFT')
+#
+# 표의 키에 이벤트 종류가 들어 있으므로, 백엔드가 다른 입력(게임패드 버튼 등)을 이벤트로 넘겨 주면
+# Action의 press_type/release_type만 바꿔 같은 방식으로 연결할 수 있습니다.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_PATH = os.environ.get('KEYMAP_PATH') or os.path.join(BASE_DIR, 'keymap.json')
+
+# 게임 상태 (source.game_state 값)
+STATES = ('startpage', 'game', 'endpage')
+
+# 기본 바인딩: 동작 이름 -> 키 이름 목록
+DEFAULT_BINDINGS = {
+    'quit': ['ESCAPE'],
+    'start': ['e'],
+    'end_game': ['q'],
+    'toggle_profiler': ['F3'],
+    'move_up': ['UP', 'w'],
+    'move_down': ['DOWN', 's'],
+    'move_left': ['LEFT', 'a'],
+    'move_right': ['RIGHT', 'd'],
+    'run': ['LSHIFT', 'RSHIFT'],
+    'interact': ['e'],
+}
+# 숫자키 0~9: 선택 슬롯 변경
+for _i in range(10):
+    DEFAULT_BINDINGS['slot_{}'.format(_i)] = [str(_i)]
+del _i
+
+
+class Action:
+    """입력 동작 하나.
+    - press / release: 키를 눌렀을 때 / 뗐을 때 인자 없이 호출되는 함수 (없으면 None). False를 반환하면 게임 종료
+    - states: 동작하는 게임 상태 목록 (None이면 모든 상태)
+    """
+
+    __slots__ = ('name', 'press', 'release', 'states', 'press_type', 'release_type')
+
+    def __init__(self, name, press=None, release=None, states=None,
+                 press_type=SDL_KEYDOWN, release_type=SDL_KEYUP):
+        self.name = name
+        self.press = press
+        self.release = release
+        self.states = STATES if states is None else tuple(states)
+        self.press_type = press_type
+        self.release_type = release_type
+
+
+def key_code(name):
+    """키 이름('UP', 'a', 'F3')을 SDLK 코드로 바꿉니다. 모르는 이름이면 ValueError."""
+    code = globals().get('SDLK_' + name)
+    if code is None:
+        raise ValueError('알 수 없는 키 이름입니다: {!r}'.format(name))
+    return code
+
+
+def load_bindings(path=CONFIG_PATH):
+    """기본 바인딩에 설정 파일의 내용을 덮어써서 반환합니다. 파일이 없으면 기본 바인딩 그대로."""
+    bindings = {action: list(keys) for action, keys in DEFAULT_BINDINGS.items()}
+    if path and os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            overrides = json.load(f)
+        for action, keys in overrides.items():
+            if action not in bindings:
+                raise ValueError('{}: 알 수 없는 동작입니다: {!r}'.format(path, action))
+            bindings[action] = list(keys)
+    return bindings
+
+
+def compile(actions, bindings):
+    """동작 목록과 바인딩으로 (게임 상태, 이벤트 종류, 키 코드) -> 핸들러 표를 만듭니다.
+    같은 상태에서 한 키가 두 동작에 묶이면 ValueError."""
+    table = {}
+    owners = {}
+    for action in actions:
+        for name in bindings.get(action.name, ()):
+            code = key_code(name)
+            for event_type, handler in ((action.press_type, action.press), (action.release_type, action.release)):
+                if handler is None:
+                    continue
+                for state in action.states:
+                    slot = (state, event_type, code)
+                    if slot in table:
+                        raise ValueError('{} 키가 {} 상태에서 {}와 {}에 함께 묶여 있습니다'.format(
+                            name, state, owners[slot], action.name))
+                    table[slot] = handler
+                    owners[slot] = action.name
+    return table
+
+# end of keymap.py
@@ -0,0 +1,45 @@
+from collections import OrderedDict
+import gfx
+
+# 텍스트 라벨 캐시
+# pico2d의 Font.draw()는 호출할 때마다 글리프를 래스터화하고 텍스처를 새로 만듭니다.
+# 여기서는 (폰트, 문자열, 색상)마다 한 번만 래스터화해 두고 텍스처를 재사용합니다.
+# 폰트 크기는 폰트 객체에 포함되어 있으므로(assets가 (경로, 크기)별로 공유) 폰트 객체가 곧 키가 됩니다.
+
+# 캐시에 보관할 최대 라벨 수 (넘으면 오래 안 쓴 것부터 버림)
+MAX_LABELS = 256
+
+# (id(font), text, color) -> (font, Image)
+# font를 같이 보관해 두어 id가 재사용되는 일을 막습니다.
+_labels = OrderedDict()
+
+
+def get_label(font, text, color=(0, 0, 0)):
+    """(font, text, color)에 해당하는 라벨 Image를 반환합니다. 처음 한 번만 래스터화합니다."""
+    key = (id(font), text, tuple(color))
+    cached = _labels.get(key)
+    if cached is not None:
+        _labels.move_to_end(key)
+        return cached[1]
+    image = gfx.render_text(font, text, color)
+    _labels[key] = (font, image)
+    while len(_labels) > MAX_LABELS:
+        _labels.popitem(last=False)
+    return image
+
+
+def draw_image_label(image, x, y):
+    """Font.draw()와 같은 기준으로 라벨을 그립니다. (x는 왼쪽 끝, y는 세로 중앙)"""
+    image.draw(x + image.w / 2, y)
+
+
+def draw_label(font, x, y, text, color=(0, 0, 0)):
+    """font.draw(x, y, text, color)를 대신합니다. 결과는 같고 래스터화는 한 번만 일어납니다."""
+    draw_image_label(get_label(font, text, color), x, y)
+
+
+def clear():
+    """캐시된 라벨을 모두 버립니다. (close_canvas() 전에 호출)"""
+    _labels.clear()
+
+# end of labels.py
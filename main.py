@@ -1,25 +1,95 @@
+import startup
+
+# 시작 시간 측정 (import 시간을 재기 위해 다른 모듈보다 먼저)
+startup.begin()
+
+import os
+import time
+
+if os.environ.get('PICO2D_HEADLESS'):
+    # SDL 창 없이 실행: 그리기 호출만 기록하는 백엔드를 pico2d로 설치 (CI용)
+    import headless_pico2d
+    headless_pico2d.install()
+
 from pico2d import delay
+import gfx
+import profiler
 import source
 
+startup.mark('imports')
+startup.watch_assets()
+
+# 정적 화면에서 입력을 기다리는 최대 시간 (초). 시간이 지나도 이벤트가 없으면 그냥 다시 기다림
+IDLE_WAIT_TIMEOUT = 0.5
+
+# 시뮬레이션 고정 스텝 (초). 게임 로직은 항상 이 간격으로 진행됨 (20 Hz)
+SIM_DT = 0.05
+# 렌더링 목표 프레임률. 시뮬레이션 속도와 따로 바꿀 수 있음
+RENDER_FPS = 20
+# 한 프레임이 너무 오래 걸렸을 때 따라잡기 스텝이 폭주하지 않도록 제한 (초)
+MAX_FRAME_TIME = 0.25
+
 
 def main():
     # 리소스 로드 및 캔버스 열기
     source.init(800, 600)
+    startup.mark('init')
 
+    render_interval = 1.0 / RENDER_FPS
     running = True
+    accumulator = 0.0
+    prev_time = time.perf_counter()
     try:
         while running:
+            idle = source.is_idle()
+            if idle:
+                # 시작/엔딩 페이지: 입력 이벤트가 올 때까지 잠듦 (다시 그리지 않음)
+                woke = gfx.wait_for_event(IDLE_WAIT_TIMEOUT)
+                # 잠든 시간은 게임 시간에 넣지 않음
+                prev_time = time.perf_counter()
+                if not woke:
+                    continue
+                # 키 입력뿐 아니라 창 가림/복원 이벤트에도 깨어나므로 한 번 다시 그림
+                source.request_redraw()
+            profiler.begin_frame()
+            t = profiler.start()
             running = source.handle_events()
-            update_result = source.update()
-            # update()가 False를 반환하면 게임 종료
-            if update_result == False:
-                running = False
+            profiler.stop('handle_events', t)
+
+            # 실제 경과 시간을 누적해서 고정 스텝으로 나눠 진행
+            now = time.perf_counter()
+            accumulator += min(now - prev_time, MAX_FRAME_TIME)
+            prev_time = now
+            t = profiler.start()
+            while accumulator >= SIM_DT:
+                accumulator -= SIM_DT
+                update_result = source.update(SIM_DT)
+                # update()가 False를 반환하면 게임 종료
+                if update_result == False:
+                    running = False
+                    break
+            profiler.stop('update', t)
+            t = profiler.start()
             source.render()
-            delay(0.05)
+            profiler.stop('render', t)
+            profiler.end_frame()
+
+            # 시작 시간 보고서: 미리 로드가 끝나 바로 플레이할 수 있게 된 시각 (첫 화면 시각은 render()가 기록)
+            if not startup.marked('interactive') and source.is_ready():
+                startup.mark('interactive')
+                startup.write_report()
+
+            if not idle:
+                # 다음 렌더 시점까지 남은 시간만큼만 대기
+                remaining = render_interval - (time.perf_counter() - now)
+                if remaining > 0:
+                    delay(remaining)
     except KeyboardInterrupt:
         # Ctrl+C로 종료 허용
         pass
     finally:
+        # 미리 로드가 끝나기 전에 종료했으면 그때까지의 기록을 남김
+        startup.write_report()
         # 자원 해제
         source.cleanup()
 
@@ -1,4 +1,7 @@
 from pico2d import *
+import assets
+import atlas
+import tile_background
 
 # 타일 설정
 TILE_SIZE = 50
@@ -24,28 +27,63 @@ MAP_DATA = [
     [2, 3, 4, 5, 6, 7, 8, 9, 10, 1, 2, 3, 4, 5, 6, 7]
 ]
 
-# 타일 이미지 저장
+# 타일 스프라이트 저장 (타일 번호 -> atlas.Sprite)
 tile_images = {}
 
+# pot 방으로 가는 arrow 이미지
+ARROW_PATH = 'resources/arrow.png'
+arrow_image = None
+
+# 구워 둔 배경 (MAP_DATA나 tile_images가 바뀌면 다음 draw_map()에서 알아서 다시 구움)
+background = tile_background.TileBackground(MAP_DATA, tile_images, TILE_SIZE, SCREEN_WIDTH, SCREEN_HEIGHT)
+
 
 def load_tiles():
     """타일 이미지를 로드합니다."""
     global tile_images
     for i in range(1, 11):
-        tile_images[i] = load_image(f'resources/tiles/grass{i}.png')
+        path = f'resources/tiles/grass{i}.png'
+        # 두 맵이 같은 타일(아틀라스)을 쓰므로 공유 에셋 관리자를 통해 한 번만 로드됨
+        new_sprite = atlas.get_sprite(path)
+        if i in tile_images:
+            atlas.release_sprite(path)
+        tile_images[i] = new_sprite
+    invalidate_background()
+
+
+def unload_tiles():
+    """타일 이미지의 참조를 반납합니다."""
+    for i in tile_images:
+        atlas.release_sprite(f'resources/tiles/grass{i}.png')
+    tile_images.clear()
+    invalidate_background()
+
+
+def load_arrow():
+    """arrow 이미지를 로드합니다."""
+    global arrow_image
+    if arrow_image is None:
+        arrow_image = assets.get_image(ARROW_PATH)
+
+
+def unload_arrow():
+    global arrow_image
+    if arrow_image is not None:
+        assets.release_image(ARROW_PATH)
+        arrow_image = None
+
+
+def invalidate_background():
+    """캐시된 배경을 버립니다. 다음 draw_map()에서 다시 굽습니다."""
+    background.invalidate()
 
 
 def draw_map():
-    """맵을 그립니다."""
-    for row in range(MAP_HEIGHT):
-        for col in range(MAP_WIDTH):
-            tile_num = MAP_DATA[row][col]
-            # 화면 좌표 계산 (왼쪽 아래가 (0,0))
-            x = col * TILE_SIZE + TILE_SIZE // 2
-            y = SCREEN_HEIGHT - (row * TILE_SIZE + TILE_SIZE // 2)
-
-            if tile_num in tile_images:
-                tile_images[tile_num].draw(x, y, TILE_SIZE, TILE_SIZE)
+    """맵을 그립니다.
+    192개의 타일을 매 프레임 그리지 않고, 한 번 구운 배경 텍스처를 한 번에 그립니다.
+    MAP_DATA나 타일이 바뀌었거나 invalidate_background()를 부른 뒤에만 다시 굽습니다.
+    """
+    background.draw()
 
 
 def update_map():
@@ -0,0 +1,405 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import timeit
+
+# 함수 단위 마이크로 벤치마크
+# 자주 불리는 헬퍼 함수들을 timeit으로 재고, 저장된 기준값(JSON)과 비교합니다.
+# 기준값보다 THRESHOLD 이상 느려진 함수가 있으면 종료 코드 1로 끝나므로 커밋 전 검사에 쓸 수 있습니다.
+#
+# 예)
+#   python microbench.py                   # 측정 후 기준값과 비교
+#   python microbench.py --save            # 현재 측정값을 기준값으로 저장
+#   python microbench.py pot.              # 이름에 'pot.'이 들어간 벤치마크만 실행
+#   python microbench.py --threshold 0.5   # 50% 이상 느려질 때만 실패
+#
+# 그리기가 필요한 함수도 잴 수 있도록 헤드리스 백엔드(headless_pico2d)로 실행합니다.
+# 기준값은 측정한 기계에 따라 다르므로, 다른 기계에서는 먼저 --save로 새로 만드세요.
+#
+# 잡음 처리:
+#   - 벤치마크마다 ROUNDS번 따로(게임을 새로 초기화하고) 재서 중앙값으로 판정하고,
+#     라운드 사이의 차이(잡음)만큼은 THRESHOLD에 더해 허용합니다.
+#   - 기계 전체가 느려진 경우(다른 프로세스, 클럭)를 빼기 위해 순수 파이썬 보정 함수를 함께 재고,
+#     기준값을 저장할 때의 보정값('_calibration')과의 비율로 기준값을 맞춘 뒤 비교합니다.
+#
+# 기준값은 성능을 일부러 바꾼 커밋에서만 --save <이름>으로 그 항목만 갱신하고, 이유를 커밋 메시지에 적으세요.
+# 손으로 숫자를 고치거나 잡음 때문에 다시 저장하면 검사가 의미 없어집니다.
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'microbench_baseline.json')
+
+# 기준값 대비 허용하는 느려짐 비율 (0.25 = 25%)
+THRESHOLD = 0.25
+
+# timeit 반복 설정: 한 라운드에서 REPEAT번 재서 가장 빠른 값을 씀 (다른 프로세스에 의한 잡음 제거)
+# 한 번 잴 때 호출 횟수는 timeit.autorange()가 0.2초를 넘기도록 정함
+REPEAT = 3
+
+# 벤치마크마다 따로 재는 라운드 수. 라운드 값의 중앙값으로 판정하고, 최댓값-최솟값을 잡음으로 봄
+ROUNDS = 3
+
+# 기준값 파일에서 보정값을 담는 키 (벤치마크 이름과 겹치지 않도록 _로 시작)
+CALIBRATION_KEY = '_calibration'
+
+# 기준값보다 느리게 나온 벤치마크를 다시 재는 횟수. 다시 잰 라운드를 더해 중앙값으로 판정 (일시적인 부하로 인한 오탐 방지)
+RETRIES = 2
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description='function-level micro benchmarks with stored baselines')
+    parser.add_argument('pattern', nargs='?', default='', help='이름에 이 문자열이 들어간 벤치마크만 실행')
+    parser.add_argument('--list', action='store_true', help='벤치마크 목록 출력')
+    parser.add_argument('--save', action='store_true', help='측정값을 기준값 파일에 저장 (기존 항목은 덮어씀)')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='기준값 JSON 경로')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help='기준값 대비 허용하는 느려짐 비율 (기본 {})'.format(THRESHOLD))
+    parser.add_argument('--repeat', type=int, default=REPEAT, help='라운드마다 측정 반복 횟수 (가장 빠른 값 사용)')
+    parser.add_argument('--rounds', type=int, default=ROUNDS, help='벤치마크마다 따로 재는 라운드 수 (중앙값 사용)')
+    return parser.parse_args(argv)
+
+
+# --- 벤치마크 정의 ---
+# 각 setup 함수는 준비를 마친 뒤 측정할 인자 없는 함수를 반환합니다.
+BENCHMARKS = {}
+
+
+def benchmark(name, description):
+    def register(setup):
+        BENCHMARKS[name] = (description, setup)
+        return setup
+    return register
+
+
+@benchmark('source.respawn_world_items', '월드 과일 10개 재배치 (카탈로그 조회 + 위치 선택)')
+def _bench_respawn(source):
+    return source.respawn_world_items
+
+
+@benchmark('spawner.sample', '과일 10개 위치 뽑기 (witch/NPC/arrow 제외)')
+def _bench_spawner_sample(source):
+    import spawner
+    region = (source.SPAWN_MARGIN, source.SPAWN_MARGIN, 800 - source.SPAWN_MARGIN, 600 - source.SPAWN_MARGIN)
+    zones = source.spawn_exclusions()
+
+    def run():
+        spawner.sample(source.FRUIT_COUNT, region, source.SPAWN_MIN_DIST, exclusions=zones)
+    return run
+
+
+@benchmark('spawner.sample.event', '이벤트 맵 크기(4000x4000)에 2000개 뽑기')
+def _bench_spawner_event(source):
+    import spawner
+
+    def run():
+        spawner.sample(2000, (0, 0, 4000, 4000), 40)
+    return run
+
+
+@benchmark('pot.check_pot_collision', 'pot 바운딩 박스 충돌 검사 (충돌 / 비충돌)')
+def _bench_pot_collision(source):
+    import pot
+    check = pot.check_pot_collision
+
+    def run():
+        check(pot.POT_X, pot.POT_Y, 100, 100)
+        check(100, 100, 100, 100)
+    return run
+
+
+@benchmark('pot.check_near_pot', 'pot 상호작용 반경 검사 (근처 / 멀리)')
+def _bench_near_pot(source):
+    import pot
+    check = pot.check_near_pot
+
+    def run():
+        check(pot.POT_X + 10, pot.POT_Y)
+        check(100, 100)
+    return run
+
+
+@benchmark('pot.find_recipe', '재료 3개로 레시피 찾기 (일치 / 기본값)')
+def _bench_find_recipe(source):
+    import pot
+    import recipes
+    find = pot.find_recipe
+    # pot은 재료를 넣을 때마다 표준형 키를 갱신해 두므로 찾을 때는 키만 넘김
+    hit = recipes.canonical(['grape', 'grape', 'grape'])
+    miss = recipes.canonical(['apple', 'peach', 'banana'])
+
+    def run():
+        find(hit)
+        find(miss)
+    return run
+
+
+@benchmark('recipes.find.large', '레시피 5000개 책에서 찾기 (일치 / 없음 / 부분 조회)')
+def _bench_find_large(source):
+    import recipes
+    names = ['fruit_{:03d}'.format(i) for i in range(40)]
+    rng = random.Random(5)
+    book = {}
+    while len(book) < 5000:
+        ingredients = [rng.choice(names) for _ in range(rng.randint(2, 5))]
+        book[recipes.canonical(ingredients)] = {'ingredients': ingredients, 'result': 'red_1.png'}
+    recipes.build({'capacity': 5, 'recipes': list(book.values())})
+    hit = list(next(iter(book)))
+    miss = ['apple', 'apple']
+    prefix = hit[:1]
+
+    def run():
+        recipes.find(hit)
+        recipes.find(miss)
+        recipes.completions(prefix)
+    return run
+
+
+@benchmark('witch.add_to_inventory', '9칸이 찬 인벤토리에 넣고 다시 빼기')
+def _bench_add_to_inventory(source):
+    from fruit import Fruit
+    witch = source.witch
+    witch.clear_inventory()
+    # 종류가 모두 달라야 쌓이지 않고 한 칸씩 차지함
+    for i in range(witch.inventory.capacity - 1):
+        witch.add_to_inventory(Fruit.from_id('apple', name='filler{}'.format(i), load_image_now=True))
+    item = Fruit.from_id('grape', load_image_now=True)
+    add = witch.add_to_inventory
+    remove = witch.remove_from_inventory
+
+    def run():
+        remove(add(item))
+    return run
+
+
+@benchmark('inventory.add', '499칸이 찬 500칸 가방에 넣고 빼기 + 개수 확인')
+def _bench_inventory_large(source):
+    import inventory
+    from fruit import Fruit
+    bag = inventory.Inventory(500)
+    for i in range(bag.capacity - 1):
+        bag.add(Fruit.from_id('apple', name='filler{}'.format(i), load_image_now=False))
+    item = Fruit.from_id('grape', load_image_now=False)
+
+    def run():
+        bag.remove(bag.add(item))
+        bag.has('grape', 3)
+    return run
+
+
+@benchmark('witch._draw_item_at_slot', '선택 슬롯의 아이템 그리기')
+def _bench_draw_item_at_slot(source):
+    from fruit import Fruit
+    witch = source.witch
+    witch.clear_inventory()
+    witch.add_to_inventory(Fruit.from_id('peach', load_image_now=True))
+    draw = witch._draw_item_at_slot
+
+    def run():
+        draw(0)
+    return run
+
+
+@benchmark('witch.draw_hotbar', '10칸 중 5칸이 찬 핫바 그리기 (쌓인 칸 포함)')
+def _bench_draw_hotbar(source):
+    from fruit import Fruit
+    witch = source.witch
+    witch.clear_inventory()
+    for fruit_id in ('apple', 'apple', 'grape', 'peach', 'banana', 'strawberry'):
+        witch.add_to_inventory(Fruit.from_id(fruit_id, load_image_now=True))
+    draw = witch.draw_hotbar
+
+    def run():
+        draw(400)
+    return run
+
+
+@benchmark('map.draw_map', '캐시된 배경 그리기')
+def _bench_draw_map(source):
+    import map as tilemap
+    tilemap.draw_map()
+    return tilemap.draw_map
+
+
+@benchmark('map.draw_map.rebake', '배경을 무효화한 뒤 다시 굽기')
+def _bench_draw_map_rebake(source):
+    import map as tilemap
+
+    def run():
+        tilemap.invalidate_background()
+        tilemap.draw_map()
+    return run
+
+
+@benchmark('spatial.query_radius', '과일 3000개 중 PICKUP_RADIUS 안의 것 찾기')
+def _bench_query_radius(source):
+    from fruit import Fruit
+    for _ in range(3000):
+        f = Fruit.from_id('apple', load_image_now=True)
+        source.spawn_world_item(f, random.randint(0, 800), random.randint(0, 600))
+    query = source.world_items.query_radius
+
+    def run():
+        query(400, 300, source.PICKUP_RADIUS)
+    return run
+
+
+# --- 측정 ---
+def _reset_world(source):
+    """벤치마크마다 같은 상태에서 시작하도록 게임을 다시 초기화합니다."""
+    random.seed(1)
+    source.init(800, 600)
+    source.start_game()
+
+
+def measure(func, repeat=REPEAT):
+    """func 한 번 호출에 걸리는 시간(나노초)을 반환합니다. 여러 번 재서 가장 빠른 값을 씁니다."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number * 1e9
+
+
+def _calibration_work():
+    # 기계 속도 보정용 순수 파이썬 작업 (게임 코드와 무관하므로 코드를 바꿔도 값이 변하지 않음)
+    table = {}
+    for i in range(200):
+        table[i % 37] = table.get(i % 37, 0) + i
+    return sorted(table.values())
+
+
+def calibrate(repeat=REPEAT, rounds=ROUNDS):
+    """보정 작업 한 번의 시간(나노초). 라운드 중 가장 빠른 값"""
+    return min(measure(_calibration_work, repeat) for _ in range(rounds))
+
+
+def run(names, repeat=REPEAT, rounds=ROUNDS):
+    """names에 해당하는 벤치마크를 rounds번씩 실행하고 {이름: [라운드별 ns/call]}을 반환합니다."""
+    import source
+    results = {name: [] for name in names}
+    for _ in range(rounds):
+        for name in names:
+            setup = BENCHMARKS[name][1]
+            # 게임 코드의 print 출력이 결과를 가리지 않도록 버림
+            with contextlib.redirect_stdout(io.StringIO()):
+                _reset_world(source)
+                func = setup(source)
+                results[name].append(measure(func, repeat))
+    source.cleanup()
+    return results
+
+
+def median(values):
+    values = sorted(values)
+    mid = len(values) // 2
+    if len(values) % 2:
+        return values[mid]
+    return (values[mid - 1] + values[mid]) / 2
+
+
+def noise(values):
+    """라운드 사이의 차이: (최댓값 - 최솟값) / 중앙값"""
+    return (max(values) - min(values)) / median(values) if len(values) > 1 else 0.0
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path, results, calibration):
+    """results의 항목만 라운드 중앙값으로 덮어씁니다. 보정값은 파일에 없을 때만 기록합니다.
+    (이미 있는 기준값들이 그 보정값에 맞춰 재어졌으므로)"""
+    baseline = load_baseline(path)
+    scale = calibration_scale(baseline, calibration)
+    # 저장하는 값도 파일의 보정값 기준으로 맞춤
+    baseline.update({name: round(median(rounds) / scale, 1) for name, rounds in results.items()})
+    baseline.setdefault(CALIBRATION_KEY, round(calibration, 1))
+    with open(path, 'w') as f:
+        json.dump(dict(sorted(baseline.items())), f, indent=2)
+        f.write('\n')
+
+
+def calibration_scale(baseline, calibration):
+    """지금 기계가 기준값을 잴 때보다 몇 배 느린지 (보정값이 없으면 1)"""
+    base = baseline.get(CALIBRATION_KEY)
+    if not base:
+        return 1.0
+    return calibration / base
+
+
+def compare(results, baseline, threshold=THRESHOLD, scale=1.0):
+    """기준값(scale배로 맞춤)과 비교해 (이름, 측정값, 기준값, 변화율, 잡음, 판정) 목록을 반환합니다.
+    변화율이 threshold + 잡음을 넘을 때만 REGRESSED입니다."""
+    rows = []
+    for name, rounds in results.items():
+        ns = median(rounds)
+        spread = noise(rounds)
+        base = baseline.get(name)
+        if base is None:
+            rows.append((name, ns, None, None, spread, 'new'))
+            continue
+        base *= scale
+        change = ns / base - 1.0
+        rows.append((name, ns, base, change, spread, 'REGRESSED' if change > threshold + spread else 'ok'))
+    return rows
+
+
+def report(rows):
+    print('{:<28}{:>14}{:>14}{:>9}{:>8}  {}'.format('benchmark', 'ns/call', 'baseline', 'change', 'noise', ''))
+    for name, ns, base, change, spread, verdict in rows:
+        base_text = '-' if base is None else '{:.1f}'.format(base)
+        change_text = '-' if change is None else '{:+.1%}'.format(change)
+        print('{:<28}{:>14.1f}{:>14}{:>9}{:>8.0%}  {}'.format(name, ns, base_text, change_text, spread, verdict))
+
+
+def main(argv=None):
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    names = [name for name in BENCHMARKS if args.pattern in name]
+    if args.list:
+        for name in names:
+            print('{:<28} {}'.format(name, BENCHMARKS[name][0]))
+        return 0
+    if not names:
+        print('일치하는 벤치마크가 없습니다: {} (--list로 목록 확인)'.format(args.pattern))
+        return 2
+
+    import headless_pico2d
+    headless_pico2d.install()
+
+    # 상대 경로 리소스('resources/...')가 이 폴더 기준으로 열리도록
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    calibration = calibrate(args.repeat, args.rounds)
+    results = run(names, repeat=args.repeat, rounds=args.rounds)
+
+    if args.save:
+        save_baseline(args.baseline, results, calibration)
+        report(compare(results, {}))
+        print('기준값 저장: {}'.format(args.baseline))
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    scale = calibration_scale(baseline, calibration)
+    rows = compare(results, baseline, args.threshold, scale)
+    for _ in range(RETRIES):
+        suspects = [row[0] for row in rows if row[5] == 'REGRESSED']
+        if not suspects:
+            break
+        # 다시 잰 라운드를 더해 중앙값과 잡음을 다시 계산
+        for name, rounds in run(suspects, repeat=args.repeat, rounds=args.rounds).items():
+            results[name].extend(rounds)
+        rows = compare(results, baseline, args.threshold, scale)
+    print('기계 속도 보정: 기준값 x{:.2f}'.format(scale))
+    report(rows)
+    regressed = [row[0] for row in rows if row[5] == 'REGRESSED']
+    if regressed:
+        print('기준값보다 {:.0%}(+잡음) 이상 느려짐: {}'.format(args.threshold, ', '.join(regressed)))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
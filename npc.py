@@ -1,49 +1,41 @@
 from pico2d import *
-import os
+import assets
+import catalog
+import labels
+import render_queue
+from entity import Entity
 
-class NPC:
+class NPC(Entity):
     """NPC 클래스: resources/npc/ 폴더의 개별 이미지를 각각 다른 인스턴스로 가질 수 있습니다.
 
     생성자 인자:
-      - filename_or_name: 파일명('girl1_idle.png') 또는 이름('girl1_idle')을 허용합니다.
+      - filename_or_name: 파일명('girl1_idle.png'), 이름('girl1_idle') 또는 catalog.CatalogEntry를 허용합니다.
       - name: (선택) 인스턴스 이름. 주지 않으면 파일명에서 추출합니다.
       - load_image_now: True면 생성 시 즉시 이미지를 로드합니다. 기본은 True.
-    """
-
-    def __init__(self, filename_or_name, name=None, load_image_now=True):
-        self._module_dir = os.path.dirname(__file__)
-        self._npc_dir = os.path.join(self._module_dir, 'resources', 'npc')
 
-        # 결정된 파일명
-        if os.path.splitext(filename_or_name)[1] == '.png':
-            self.filename = os.path.basename(filename_or_name)
-        else:
-            # 사용자가 이름만 줬다면 .png를 붙인다
-            self.filename = filename_or_name + '.png'
+    경로는 카탈로그에서 가져오므로 생성할 때 파일 시스템에 접근하지 않습니다.
+    """
 
-        # 이름 우선순위: 인자 name > 파일명에서 추출
-        if name:
-            self.name = name
-        else:
-            self.name = os.path.splitext(self.filename)[0]
+    __slots__ = ('show_message', 'heart', 'heart_increase', 'message_type', 'was_near',
+                 'hint_shown', 'hint2_shown', 'font', '_labels_key', '_labels_cache')
 
-        # 경로
-        self.path = os.path.join(self._npc_dir, self.filename)
+    KIND = 'npc'
+    # 이미지 전체를 항상 이 크기로 그림
+    DRAW_SIZE = (100, 100)
 
-        # 이미지 객체, 크기
-        self.image = None
-        self.w = None
-        self.h = None
+    # 메시지 폰트 (assets가 프로젝트 폴더 기준으로 해석)
+    FONT_PATH = 'ENCR10B.TTF'
+    FONT_SIZE = 16
 
-        # 기본 좌표
-        self.x = 0
-        self.y = 0
+    def __init__(self, filename_or_name, name=None, load_image_now=True):
+        Entity.__init__(self, filename_or_name, name=name, load_image_now=False)
 
         # 메시지 표시 플래그
         self.show_message = False
 
         # 호감도 시스템
         self.heart = 0
+        self.heart_increase = 1  # 마지막으로 받은 아이템의 호감도 (표시용)
         self.message_type = "default"  # "default", "heart", "hint", "hint2"
         self.was_near = False  # 이전 프레임에 가까웠는지 추적
         self.hint_shown = False  # 첫 번째 힌트 메시지를 한 번만 표시하기 위한 플래그
@@ -51,54 +43,40 @@ class NPC:
 
         # 폰트 (나중에 로드)
         self.font = None
+        # 메시지 라벨 캐시: (message_type, heart, heart_increase)가 바뀔 때만 다시 구성
+        self._labels_key = None
+        self._labels_cache = ()
 
         if load_image_now:
             self.load()
 
     def load(self):
         """이미지를 로드합니다. open_canvas() 이후에 호출해야 안전합니다."""
-        if self.image is not None:
-            return
-        if not os.path.exists(self.path):
-            raise FileNotFoundError('NPC 이미지 파일을 찾을 수 없습니다: {}'.format(self.path))
-        self.image = load_image(self.path)
-        try:
-            self.w = self.image.w
-            self.h = self.image.h
-        except Exception:
-            self.w = None
-            self.h = None
-
-        # 폰트 로드
+        Entity.load(self)
+
+        # 폰트 로드 (모든 NPC가 같은 폰트 객체를 공유)
         if self.font is None:
-            font_path = os.path.join(self._module_dir, 'ENCR10B.TTF')
-            self.font = load_font(font_path, 16)
+            self.font = assets.get_font(self.FONT_PATH, self.FONT_SIZE)
 
-    @classmethod
-    def from_filename(cls, filename, name=None, load_image_now=True):
-        return cls(filename, name=name, load_image_now=load_image_now)
+    def unload(self):
+        """공유 이미지/폰트의 참조를 반납합니다."""
+        Entity.unload(self)
+        if self.font is not None:
+            assets.release_font(self.FONT_PATH, self.FONT_SIZE)
+            self.font = None
+        self._labels_key = None
+        self._labels_cache = ()
 
     @classmethod
     def from_name(cls, name, load_image_now=True):
         return cls(name, name=name, load_image_now=load_image_now)
 
-    def update(self):
-        """애니메이션이 필요할 경우 오버라이드하여 사용"""
-        pass
-
     def receive_item(self, item):
         """아이템을 받아서 호감도 증가"""
-        item_name = getattr(item, 'name', 'unknown')
-
-        # 아이템별 호감도 증가량
-        if item_name == 'red_1':
-            heart_increase = 10
-        elif item_name == 'green_1':
-            heart_increase = 5
-        elif item_name == 'blue_1':
-            heart_increase = 3
-        else:
-            heart_increase = 1
+        item_name = item.name
+
+        # 아이템별 호감도 증가량 (카탈로그 메타데이터 표)
+        heart_increase = catalog.heart_value(item_name)
 
         self.heart += heart_increase
         self.heart_increase = heart_increase  # 표시용
@@ -117,26 +95,54 @@ class NPC:
         dy = self.y if y is None else y
 
         # 고정 크기 100x100으로 출력
-        self.image.draw(dx, dy, 100, 100)
+        self.image.draw(dx, dy, *self.DRAW_SIZE)
 
-        # 메시지 표시
+        # 메시지 표시 (미리 래스터화한 라벨을 그림)
         if self.show_message and self.font:
-            if self.message_type == "heart":
-                # 호감도 메시지 표시 (2줄)
-                heart_inc = getattr(self, 'heart_increase', 1)
-                self.font.draw(dx - 40, dy + 70, "heart +{}".format(heart_inc), (255, 255, 255))
-                self.font.draw(dx - 50, dy + 50, "current heart : {}".format(self.heart), (255, 255, 255))
-            elif self.message_type == "hint":
-                # 첫 번째 힌트 메시지 표시
-                self.font.draw(dx - 60, dy + 60, "Try Only Grapes", (255, 255, 0))
-            elif self.message_type == "hint2":
-                # 두 번째 힌트 메시지 표시
-                self.font.draw(dx - 65, dy + 60, "Try Only Peaches", (255, 255, 0))
-            else:
-                # 기본 메시지 표시
-                self.font.draw(dx - 50, dy + 60, "Give me Item", (255, 255, 255))
-
-    def __repr__(self):
-        return '<NPC name={!r} filename={!r} path={!r}>'.format(self.name, self.filename, self.path)
+            for ox, oy, label in self._message_labels():
+                labels.draw_image_label(label, dx + ox, dy + oy)
+
+    def submit_draw(self, queue):
+        """draw()와 같은 그리기 명령을 렌더 큐에 제출합니다.
+        NPC끼리는 y가 큰(화면 위쪽) NPC가 먼저 그려지도록 z = -y 를 사용합니다."""
+        if self.image is None:
+            self.load()
+        x, y = self.x, self.y
+        z = -y
+        w, h = self.DRAW_SIZE
+        queue.submit(render_queue.LAYER_ACTORS, z, self.image, self.image.draw, (x, y, w, h), x, y, w, h)
+
+        if self.show_message and self.font:
+            for ox, oy, label in self._message_labels():
+                lx = x + ox + label.w / 2
+                ly = y + oy
+                queue.submit(render_queue.LAYER_LABELS, z, label, label.draw, (lx, ly), lx, ly, label.w, label.h)
+
+    def _message_labels(self):
+        """현재 메시지의 (x 오프셋, y 오프셋, 라벨 Image) 목록을 반환합니다.
+        메시지 종류나 호감도가 바뀌었을 때만 다시 구성합니다."""
+        heart_inc = self.heart_increase
+        key = (self.message_type, self.heart, heart_inc)
+        if key == self._labels_key:
+            return self._labels_cache
+
+        if self.message_type == "heart":
+            # 호감도 메시지 표시 (2줄)
+            lines = [(-40, 70, "heart +{}".format(heart_inc), (255, 255, 255)),
+                     (-50, 50, "current heart : {}".format(self.heart), (255, 255, 255))]
+        elif self.message_type == "hint":
+            # 첫 번째 힌트 메시지 표시
+            lines = [(-60, 60, "Try Only Grapes", (255, 255, 0))]
+        elif self.message_type == "hint2":
+            # 두 번째 힌트 메시지 표시
+            lines = [(-65, 60, "Try Only Peaches", (255, 255, 0))]
+        else:
+            # 기본 메시지 표시
+            lines = [(-50, 60, "Give me Item", (255, 255, 255))]
+
+        self._labels_cache = tuple((ox, oy, labels.get_label(self.font, text, color))
+                                   for ox, oy, text, color in lines)
+        self._labels_key = key
+        return self._labels_cache
 
 # end of npc.py
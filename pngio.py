@@ -0,0 +1,123 @@
+import struct
+import zlib
+
+# PNG 읽기/쓰기 (표준 라이브러리만 사용)
+# 오프라인 빌드 도구(atlas_build.py)가 리소스 PNG를 픽셀로 풀고 다시 저장할 때 씁니다.
+# 게임 실행 중에는 쓰지 않습니다. (이미지는 pico2d/SDL_image가 로드)
+#
+# 지원하는 형식: 8비트, 인터레이스 없음, RGB(색 형식 2) / RGBA(색 형식 6)
+# 리소스 폴더의 PNG는 모두 이 두 형식입니다. 픽셀은 항상 RGBA bytearray(행은 위에서 아래로)로 다룹니다.
+
+SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# 색 형식 -> 픽셀당 채널 수
+_CHANNELS = {2: 3, 6: 4}
+
+
+def _chunks(data):
+    pos = len(SIGNATURE)
+    while pos < len(data):
+        length, kind = struct.unpack('>I4s', data[pos:pos + 8])
+        yield kind, data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+
+
+def _paeth(a, b, c):
+    p = a + b - c
+    pa = abs(p - a)
+    pb = abs(p - b)
+    pc = abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    if pb <= pc:
+        return b
+    return c
+
+
+def _unfilter(raw, width, height, bpp):
+    """필터를 되돌린 행들을 이어 붙여 반환합니다."""
+    stride = width * bpp
+    out = bytearray(stride * height)
+    prev = bytearray(stride)
+    pos = 0
+    for row in range(height):
+        kind = raw[pos]
+        line = bytearray(raw[pos + 1:pos + 1 + stride])
+        pos += 1 + stride
+        if kind == 1:
+            for i in range(bpp, stride):
+                line[i] = (line[i] + line[i - bpp]) & 0xFF
+        elif kind == 2:
+            for i in range(stride):
+                line[i] = (line[i] + prev[i]) & 0xFF
+        elif kind == 3:
+            for i in range(stride):
+                left = line[i - bpp] if i >= bpp else 0
+                line[i] = (line[i] + ((left + prev[i]) >> 1)) & 0xFF
+        elif kind == 4:
+            for i in range(stride):
+                left = line[i - bpp] if i >= bpp else 0
+                up_left = prev[i - bpp] if i >= bpp else 0
+                line[i] = (line[i] + _paeth(left, prev[i], up_left)) & 0xFF
+        elif kind != 0:
+            raise ValueError('알 수 없는 PNG 필터입니다: {}'.format(kind))
+        out[row * stride:(row + 1) * stride] = line
+        prev = line
+    return out
+
+
+def read_png(path):
+    """PNG를 읽어 (너비, 높이, RGBA bytearray)를 반환합니다. 지원하지 않는 형식이면 ValueError."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(SIGNATURE):
+        raise ValueError('{}: PNG 파일이 아닙니다'.format(path))
+    header = None
+    idat = []
+    for kind, body in _chunks(data):
+        if kind == b'IHDR':
+            header = struct.unpack('>IIBBBBB', body)
+        elif kind == b'IDAT':
+            idat.append(body)
+        elif kind == b'IEND':
+            break
+    if header is None:
+        raise ValueError('{}: IHDR가 없습니다'.format(path))
+    width, height, depth, color, _, _, interlace = header
+    if depth != 8 or color not in _CHANNELS or interlace:
+        raise ValueError('{}: 지원하지 않는 PNG 형식입니다 (비트 {}, 색 형식 {}, 인터레이스 {})'.format(
+            path, depth, color, interlace))
+    bpp = _CHANNELS[color]
+    pixels = _unfilter(zlib.decompress(b''.join(idat)), width, height, bpp)
+    if bpp == 3:
+        rgba = bytearray(width * height * 4)
+        rgba[0::4] = pixels[0::3]
+        rgba[1::4] = pixels[1::3]
+        rgba[2::4] = pixels[2::3]
+        rgba[3::4] = b'\xff' * (width * height)
+        pixels = rgba
+    return width, height, pixels
+
+
+def _chunk(kind, body):
+    return struct.pack('>I', len(body)) + kind + body + struct.pack('>I', zlib.crc32(kind + body) & 0xFFFFFFFF)
+
+
+def write_png(path, width, height, rgba):
+    """RGBA 픽셀을 8비트 RGBA PNG로 저장합니다. (모든 행에 Up 필터 사용)"""
+    stride = width * 4
+    raw = bytearray()
+    prev = bytes(stride)
+    for row in range(height):
+        line = rgba[row * stride:(row + 1) * stride]
+        raw.append(2)
+        raw += bytes((a - b) & 0xFF for a, b in zip(line, prev))
+        prev = line
+    header = struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)
+    with open(path, 'wb') as f:
+        f.write(SIGNATURE)
+        f.write(_chunk(b'IHDR', header))
+        f.write(_chunk(b'IDAT', zlib.compress(bytes(raw), 9)))
+        f.write(_chunk(b'IEND', b''))
+
+# end of pngio.py
@@ -0,0 +1,107 @@
+import catalog
+from fruit import Fruit
+from item import Item
+
+# 엔티티 오브젝트 풀
+# 맵을 오갈 때마다 다시 뿌리는 과일과 pot에서 만드는 물약을 매번 새로 만들지 않고 재사용합니다.
+# 반납된 인스턴스는 이미지(공유 텍스처 참조)를 그대로 쥐고 카탈로그 항목별 목록에 보관되므로,
+# 다시 꺼낼 때 객체 생성도 이미지 로드도 일어나지 않습니다.
+#
+# 사용법:
+#   f = pool.fruits.acquire('apple')   # 카탈로그 ID 또는 CatalogEntry
+#   ...
+#   pool.release(f)                     # 월드/인벤토리/pot 어디에서도 더 쓰지 않을 때
+# 꺼낼 때 reset()이 불리므로 이름, 위치, 애니메이션 프레임은 새로 만든 것과 같은 상태가 됩니다.
+
+
+# 카탈로그 항목 하나당 보관하는 최대 인스턴스 수. 넘치는 인스턴스는 이미지 참조를 반납하고 버림
+MAX_FREE_PER_ENTRY = 64
+
+
+class EntityPool:
+    """한 엔티티 클래스의 인스턴스를 카탈로그 항목별로 보관하는 풀"""
+
+    def __init__(self, cls, max_free=MAX_FREE_PER_ENTRY):
+        self.cls = cls
+        self.max_free = max_free
+        # 카탈로그 ID -> 반납된 인스턴스 목록
+        self._free = {}
+        self.created = 0
+        self.reused = 0
+        self.released = 0
+        self.dropped = 0
+
+    def acquire(self, entry, name=None):
+        """entry(카탈로그 ID 또는 CatalogEntry)의 인스턴스를 꺼냅니다. 없으면 새로 만듭니다.
+        이미지는 로드된 상태로 반환됩니다. (open_canvas() 이후에 호출)"""
+        if not isinstance(entry, catalog.CatalogEntry):
+            entry = catalog.get(entry)
+        free = self._free.get(entry.id)
+        if free:
+            obj = free.pop()
+            obj.reset(name)
+            self.reused += 1
+        else:
+            obj = self.cls(entry, name=name, load_image_now=True)
+            self.created += 1
+        return obj
+
+    def release(self, obj):
+        """다 쓴 인스턴스를 돌려받습니다. 돌려준 뒤에는 obj를 더 쓰면 안 됩니다."""
+        self.released += 1
+        free = self._free.get(obj.entry.id)
+        if free is None:
+            free = self._free[obj.entry.id] = []
+        if len(free) >= self.max_free:
+            obj.unload()
+            self.dropped += 1
+            return
+        free.append(obj)
+
+    def free_count(self):
+        return sum(len(free) for free in self._free.values())
+
+    def stats(self):
+        """풀 상태 요약을 반환합니다."""
+        return {
+            'created': self.created,
+            'reused': self.reused,
+            'released': self.released,
+            'dropped': self.dropped,
+            'free': self.free_count(),
+            'in_use': self.created + self.reused - self.released,
+        }
+
+    def clear(self):
+        """보관 중인 인스턴스의 이미지 참조를 반납하고 버립니다."""
+        for free in self._free.values():
+            for obj in free:
+                obj.unload()
+        self._free.clear()
+
+
+fruits = EntityPool(Fruit)
+items = EntityPool(Item)
+
+_pools = {Fruit: fruits, Item: items}
+
+
+def release(obj):
+    """obj의 클래스에 맞는 풀에 돌려줍니다. 풀이 없는 클래스면 이미지 참조만 반납합니다."""
+    entity_pool = _pools.get(type(obj))
+    if entity_pool is None:
+        obj.unload()
+    else:
+        entity_pool.release(obj)
+
+
+def stats():
+    return {'fruits': fruits.stats(), 'items': items.stats()}
+
+
+def clear():
+    """모든 풀을 비웁니다. (assets.clear() 전에 호출)"""
+    fruits.clear()
+    items.clear()
+
+# end of pool.py
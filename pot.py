@@ -1,5 +1,10 @@
 from pico2d import *
-import time
+import animation
+import assets
+import atlas
+import pool
+import recipes
+import tile_background
 
 # 타일 설정
 TILE_SIZE = 50
@@ -24,9 +29,12 @@ MAP_DATA = [
     [3, 7, 5, 9, 2, 8, 1, 6, 10, 4, 3, 7, 8, 9, 1, 6]
 ]
 
-# 타일 이미지 저장
+# 타일 스프라이트 저장 (타일 번호 -> atlas.Sprite)
 tile_images = {}
 
+# 구워 둔 배경 (MAP_DATA나 tile_images가 바뀌면 다음 draw_map()에서 알아서 다시 구움)
+background = tile_background.TileBackground(MAP_DATA, tile_images, TILE_SIZE, SCREEN_WIDTH, SCREEN_HEIGHT)
+
 # Green Pot 애니메이션 설정
 FRAME_WIDTH = 48
 FRAME_HEIGHT = 48
@@ -44,12 +52,16 @@ POT_BBOX_BOTTOM = POT_Y - POT_BBOX_HEIGHT // 2
 POT_BBOX_TOP = POT_Y + 20
 
 # 애니메이션 변수
-green_pot_image = None
-frame_index = 0
-frame_time = 0
+POT_IMAGE_PATH = 'resources/pot/green_pot.png'
 FRAME_DELAY = 0.1  # 프레임당 0.1초
+# 48x48 프레임 6장을 200x200으로 그리는 반복 클립 (시트는 load_pots()에서 로드)
+pot_clip = animation.Clip(
+    animation.Sheet(POT_IMAGE_PATH, (FRAME_WIDTH, FRAME_HEIGHT), (POT_DRAW_SIZE, POT_DRAW_SIZE), FRAME_COUNT),
+    FRAME_DELAY, name='green_pot')
+pot_anim = animation.Player()
 
 # Arrow 이미지 설정
+ARROW_PATH = 'resources/arrow.png'
 arrow_image = None
 ARROW_X = 100
 ARROW_Y = 450
@@ -57,16 +69,14 @@ arrow_active = True  # arrow가 밟히면 False로 변경
 
 # Pot 리소스 목록 (투입된 아이템들)
 pot_resources = []
+# pot_resources 이름들의 표준형 키 (recipes.add_to_key로 넣을 때마다 갱신)
+pot_key = ()
 
 # Pot 상호작용 거리
 POT_INTERACTION_RADIUS = 120
 
-# Pot 최대 리소스 개수
-MAX_POT_RESOURCES = 3
-
 # 아이템 표시 위치 (pot 아래쪽)
 ITEM_DISPLAY_Y = 150
-ITEM_DISPLAY_START_X = POT_X - 80
 ITEM_DISPLAY_SPACING = 80
 ITEM_DISPLAY_SIZE = 50
 
@@ -74,76 +84,90 @@ ITEM_DISPLAY_SIZE = 50
 crafting_timer = None
 crafting_delay = 2.0  # 2초
 
-# 레시피 정의 (재료 조합 -> 결과 아이템)
-# 재료는 name으로 구분하며, 순서 무관
-RECIPES = {
-    # apple + grape + banana -> blue_1
-    frozenset(['apple', 'grape', 'banana']): 'blue_1.png',
-    # grape + grape + grape -> green_1
-    frozenset(['grape', 'grape', 'grape']): 'green_1.png',
-    # peach + peach + peach -> red_1
-    frozenset(['peach', 'peach', 'peach']): 'red_1.png',
-}
+# 레시피와 pot 최대 리소스 개수는 resources/recipes.json에서 읽음 (recipes 모듈)
 
 
 def load_tiles():
     """타일 이미지를 로드합니다."""
     global tile_images
     for i in range(1, 11):
-        tile_images[i] = load_image(f'resources/tiles/grass{i}.png')
+        path = f'resources/tiles/grass{i}.png'
+        # 두 맵이 같은 타일(아틀라스)을 쓰므로 공유 에셋 관리자를 통해 한 번만 로드됨
+        new_sprite = atlas.get_sprite(path)
+        if i in tile_images:
+            atlas.release_sprite(path)
+        tile_images[i] = new_sprite
+    invalidate_background()
+
+
+def pot_image_path():
+    """pot 시트를 로드할 파일 (화면 크기로 미리 바꿔 둔 캐시가 있으면 그 파일)"""
+    return pot_clip.sheet.texture_path()
 
 
 def load_pots():
     """POT 이미지를 로드합니다."""
-    global green_pot_image, arrow_image, arrow_active
-    green_pot_image = load_image('resources/pot/green_pot.png')
-    arrow_image = load_image('resources/arrow.png')
+    global arrow_image, arrow_active
+    pot_anim.play(pot_clip)
+    if arrow_image is None:
+        arrow_image = assets.get_image(ARROW_PATH)
     arrow_active = True  # arrow 활성화
 
 
-def draw_map():
-    """배경 맵을 그립니다."""
-    for row in range(MAP_HEIGHT):
-        for col in range(MAP_WIDTH):
-            tile_num = MAP_DATA[row][col]
-            # 화면 좌표 계산 (왼쪽 아래가 (0,0))
-            x = col * TILE_SIZE + TILE_SIZE // 2
-            y = SCREEN_HEIGHT - (row * TILE_SIZE + TILE_SIZE // 2)
+def unload_tiles():
+    """타일 이미지의 참조를 반납합니다."""
+    for i in tile_images:
+        atlas.release_sprite(f'resources/tiles/grass{i}.png')
+    tile_images.clear()
+    invalidate_background()
 
-            if tile_num in tile_images:
-                tile_images[tile_num].draw(x, y, TILE_SIZE, TILE_SIZE)
+
+def unload_pots():
+    """POT 이미지와 arrow 이미지의 참조를 반납합니다."""
+    global arrow_image
+    pot_anim.stop()
+    pot_clip.sheet.unload()
+    if arrow_image is not None:
+        assets.release_image(ARROW_PATH)
+        arrow_image = None
+
+
+def invalidate_background():
+    """캐시된 배경을 버립니다. 다음 draw_map()에서 다시 굽습니다."""
+    background.invalidate()
+
+
+def draw_map():
+    """배경 맵을 그립니다.
+    192개의 타일을 매 프레임 그리지 않고, 한 번 구운 배경 텍스처를 한 번에 그립니다.
+    MAP_DATA나 타일이 바뀌었거나 invalidate_background()를 부른 뒤에만 다시 굽습니다.
+    """
+    background.draw()
 
 
 def draw_pots():
     """Green Pot 애니메이션을 그립니다."""
-    global frame_index
-
-    if green_pot_image:
-        # 스프라이트 시트에서 현재 프레임 잘라내기 (48x48)
-        green_pot_image.clip_draw(
-            frame_index * FRAME_WIDTH, 0,  # 소스 x, y
-            FRAME_WIDTH, FRAME_HEIGHT,      # 소스 width, height
-            POT_X, POT_Y,                   # 그릴 위치
-            POT_DRAW_SIZE, POT_DRAW_SIZE    # 그릴 크기 (200x200)
-        )
+    if pot_anim.clip is not None:
+        # 현재 프레임을 200x200으로 그림 (프레임 영역은 시트를 로드할 때 만든 표에서 꺼냄)
+        pot_anim.draw(POT_X, POT_Y)
 
 
 def draw_pot_resources():
     """pot에 투입된 아이템들을 pot 아래쪽에 표시합니다."""
+    capacity = recipes.capacity()
+    # 최대 개수만큼의 칸이 pot 중심에 오도록 시작 위치 계산
+    start_x = POT_X - (capacity - 1) * ITEM_DISPLAY_SPACING / 2
     for i, item in enumerate(pot_resources):
-        if i >= MAX_POT_RESOURCES:
+        if i >= capacity:
             break
 
         # 아이템 표시 위치 계산
-        x = ITEM_DISPLAY_START_X + (i * ITEM_DISPLAY_SPACING)
+        x = start_x + (i * ITEM_DISPLAY_SPACING)
         y = ITEM_DISPLAY_Y
 
         # 아이템 이미지 그리기
-        try:
-            if hasattr(item, 'image') and item.image:
-                item.image.draw(x, y, ITEM_DISPLAY_SIZE, ITEM_DISPLAY_SIZE)
-        except Exception:
-            pass
+        if item.image:
+            item.draw_image(x, y, ITEM_DISPLAY_SIZE, ITEM_DISPLAY_SIZE)
 
 
 def draw_arrow():
@@ -153,39 +177,42 @@ def draw_arrow():
         arrow_image.composite_draw(0, 'h', ARROW_X, ARROW_Y)
 
 
-def update_pots():
-    """POT 애니메이션을 업데이트합니다."""
-    global frame_index, frame_time, crafting_timer, pot_resources
+def update_pots(dt=0.05):
+    """POT 애니메이션과 제작 타이머를 dt(초)만큼 진행합니다."""
+    global crafting_timer, pot_resources, pot_key
 
-    frame_time += 0.09  # delay(0.05) 기준 (main.py에서 사용)
-
-    if frame_time >= FRAME_DELAY:
-        frame_index = (frame_index + 1) % FRAME_COUNT
-        frame_time = 0
+    pot_anim.update(dt)
 
     # 제작 타이머 업데이트
     if crafting_timer is not None:
-        crafting_timer += 0.05  # main.py의 delay(0.05)와 동일
+        crafting_timer += dt
 
         # 2초가 지나면 아이템 제작
         if crafting_timer >= crafting_delay:
-            # 레시피 확인
-            resource_names = [getattr(item, 'name', 'unknown') for item in pot_resources]
-            recipe_key = frozenset(resource_names)
-
             # 레시피에 맞는 아이템 찾기
-            result_item = RECIPES.get(recipe_key, 'blue_1.png')  # 기본값은 blue_1
+            resource_names = [item.name for item in pot_resources]
+            result_item = find_recipe(pot_key)
 
             print(f'제작 완료! {result_item} 아이템이 생성됩니다.')
             print(f'사용된 재료: {resource_names}')
 
+            # 다 쓴 재료는 풀로 돌아감
+            for item in pot_resources:
+                pool.release(item)
             pot_resources = []
+            pot_key = ()
             crafting_timer = None
             return f'create_item:{result_item}'  # 생성할 아이템 파일명 반환
 
     return None
 
 
+def find_recipe(resource_key):
+    """재료의 표준형 키(recipes.canonical / add_to_key)에 맞는 결과 아이템 파일명을 반환합니다.
+    재료 개수도 구분하며, 맞는 레시피가 없으면 기본 결과(blue_1.png)."""
+    return recipes.result_for_key(resource_key)
+
+
 def check_pot_collision(x, y, width, height):
     """
     주어진 AABB(x, y, width, height)가 pot의 바운딩 박스와 충돌하는지 검사합니다.
@@ -218,20 +245,22 @@ def check_near_pot(witch_x, witch_y):
 def add_resource_to_pot(item):
     """
     pot의 리소스 목록에 아이템을 추가합니다.
-    최대 3개까지만 추가할 수 있습니다.
+    최대 recipes.capacity()개까지만 추가할 수 있습니다.
     성공하면 True, 실패하면 False를 반환합니다.
     """
-    global pot_resources, crafting_timer
-    if len(pot_resources) >= MAX_POT_RESOURCES:
-        print(f'Pot가 가득 찼습니다! (최대 {MAX_POT_RESOURCES}개)')
+    global pot_resources, pot_key, crafting_timer
+    capacity = recipes.capacity()
+    if len(pot_resources) >= capacity:
+        print(f'Pot가 가득 찼습니다! (최대 {capacity}개)')
         return False
 
     pot_resources.append(item)
-    item_name = getattr(item, 'name', None) or getattr(item, 'filename', str(item))
-    print(f'Pot에 {item_name} 추가됨! (현재 리소스: {len(pot_resources)}/{MAX_POT_RESOURCES}개)')
+    pot_key = recipes.add_to_key(pot_key, item.name)
+    item_name = item.name or item.filename
+    print(f'Pot에 {item_name} 추가됨! (현재 리소스: {len(pot_resources)}/{capacity}개)')
 
-    # 3개가 모이면 타이머 시작
-    if len(pot_resources) == MAX_POT_RESOURCES:
+    # 가득 차면 타이머 시작
+    if len(pot_resources) == capacity:
         crafting_timer = 0.0
         print('제작 시작! 2초 후 완성됩니다...')
 
@@ -249,8 +278,11 @@ def clear_pot_resources():
     """
     pot의 리소스 목록을 비웁니다.
     """
-    global pot_resources
+    global pot_resources, pot_key
+    for item in pot_resources:
+        pool.release(item)
     pot_resources = []
+    pot_key = ()
 
 
 # 테스트용 코드
@@ -267,7 +299,7 @@ if __name__ == '__main__':
         draw_arrow()    # Arrow 이미지 그리기 (y축 회전)
         update_canvas()
 
-        update_pots()   # 애니메이션 업데이트
+        update_pots(0.01)   # 애니메이션 업데이트
 
         # ESC 키로 종료
         events = get_events()
@@ -0,0 +1,137 @@
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import assets
+import gfx
+
+# 백그라운드 에셋 미리 로드
+# 이미지 로드를 두 단계로 나눕니다.
+#   1. 디코드 (파일 읽기 + PNG 풀기, raw 캐시면 메모리 매핑): 렌더러가 필요 없으므로 작업 스레드에서 진행
+#   2. 업로드 (텍스처 생성): 렌더러를 쓰므로 메인 스레드에서 step()마다 조금씩 진행
+# 올린 이미지는 참조 카운트 0으로 공유 에셋 캐시에 들어가므로, 나중에 씬이나 엔티티가
+# assets.get_image()를 부르면 파일을 다시 읽지 않고 바로 가져갑니다.
+#
+# 사용법:
+#   loader = preloader.Preloader(paths)
+#   loader.start()           # 작업 스레드에서 디코드 시작
+#   loader.step()            # 매 프레임: 디코드가 끝난 것을 UPLOAD_BUDGET초 안에서 업로드
+#   loader.progress()        # 0.0 ~ 1.0
+#   loader.finish()          # 남은 것을 기다려 모두 업로드 (다 될 때까지 블록)
+
+# 디코드 작업 스레드 수
+WORKERS = 2
+# step() 한 번에 업로드에 쓰는 최대 시간 (초). 한 장은 넘더라도 끝까지 올림
+UPLOAD_BUDGET = 0.004
+
+
+def _timed_decode(path):
+    """작업 스레드에서 실행: 디코드 결과와 걸린 시간(초)을 함께 반환합니다."""
+    started = time.perf_counter()
+    decoded = assets.decode_image(path)
+    return decoded, time.perf_counter() - started
+
+
+class Preloader:
+    """paths의 이미지를 미리 로드합니다. 이미 캐시에 있는 경로는 건너뜁니다."""
+
+    def __init__(self, paths, workers=WORKERS):
+        self.paths = []
+        seen = set()
+        for path in paths:
+            key = assets.resolve_path(path)
+            if key in seen or assets.has_image(path):
+                continue
+            seen.add(key)
+            self.paths.append(path)
+        self.total = len(self.paths)
+        self.workers = workers
+        self.uploaded = 0
+        self.failed = []
+        # 순서대로 업로드할 (경로, 디코드 future)
+        self._pending = deque()
+        self._executor = None
+        self.started = False
+
+    @property
+    def done(self):
+        return self.uploaded + len(self.failed) >= self.total
+
+    def progress(self):
+        """업로드까지 끝난 비율 (0.0 ~ 1.0)"""
+        if self.total == 0:
+            return 1.0
+        return (self.uploaded + len(self.failed)) / self.total
+
+    def start(self):
+        """작업 스레드에서 디코드를 시작합니다. 두 번 불러도 한 번만 시작합니다."""
+        if self.started:
+            return
+        self.started = True
+        if not self.paths:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='preload')
+        for path in self.paths:
+            future = self._executor.submit(_timed_decode, path)
+            self._pending.append((path, future))
+
+    def step(self, budget=UPLOAD_BUDGET):
+        """메인 스레드에서 호출: 디코드가 끝난 이미지를 요청 순서대로 budget초 동안 업로드합니다.
+        다음 이미지의 디코드가 아직이면 기다리지 않고 돌아갑니다."""
+        deadline = time.perf_counter() + budget
+        while self._pending:
+            path, future = self._pending[0]
+            if not future.done():
+                break
+            self._pending.popleft()
+            self._upload(path, future)
+            if time.perf_counter() >= deadline:
+                break
+        if not self._pending:
+            self._shutdown()
+
+    def finish(self):
+        """남은 이미지를 모두 기다려 업로드합니다. 아직 시작하지 않았으면 지금 시작합니다."""
+        self.start()
+        while self._pending:
+            path, future = self._pending.popleft()
+            self._upload(path, future)
+        self._shutdown()
+
+    def cancel(self):
+        """남은 작업을 버립니다. 이미 디코드된 것은 해제합니다."""
+        while self._pending:
+            path, future = self._pending.popleft()
+            if future.cancel():
+                continue
+            try:
+                gfx.free_decoded(future.result()[0])
+            except IOError:
+                pass
+        self._shutdown()
+
+    def _upload(self, path, future):
+        try:
+            decoded, decode_seconds = future.result()
+            if assets.has_image(path):
+                # 기다리는 동안 다른 곳에서 먼저 로드함
+                gfx.free_decoded(decoded)
+            else:
+                started = time.perf_counter()
+                image = gfx.upload_image(decoded)
+                assets.put_image(path, image, decode_seconds + time.perf_counter() - started)
+        except IOError as ex:
+            # 실패한 이미지는 나중에 get_image()가 평소처럼 로드를 시도함
+            self.failed.append(path)
+            print('미리 로드 실패:', ex)
+            return
+        self.uploaded += 1
+
+    def _shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def __repr__(self):
+        return '<Preloader {}/{} failed={}>'.format(self.uploaded, self.total, len(self.failed))
+
+# end of preloader.py
@@ -0,0 +1,185 @@
+import csv
+import os
+import time
+import assets
+import labels
+
+# 프레임 단계별 프로파일러
+# 매 프레임 source.handle_events / update(세부 단계) / render(세부 단계)에 걸린 시간을
+# 고정 크기 링 버퍼에 기록합니다. 화면 오버레이(p50/p95/max)와 CSV 내보내기를 지원합니다.
+#
+# 사용법:
+#   t = profiler.start()
+#   ... 측정할 코드 ...
+#   profiler.stop('update.pickup', t)
+# 한 프레임 안에서 같은 단계가 여러 번 실행되면(예: 고정 스텝 update) 시간이 합산됩니다.
+
+# 기록하는 단계 (CSV 열 순서)
+PHASES = (
+    'frame',
+    'handle_events',
+    'update',
+    'update.movement',
+    'update.animation',
+    'update.pickup',
+    'update.npc',
+    'update.pot',
+    'update.preload',
+    'render',
+    'render.map',
+    'render.items',
+    'render.npcs',
+    'render.witch',
+)
+
+# 링 버퍼 크기 (프레임 수)
+BUFFER_SIZE = 600
+
+# 종료 시 CSV로 내보낼 경로 (환경 변수 PROFILE_CSV로 지정, 없으면 내보내지 않음)
+CSV_PATH = os.environ.get('PROFILE_CSV')
+
+# 오버레이 폰트
+OVERLAY_FONT_PATH = 'ENCR10B.TTF'
+OVERLAY_FONT_SIZE = 12
+
+# 오버레이 텍스트를 다시 만드는 간격 (초). 매 프레임 숫자가 바뀌면 라벨 캐시가 계속 새로 래스터화하므로 제한함
+OVERLAY_REFRESH = 0.5
+
+enabled = True
+overlay_visible = False
+
+_samples = {phase: [0.0] * BUFFER_SIZE for phase in PHASES}
+# 현재 프레임에서 누적 중인 값 (초)
+_current = dict.fromkeys(PHASES, 0.0)
+_frame_start = None
+# 다음에 기록할 위치와 지금까지 기록된 프레임 수
+_index = 0
+_count = 0
+
+_overlay_lines = []
+_overlay_time = 0.0
+_overlay_font = None
+
+_clock = time.perf_counter
+
+
+def start():
+    """측정 시작 시각을 반환합니다."""
+    return _clock()
+
+
+def stop(phase, started):
+    """start()로 얻은 시각부터 지금까지의 시간을 phase에 더합니다."""
+    if enabled:
+        _current[phase] += _clock() - started
+
+
+def add(phase, seconds):
+    """이미 잰 시간(초)을 phase에 더합니다."""
+    if enabled:
+        _current[phase] += seconds
+
+
+def begin_frame():
+    global _frame_start
+    _frame_start = _clock()
+
+
+def end_frame():
+    """현재 프레임의 누적 값을 링 버퍼에 기록하고 다음 프레임을 준비합니다."""
+    global _index, _count, _frame_start
+    if not enabled or _frame_start is None:
+        return
+    _current['frame'] = _clock() - _frame_start
+    for phase in PHASES:
+        _samples[phase][_index] = _current[phase]
+        _current[phase] = 0.0
+    _index = (_index + 1) % BUFFER_SIZE
+    _count = min(_count + 1, BUFFER_SIZE)
+    _frame_start = None
+
+
+def _recent(phase):
+    """기록된 값을 오래된 것부터 순서대로 반환합니다."""
+    buf = _samples[phase]
+    if _count < BUFFER_SIZE:
+        return buf[:_count]
+    return buf[_index:] + buf[:_index]
+
+
+def _percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(p / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def summary():
+    """단계별 (p50, p95, max)를 밀리초 단위로 반환합니다."""
+    result = {}
+    for phase in PHASES:
+        values = sorted(_recent(phase))
+        result[phase] = (
+            _percentile(values, 50) * 1000.0,
+            _percentile(values, 95) * 1000.0,
+            (values[-1] if values else 0.0) * 1000.0,
+        )
+    return result
+
+
+def export_csv(path):
+    """링 버퍼의 프레임별 기록을 CSV로 저장합니다. (단위: 밀리초)"""
+    columns = [_recent(phase) for phase in PHASES]
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(('frame_no',) + tuple(p + '_ms' for p in PHASES))
+        for i in range(_count):
+            writer.writerow([i] + ['{:.4f}'.format(col[i] * 1000.0) for col in columns])
+
+
+def export_on_exit():
+    """CSV_PATH가 지정되어 있으면 기록을 저장합니다. 종료 시 호출됩니다."""
+    if CSV_PATH and _count > 0:
+        export_csv(CSV_PATH)
+        print('프레임 프로파일 저장: {}'.format(CSV_PATH))
+
+
+def toggle_overlay():
+    global overlay_visible, _overlay_time
+    overlay_visible = not overlay_visible
+    # 켜자마자 바로 최신 값을 보여 줌
+    _overlay_time = 0.0
+
+
+def draw_overlay(x=10, y=590, line_height=14):
+    """화면 왼쪽 위에 단계별 p50/p95/max를 그립니다. OVERLAY_REFRESH 간격으로만 내용을 갱신합니다."""
+    global _overlay_lines, _overlay_time, _overlay_font
+    if not overlay_visible:
+        return
+    if _overlay_font is None:
+        _overlay_font = assets.get_font(OVERLAY_FONT_PATH, OVERLAY_FONT_SIZE)
+    font = _overlay_font
+    now = _clock()
+    if now - _overlay_time >= OVERLAY_REFRESH:
+        _overlay_time = now
+        stats = summary()
+        _overlay_lines = ['{:<16}{:>7}{:>7}{:>7}'.format('phase(ms)', 'p50', 'p95', 'max')]
+        for phase in PHASES:
+            p50, p95, worst = stats[phase]
+            _overlay_lines.append('{:<16}{:>7.2f}{:>7.2f}{:>7.2f}'.format(phase, p50, p95, worst))
+    for i, line in enumerate(_overlay_lines):
+        labels.draw_label(font, x, y - i * line_height, line, (255, 255, 0))
+
+
+def reset():
+    global _index, _count, _frame_start
+    for phase in PHASES:
+        buf = _samples[phase]
+        for i in range(BUFFER_SIZE):
+            buf[i] = 0.0
+        _current[phase] = 0.0
+    _index = 0
+    _count = 0
+    _frame_start = None
+
+# end of profiler.py
@@ -0,0 +1,203 @@
+import ctypes
+import glob
+import json
+import mmap
+import os
+import struct
+
+# 미리 디코드한 스프라이트 캐시
+# asset_build.py가 PNG를 미리 풀어 raw RGBA 파일로 저장해 두면, 실행할 때 PNG를 다시 디코드하지 않고
+# 파일을 메모리 매핑해서 바로 텍스처로 올립니다. (gfx.decode_raw)
+# 매 프레임 확대/축소해서 그리는 이미지(witch, pot, NPC)는 화면에 그리는 크기로 미리 바꾼 변형도 만들어,
+# 그릴 때 원본 크기와 화면 크기가 같아지게 합니다.
+#
+# 캐시 파일 이름은 원본 내용과 변형의 해시라서, 원본이 그대로면 다시 빌드해도 파일을 새로 쓰지 않습니다.
+# 실행할 때는 manifest.json에 기록된 원본의 크기/수정 시각이 지금과 같을 때만 캐시를 씁니다.
+# (다르면 원본 PNG를 그대로 로드하므로 캐시가 오래되어도 틀린 그림이 나오지 않음)
+# 환경 변수 NO_ASSET_CACHE=1이면 캐시를 쓰지 않습니다.
+#
+# 이 모듈은 pico2d 없이 import할 수 있어야 합니다. (빌드 도구가 사용)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get('ASSET_CACHE_DIR') or os.path.join(BASE_DIR, '.asset_cache')
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+ENABLED = os.environ.get('NO_ASSET_CACHE', '') in ('', '0')
+
+# raw 파일 헤더: 매직, 버전, 예약, 너비, 높이. 뒤에 너비*높이*4 바이트의 RGBA (위 행부터)
+MAGIC = b'RGBA'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHHII')
+HEADER_SIZE = HEADER.size
+EXTENSION = '.rgba'
+
+# 원본 크기 그대로 캐시할 이미지 (프로젝트 폴더 기준 패턴)
+NATIVE_IMAGES = [
+    'resources/atlas/*.png',
+    'resources/tiles/start_page.png',
+    'resources/tiles/end_page.png',
+    'resources/arrow.png',
+]
+
+# 화면 크기로 미리 바꿔 둘 이미지: (패턴, 프레임 크기, 화면에 그리는 프레임 크기)
+# 프레임 크기가 None이면 이미지 전체를 한 프레임으로 봅니다.
+# 그리는 쪽(witch.py, pot.py, npc.py)이 scaled_path()에 넘기는 값과 같아야 캐시를 씁니다.
+# (witch의 한 번짜리 동작 시트는 거의 쓰이지 않으므로 원본을 그대로 로드)
+SCALED_IMAGES = [
+    ('resources/B_witch_run.png', (32, 48), (100, 100)),
+    ('resources/Blue_witch/B_witch_idle.png', (32, 48), (100, 100)),
+    ('resources/pot/green_pot.png', (48, 48), (200, 200)),
+    ('resources/npc/*.png', None, (100, 100)),
+]
+
+# 원본 상대 경로 -> manifest 항목. 처음 조회할 때 읽음
+_manifest = None
+# 원본 상대 경로 -> 최신 여부 (stat 결과를 한 번만 확인)
+_fresh = {}
+
+
+def rel_path(path):
+    """프로젝트 폴더 기준 상대 경로 ('/' 구분자). manifest의 키로 씁니다."""
+    if os.path.isabs(path):
+        path = os.path.relpath(path, BASE_DIR)
+    return os.path.normpath(path).replace(os.sep, '/')
+
+
+def variant_key(frame_size=None, draw_size=None):
+    """변형 이름: 'native', '48x48@100x100', 'full@100x100'"""
+    if draw_size is None:
+        return 'native'
+    frame = 'full' if frame_size is None else '{}x{}'.format(*frame_size)
+    return '{}@{}x{}'.format(frame, *draw_size)
+
+
+def expand(patterns):
+    """패턴 목록을 실제 파일의 상대 경로 목록으로 바꿉니다. (정렬, 중복 없음)"""
+    paths = set()
+    for pattern in patterns:
+        paths.update(rel_path(p) for p in glob.glob(os.path.join(BASE_DIR, pattern)))
+    return sorted(paths)
+
+
+def read_header(buffer):
+    """raw 파일 앞부분에서 (너비, 높이)를 읽습니다. 형식이 다르면 ValueError."""
+    magic, version, _, w, h = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError('raw 스프라이트 파일이 아닙니다 (매직 {!r}, 버전 {})'.format(magic, version))
+    if len(buffer) < HEADER_SIZE + w * h * 4:
+        raise ValueError('raw 스프라이트 파일이 잘렸습니다 ({}x{})'.format(w, h))
+    return w, h
+
+
+def write_raw(path, w, h, rgba):
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, w, h))
+        f.write(rgba)
+
+
+class RawMapping:
+    """raw 파일의 메모리 매핑. address는 픽셀(헤더 뒤) 시작 주소입니다.
+    매핑을 복사 모드로 열기 때문에 SDL이 픽셀을 건드려도 파일은 바뀌지 않습니다.
+    픽셀 버퍼(ctypes)가 남아 있으면 매핑을 닫을 수 없으므로 close()가 버퍼를 먼저 버립니다.
+    """
+
+    __slots__ = ('path', 'w', 'h', '_mapped', '_pixels')
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        try:
+            self.w, self.h = read_header(mapped)
+        except (ValueError, struct.error):
+            mapped.close()
+            raise
+        self._mapped = mapped
+        self._pixels = ctypes.c_char.from_buffer(mapped, HEADER_SIZE)
+
+    @property
+    def address(self):
+        return ctypes.addressof(self._pixels)
+
+    @property
+    def closed(self):
+        return self._mapped is None
+
+    def close(self):
+        if self._mapped is None:
+            return
+        # 버퍼에 대한 마지막 참조를 지운 뒤 닫음 (남아 있으면 BufferError)
+        self._pixels = None
+        self._mapped.close()
+        self._mapped = None
+
+
+def check_mappings(cache_dir=CACHE_DIR):
+    """캐시 폴더의 raw 파일을 모두 매핑했다가 닫아 봅니다. 문제가 있는 파일의 설명 목록을 반환합니다."""
+    problems = []
+    if not os.path.isdir(cache_dir):
+        return problems
+    for name in sorted(os.listdir(cache_dir)):
+        if not is_raw(name):
+            continue
+        try:
+            mapping = RawMapping(os.path.join(cache_dir, name))
+            mapping.close()
+        except (OSError, ValueError, BufferError, struct.error) as ex:
+            problems.append('raw 파일을 매핑할 수 없음: {} ({})'.format(name, ex))
+    return problems
+
+
+def load_manifest(cache_dir=CACHE_DIR):
+    """manifest의 sources dict를 반환합니다. 없거나 버전이 다르면 빈 dict."""
+    path = os.path.join(cache_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('version') != MANIFEST_VERSION:
+        return {}
+    return data.get('sources', {})
+
+
+def _is_fresh(rel, entry):
+    fresh = _fresh.get(rel)
+    if fresh is None:
+        try:
+            st = os.stat(os.path.join(BASE_DIR, rel))
+            fresh = st.st_size == entry['size'] and st.st_mtime_ns == entry['mtime_ns']
+        except OSError:
+            fresh = False
+        _fresh[rel] = fresh
+    return fresh
+
+
+def lookup(path, frame_size=None, draw_size=None):
+    """path의 변형이 캐시에 있고 원본이 바뀌지 않았으면 raw 파일의 절대 경로, 아니면 None"""
+    global _manifest
+    if not ENABLED:
+        return None
+    if _manifest is None:
+        _manifest = load_manifest()
+    rel = rel_path(path)
+    entry = _manifest.get(rel)
+    if entry is None or not _is_fresh(rel, entry):
+        return None
+    variant = entry['variants'].get(variant_key(frame_size, draw_size))
+    if variant is None:
+        return None
+    raw_path = os.path.join(CACHE_DIR, variant['file'])
+    return raw_path if os.path.exists(raw_path) else None
+
+
+def is_raw(path):
+    return path.endswith(EXTENSION)
+
+
+def reload():
+    """manifest를 다음 조회 때 다시 읽습니다. (asset_build.py로 다시 만든 뒤)"""
+    global _manifest
+    _manifest = None
+    _fresh.clear()
+
+# end of rawcache.py
@@ -0,0 +1,186 @@
+import json
+import os
+from bisect import bisect_left, bisect_right
+
+# 레시피 엔진
+# resources/recipes.json에서 pot 레시피를 읽어, 재료 이름의 정렬된 튜플(다중집합의 표준형)을 키로 색인합니다.
+#   ['grape', 'apple', 'grape'] -> ('apple', 'grape', 'grape')
+# 같은 재료가 여러 개여도 개수가 보존되고, 레시피 수와 관계없이 찾기는 dict 조회 한 번입니다.
+#
+# 재료를 하나씩 넣는 쪽(pot)은 add_to_key()로 표준형 키를 그때그때 이어 만들어 두고
+# result_for_key()로 찾으므로, 찾을 때 정렬하지 않습니다.
+#
+# 부분 조회("지금 넣은 재료로 아직 완성할 수 있는 레시피"): 재료 이름 -> 그 재료가 든 레시피 색인에서
+# 가장 적은 후보만 골라 다중집합 포함 여부를 확인합니다. 부분 다중집합을 모두 미리 색인하면
+# 레시피 하나에 2^(재료 수)개가 되므로, 실제로 물어본 키(pot에 담길 수 있는 capacity개 이하)만
+# 처음 물어볼 때 결과를 기억해 두고 다음부터는 dict 조회 한 번으로 돌려줍니다.
+# 색인 크기와 build() 시간은 레시피의 재료 수 합에 비례하므로 capacity를 키워도 지수적으로 늘지 않습니다.
+#
+# 데이터 파일 형식:
+#   {
+#     "capacity": 3,                 # pot에 넣을 수 있는 최대 재료 수
+#     "default": "blue_1.png",       # 맞는 레시피가 없을 때의 결과
+#     "recipes": [{"ingredients": ["grape", "grape", "grape"], "result": "green_1.png"}, ...]
+#   }
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RECIPES_PATH = os.path.join(BASE_DIR, 'resources', 'recipes.json')
+
+# 데이터 파일에 값이 없을 때의 기본값
+DEFAULT_CAPACITY = 3
+DEFAULT_RESULT = 'blue_1.png'
+
+
+class Recipe:
+    """레시피 하나. key는 재료 이름의 정렬된 튜플입니다."""
+
+    __slots__ = ('key', 'result')
+
+    def __init__(self, ingredients, result):
+        self.key = canonical(ingredients)
+        self.result = result
+
+    @property
+    def size(self):
+        return len(self.key)
+
+    def __repr__(self):
+        return '<Recipe {} -> {!r}>'.format('+'.join(self.key), self.result)
+
+
+# 표준형 키 -> Recipe
+_recipes = {}
+# 표준형 키 -> 결과 아이템 파일명 (result_for_key()용)
+_results = {}
+# 재료 이름 -> 그 재료가 든 Recipe 튜플
+_by_ingredient = {}
+# 물어본 부분 키 -> 그것을 포함하는 Recipe 튜플 (completions()가 처음 물어볼 때 채움)
+_completions = {}
+_capacity = DEFAULT_CAPACITY
+_default_result = DEFAULT_RESULT
+_loaded = False
+
+
+def canonical(names):
+    """재료 이름 목록의 표준형(정렬된 튜플)을 반환합니다."""
+    return tuple(sorted(names))
+
+
+def build(data):
+    """데이터(dict)로 색인을 만듭니다. 같은 재료 조합이 두 번 나오면 ValueError."""
+    global _capacity, _default_result, _loaded
+    recipes = {}
+    for spec in data.get('recipes', ()):
+        recipe = Recipe(spec['ingredients'], spec['result'])
+        if recipe.key in recipes:
+            raise ValueError('재료 조합이 같은 레시피가 있습니다: {}'.format(recipe.key))
+        recipes[recipe.key] = recipe
+
+    by_ingredient = {}
+    for recipe in recipes.values():
+        # 같은 재료가 여러 개여도 한 번만 등록
+        for name in set(recipe.key):
+            by_ingredient.setdefault(name, []).append(recipe)
+
+    _recipes.clear()
+    _recipes.update(recipes)
+    _results.clear()
+    _results.update((key, recipe.result) for key, recipe in recipes.items())
+    _by_ingredient.clear()
+    _by_ingredient.update((name, tuple(found)) for name, found in by_ingredient.items())
+    _completions.clear()
+    largest = max((r.size for r in recipes.values()), default=0)
+    _capacity = max(data.get('capacity', DEFAULT_CAPACITY), largest)
+    _default_result = data.get('default', DEFAULT_RESULT)
+    _loaded = True
+
+
+def load(path=RECIPES_PATH):
+    """데이터 파일을 읽어 색인을 만듭니다."""
+    with open(path, encoding='utf-8') as f:
+        build(json.load(f))
+
+
+def ensure_loaded():
+    if not _loaded:
+        load()
+
+
+def add_to_key(key, name):
+    """표준형 key에 재료 name 하나를 더한 표준형 키 (정렬된 자리에 끼워 넣음)"""
+    i = bisect_right(key, name)
+    return key[:i] + (name,) + key[i:]
+
+
+def find(names):
+    """재료 이름 목록과 정확히 맞는 Recipe를 반환합니다. 없으면 None."""
+    ensure_loaded()
+    return _recipes.get(canonical(names))
+
+
+def result_for(names):
+    """재료 이름 목록으로 만들어지는 결과 아이템 파일명. 맞는 레시피가 없으면 기본 결과."""
+    ensure_loaded()
+    return _results.get(canonical(names), _default_result)
+
+
+def result_for_key(key):
+    """표준형 key로 만들어지는 결과 아이템 파일명 (dict 조회 한 번). load() 이후에 호출하세요."""
+    return _results.get(key, _default_result)
+
+
+def _contains(key, sub):
+    """표준형 key가 표준형 sub를 개수까지 포함하는지 (둘 다 정렬되어 있으므로 한 번 훑음)"""
+    i = 0
+    n = len(key)
+    for name in sub:
+        i = bisect_left(key, name, i)
+        if i == n or key[i] != name:
+            return False
+        i += 1
+    return True
+
+
+def completions_for_key(key):
+    """표준형 key에 더 넣어서(또는 그대로) 완성할 수 있는 Recipe 튜플. 처음 물어본 키만 후보를 확인합니다."""
+    found = _completions.get(key)
+    if found is not None:
+        return found
+    if len(key) > _capacity:
+        # pot에 담길 수 없는 키는 기억하지 않음
+        return ()
+    if not key:
+        found = tuple(_recipes.values())
+    else:
+        candidates = min((_by_ingredient.get(name, ()) for name in set(key)), key=len)
+        found = tuple(recipe for recipe in candidates if _contains(recipe.key, key))
+    _completions[key] = found
+    return found
+
+
+def completions(names):
+    """지금 재료에 더 넣어서(또는 그대로) 완성할 수 있는 Recipe 튜플을 반환합니다."""
+    ensure_loaded()
+    return completions_for_key(canonical(names))
+
+
+def is_final(names):
+    """재료가 레시피와 정확히 맞고, 재료를 더 넣어 만들 수 있는 더 큰 레시피가 없으면 True."""
+    ensure_loaded()
+    key = canonical(names)
+    if key not in _recipes:
+        return False
+    return all(recipe.size == len(key) for recipe in completions_for_key(key))
+
+
+def capacity():
+    """pot에 넣을 수 있는 최대 재료 수 (가장 큰 레시피보다 작지 않음)"""
+    ensure_loaded()
+    return _capacity
+
+
+def recipes():
+    ensure_loaded()
+    return list(_recipes.values())
+
+# end of recipes.py
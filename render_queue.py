@@ -0,0 +1,104 @@
+import time
+from operator import itemgetter
+
+# 렌더 큐
+# 엔티티는 바로 그리지 않고 (레이어, z 키, 텍스처, 그리기 함수, 인자)로 된 그리기 명령을 제출합니다.
+# flush()에서 화면 밖 명령은 이미 제출 단계에서 걸러졌고, 남은 명령을
+# (레이어, z, 텍스처) 순서로 정렬해 같은 텍스처끼리 이어서 그립니다.
+# z가 같은 명령끼리는 텍스처로 묶이므로, 겹침 순서가 중요한 엔티티만 z를 다르게 주면 됩니다.
+
+# 레이어 (작을수록 먼저 그림)
+LAYER_BACKGROUND = 0
+LAYER_GROUND = 1    # arrow, pot 등 바닥에 놓인 오브젝트
+LAYER_ITEMS = 2     # 월드 아이템
+LAYER_ACTORS = 3    # NPC (z = -y 로 위쪽에 있는 것이 먼저)
+LAYER_LABELS = 4    # NPC 메시지 등 텍스트
+LAYER_PLAYER = 5    # witch는 항상 맨 위
+
+
+class RenderQueue:
+    """한 프레임 동안 그리기 명령을 모았다가 한 번에 그립니다."""
+
+    def __init__(self, view_width=800, view_height=600):
+        self.view_width = view_width
+        self.view_height = view_height
+        # (layer, z, texture_key, seq, func, args)
+        self.commands = []
+        self._seq = 0
+        self._submitted = 0
+        self._culled = 0
+        # 마지막 flush()의 통계
+        self.submitted = 0
+        self.culled = 0
+        self.drawn = 0
+        self.texture_switches = 0
+        # 레이어별 그리기 시간 (초)
+        self.layer_times = {}
+
+    def is_visible(self, x, y, w, h):
+        """중심 (x, y), 크기 w x h 인 사각형이 화면과 겹치는지 반환합니다."""
+        hw = w / 2
+        hh = h / 2
+        return (x + hw >= 0 and x - hw <= self.view_width and
+                y + hh >= 0 and y - hh <= self.view_height)
+
+    def submit(self, layer, z, texture, func, args, x, y, w, h):
+        """그리기 명령을 제출합니다.
+        - texture: 묶음 기준이 되는 객체 (보통 pico2d Image)
+        - func, args: flush() 때 func(*args)로 호출 (예: image.draw, (x, y, w, h))
+        - x, y, w, h: 화면 밖 판정용 사각형 (중심 좌표)
+        """
+        self._submitted += 1
+        if not self.is_visible(x, y, w, h):
+            self._culled += 1
+            return
+        self._seq += 1
+        self.commands.append((layer, z, id(texture), self._seq, func, args))
+
+    def submit_call(self, layer, z, func, args=()):
+        """화면 밖 판정 없이 임의의 그리기 함수를 제출합니다. (배경, 복합 오브젝트 등)"""
+        self._submitted += 1
+        self._seq += 1
+        # 텍스처 키 0: 같은 (layer, z) 안에서 텍스처 명령보다 먼저 그려짐
+        self.commands.append((layer, z, 0, self._seq, func, args))
+
+    def flush(self):
+        """모은 명령을 정렬해서 그리고 큐를 비웁니다."""
+        commands = self.commands
+        commands.sort(key=_SORT_KEY)
+        layer_times = self.layer_times
+        layer_times.clear()
+        last_texture = None
+        switches = 0
+        current_layer = None
+        layer_start = 0.0
+        for command in commands:
+            layer = command[0]
+            if layer != current_layer:
+                # 레이어가 바뀔 때만 시각을 읽어 레이어별 시간을 기록
+                now = time.perf_counter()
+                if current_layer is not None:
+                    layer_times[current_layer] = now - layer_start
+                current_layer = layer
+                layer_start = now
+            texture_key = command[2]
+            if texture_key != last_texture:
+                switches += 1
+                last_texture = texture_key
+            command[4](*command[5])
+        if current_layer is not None:
+            layer_times[current_layer] = time.perf_counter() - layer_start
+        self.submitted = self._submitted
+        self.culled = self._culled
+        self.drawn = len(commands)
+        self.texture_switches = switches
+        commands.clear()
+        self._seq = 0
+        self._submitted = 0
+        self._culled = 0
+
+
+# (layer, z, texture_key, seq) 순서로 정렬. seq가 유일하므로 함수 객체끼리 비교되는 일은 없음
+_SORT_KEY = itemgetter(0, 1, 2, 3)
+
+# end of render_queue.py
@@ -0,0 +1,253 @@
+import assets
+import atlas
+import startpage
+import startup
+
+# 씬 스택
+# 게임 화면을 씬(StartPage, Overworld, PotRoom, EndPage)으로 나누고, 씬마다 쓰는 에셋을 선언해 둡니다.
+# 씬의 에셋은 스택에 올라가거나(push/replace/reset) 미리 로드(preload)될 때 로드되고,
+# 스택에서도 미리 로드 목록에서도 빠지면 참조를 반납합니다. 반납한 에셋은 공유 에셋 관리자의
+# 메모리 예산 안에서 캐시에 남아 있다가 예산을 넘을 때 오래된 것부터 내보내지므로,
+# map <-> pot처럼 자주 오가는 씬은 다시 들어갈 때 디스크에서 다시 읽지 않습니다.
+# 다시 올 일이 없는 큰 화면(purge = True인 씬)만 반납할 때 바로 메모리에서 내보냅니다.
+#
+# 씬끼리 같은 에셋(잔디 타일, arrow, 폰트)을 쓰면 공유 에셋 관리자의 참조 카운트로 한 번만 로드됩니다.
+# 전환할 때는 새 씬을 먼저 로드한 뒤 이전 씬을 반납하므로 공유 에셋을 다시 읽지 않습니다.
+# 아틀라스에 묶인 이미지(잔디 타일)는 아틀라스 텍스처 한 장으로 로드/반납합니다.
+#
+# 사용법:
+#   stack = scenes.SceneStack()
+#   stack.push(scenes.start_page)
+#   stack.replace(scenes.overworld)   # 시작 페이지 반납, 맵 로드
+#   stack.push(scenes.pot_room)       # 맵은 스택에 남은 채로 pot 방 로드
+#   stack.pop()                       # pot 방 반납
+#   stack.reset(scenes.end_page)      # 나머지 씬을 모두 반납
+
+# 나중 씬에서만 쓰는 화면 모듈 (LAZY_IMPORTS=1이면 씬이 처음 필요로 할 때 로드됨)
+endpage = startup.lazy_import('endpage')
+tilemap = startup.lazy_import('map')
+pot = startup.lazy_import('pot')
+
+GRASS_TILES = tuple('resources/tiles/grass{}.png'.format(i) for i in range(1, 11))
+TITLE_FONT = ('ENCR10B.TTF', 40)
+
+
+class Scene:
+    """씬 하나. 하위 클래스는 아래 클래스 속성을 정하고, 화면 모듈의 전역에 에셋을 연결하는
+    on_load()/on_unload()를 오버라이드합니다.
+      images  씬이 쓰는 이미지 경로
+      fonts   씬이 쓰는 (폰트 경로, 크기)
+      state   씬이 맨 위에 있을 때의 게임 상태 ('startpage', 'game', 'endpage')
+      map     맵 이름 ('map', 'pot'). 맵이 아닌 씬은 None
+      purge   True면 unload() 때 다른 씬이 쓰지 않는 에셋을 LRU 예산과 관계없이 바로 내보냄
+    """
+
+    name = None
+    images = ()
+    fonts = ()
+    state = None
+    map = None
+    purge = False
+
+    def __init__(self):
+        self.loaded = False
+
+    def load(self):
+        """선언한 에셋을 로드합니다. 이미 로드되어 있으면 아무것도 하지 않습니다."""
+        if self.loaded:
+            return
+        for path in self.textures():
+            assets.get_image(path)
+        for path, size in self.fonts:
+            assets.get_font(path, size)
+        self.loaded = True
+        self.on_load()
+
+    def unload(self):
+        """에셋의 참조를 반납합니다. 쓰지 않는 에셋은 메모리 예산을 넘을 때 assets의 LRU가 내보냅니다.
+        purge인 씬은 다른 씬이 쓰지 않는 에셋을 바로 내보냅니다."""
+        if not self.loaded:
+            return
+        self.on_unload()
+        self.loaded = False
+        for path in self.textures():
+            assets.release_image(path)
+            if self.purge:
+                assets.purge_image(path)
+        for path, size in self.fonts:
+            assets.release_font(path, size)
+            if self.purge:
+                assets.purge_font(path, size)
+
+    def textures(self):
+        """실제로 로드할 이미지 파일: images를 아틀라스 이미지로 바꾸고 중복을 뺀 목록"""
+        paths = []
+        for path in self.images:
+            path = atlas.image_path(path)
+            if path not in paths:
+                paths.append(path)
+        return paths
+
+    def on_load(self):
+        pass
+
+    def on_unload(self):
+        pass
+
+    def __repr__(self):
+        return '<{} {}>'.format(type(self).__name__, 'loaded' if self.loaded else 'unloaded')
+
+
+class StartPage(Scene):
+    name = 'startpage'
+    images = ('resources/tiles/start_page.png',)
+    fonts = (TITLE_FONT,)
+    state = 'startpage'
+    # 게임을 시작하면 다시 오지 않는 전체 화면 이미지
+    purge = True
+
+    def on_load(self):
+        startpage.load_startpage()
+
+    def on_unload(self):
+        startpage.cleanup_startpage()
+
+
+class Overworld(Scene):
+    name = 'overworld'
+    state = 'game'
+    map = 'map'
+
+    @property
+    def images(self):
+        return GRASS_TILES + (tilemap.ARROW_PATH,)
+
+    def on_load(self):
+        tilemap.load_tiles()
+        tilemap.load_arrow()
+
+    def on_unload(self):
+        tilemap.unload_arrow()
+        tilemap.unload_tiles()
+
+
+class PotRoom(Scene):
+    name = 'pot_room'
+    state = 'game'
+    map = 'pot'
+
+    @property
+    def images(self):
+        return GRASS_TILES + (pot.pot_image_path(), pot.ARROW_PATH)
+
+    def on_load(self):
+        pot.load_tiles()
+        pot.load_pots()
+
+    def on_unload(self):
+        pot.unload_pots()
+        pot.unload_tiles()
+
+
+class EndPage(Scene):
+    name = 'endpage'
+    images = ('resources/tiles/end_page.png',)
+    fonts = (TITLE_FONT,)
+    state = 'endpage'
+
+    def on_load(self):
+        endpage.load_endpage()
+
+    def on_unload(self):
+        endpage.cleanup_endpage()
+
+
+class SceneStack:
+    """씬 스택. 맨 위 씬이 현재 화면이고, 아래 씬들은 로드된 채로 돌아올 때를 기다립니다."""
+
+    def __init__(self):
+        self._stack = []
+        # 스택에 오르기 전에 미리 로드해 둔 씬
+        self._preloaded = []
+
+    @property
+    def top(self):
+        return self._stack[-1] if self._stack else None
+
+    def push(self, scene):
+        """scene을 로드하고 맨 위에 올립니다."""
+        scene.load()
+        self._stack.append(scene)
+        self._forget_preload(scene)
+
+    def pop(self):
+        """맨 위 씬을 내리고 반환합니다. 스택에 더 남아 있지 않으면 에셋을 반납합니다."""
+        scene = self._stack.pop()
+        self._release(scene)
+        return scene
+
+    def replace(self, scene):
+        """맨 위 씬을 scene으로 바꿉니다."""
+        scene.load()
+        old = self._stack.pop() if self._stack else None
+        self._stack.append(scene)
+        self._forget_preload(scene)
+        if old is not None:
+            self._release(old)
+
+    def reset(self, scene):
+        """스택을 비우고 scene 하나만 올립니다."""
+        scene.load()
+        old = self._stack
+        self._stack = [scene]
+        self._forget_preload(scene)
+        for s in reversed(old):
+            self._release(s)
+        for s in list(self._preloaded):
+            self._forget_preload(s)
+            self._release(s)
+
+    def preload(self, scene):
+        """scene의 에셋을 미리 로드해 둡니다. 스택에 오르면 로드 없이 바로 전환됩니다."""
+        scene.load()
+        if scene not in self._stack and scene not in self._preloaded:
+            self._preloaded.append(scene)
+
+    def cancel_preload(self, scene):
+        """미리 로드만 해 둔 scene을 반납합니다."""
+        self._forget_preload(scene)
+        self._release(scene)
+
+    def clear(self):
+        """모든 씬을 반납합니다. (assets.clear() 전에 호출)"""
+        for scene in reversed(self._stack):
+            scene.unload()
+        for scene in self._preloaded:
+            scene.unload()
+        self._stack = []
+        self._preloaded = []
+
+    def _forget_preload(self, scene):
+        if scene in self._preloaded:
+            self._preloaded.remove(scene)
+
+    def _release(self, scene):
+        if scene not in self._stack and scene not in self._preloaded:
+            scene.unload()
+
+    def __contains__(self, scene):
+        return scene in self._stack
+
+    def __len__(self):
+        return len(self._stack)
+
+    def __repr__(self):
+        return '<SceneStack {}>'.format([s.name for s in self._stack])
+
+
+start_page = StartPage()
+overworld = Overworld()
+pot_room = PotRoom()
+end_page = EndPage()
+
+# end of scenes.py
@@ -1,29 +1,59 @@
 from pico2d import *
 import os
 import math
+import assets
+import atlas
+import catalog
+import keymap
+import labels
+import preloader
+import profiler
+import recipes
+import render_queue
+import scenes
+import spatial
+import startpage
+import startup
 from witch import Witch
-from fruit import Fruit
-from item import Item
 from npc import NPC
-import map as tilemap
-import pot
-import startpage
-import endpage
 import random
 
+# 게임을 시작한 뒤에만 쓰는 모듈 (LAZY_IMPORTS=1이면 처음 쓸 때 로드되어 첫 화면이 빨라짐)
+pool = startup.lazy_import('pool')
+spawner = startup.lazy_import('spawner')
+tilemap = startup.lazy_import('map')
+pot = startup.lazy_import('pot')
+endpage = startup.lazy_import('endpage')
+
 # 상수
 PICKUP_RADIUS = 60  # 픽셀 단위 충돌/획득 반경 (witch 크기 100x100에 맞춤)
 NPC_INTERACTION_RADIUS = 80  # NPC와의 상호작용 반경
+# 공간 해시 칸 크기: 가장 큰 검색 반경과 같게 두면 반경 검색이 3x3칸 안에서 끝남
+GRID_CELL_SIZE = max(PICKUP_RADIUS, NPC_INTERACTION_RADIUS)
+# 맵에 뿌리는 과일 수와 배치 규칙 (과일끼리, 그리고 witch/NPC/arrow와의 최소 거리, 화면 가장자리 여백)
+FRUIT_COUNT = 10
+SPAWN_MIN_DIST = PICKUP_RADIUS + 20
+SPAWN_MARGIN = 50
+# pot에서 만든 물약끼리의 최소 거리
+CRAFTED_ITEM_MIN_DIST = 40
+# witch 스프라이트 시트 후보 (resources 폴더 안)
+WITCH_FILE_CANDIDATES = ['B_witch_run.png']
+# 게임 월드를 만들 때 쓰는 엔티티 (시작 페이지에서 미리 로드함)
+PRELOAD_ENTITY_IDS = ('apple', 'grape', 'banana', 'peach', 'strawberry', 'girl1_idle')
 
 # 모듈 전역 리소스(초기화 시 설정됨)
 # witch 인스턴스(초기화 시 설정됨)
 witch = None
-# world_items: 화면에 놓인 Item/Fruit 인스턴스 목록 (map 맵용)
-world_items = []
-# pot_world_items: pot 맵에 놓인 Item 목록
-pot_world_items = []
-# npcs: 화면에 배치된 NPC 인스턴스 목록
-npcs = []
+# world_items: 화면에 놓인 Item/Fruit 인스턴스 (map 맵용, 위치로 검색하는 공간 해시)
+world_items = spatial.SpatialHash(GRID_CELL_SIZE)
+# pot_world_items: pot 맵에 놓인 Item
+pot_world_items = spatial.SpatialHash(GRID_CELL_SIZE)
+# npcs: 화면에 배치된 NPC 인스턴스
+npcs = spatial.SpatialHash(GRID_CELL_SIZE)
+# animated_items: world_items 중 애니메이션이 있는 것만 (update()에서 이것만 진행)
+animated_items = {}
+# 지난 update()에서 witch 근처에 있던 NPC 목록 (멀어진 NPC의 메시지를 끄기 위해 기억)
+near_npcs = []
 # 이동 플래그
 move_up = False
 move_down = False
@@ -32,8 +62,7 @@ move_right = False
 # 달리기 플래그
 is_shift_pressed = False
 
-# Arrow 설정
-arrow_image = None
+# Arrow 설정 (이미지는 map 모듈이 가짐)
 arrow_x = 700
 arrow_y = 450
 arrow_active = True  # arrow가 밟히면 False
@@ -44,6 +73,23 @@ current_map = 'map'
 # 게임 상태 ('startpage', 'game', 'endpage')
 game_state = 'startpage'
 
+# 정적 화면(시작/엔딩 페이지)을 다시 그려야 하는지 여부
+needs_redraw = True
+
+# 렌더 큐 (초기화 시 캔버스 크기로 생성됨)
+queue = None
+
+# 씬 스택 (초기화 시 시작 페이지로 생성됨). game_state와 current_map은 맨 위 씬을 따름
+scene_stack = None
+# 캔버스 크기 (게임 월드를 만들 때 사용)
+world_size = (800, 600)
+
+# 시작 페이지가 떠 있는 동안 게임 에셋을 미리 읽는 로더 (시작 페이지의 첫 화면을 그린 뒤 생성)
+asset_preloader = None
+
+# 키 입력 표: (게임 상태, 이벤트 종류, 키) -> 핸들러 (초기화 시 keymap 설정으로 만듦)
+key_table = {}
+
 # 엔딩 타이머 (호감도 30 달성 시 2초 후 종료)
 ending_timer = None
 ending_delay = 2.0  # 2초
@@ -53,114 +99,201 @@ ending_delay = 2.0  # 2초
 def spawn_world_item(item, x, y):
     """월드에 아이템을 배치합니다. 이미지 로드를 시도하고 좌표를 설정한 뒤 world_items에 추가합니다."""
     try:
-        if hasattr(item, 'load'):
-            item.load()
-        elif hasattr(item, '_ensure_image_loaded'):
-            item._ensure_image_loaded()
+        item.load()
     except FileNotFoundError:
         pass
     item.x = x
     item.y = y
-    world_items.append(item)
+    world_items.insert(item)
+    if item.animated:
+        animated_items[item] = None
 
 
 def remove_world_item(item):
-    if item in world_items:
-        world_items.remove(item)
+    world_items.discard(item)
+    animated_items.pop(item, None)
+
+
+def spawn_npc(npc, x, y):
+    """NPC를 (x, y)에 배치하고 npcs에 추가합니다."""
+    npc.x = x
+    npc.y = y
+    npcs.insert(npc)
+
+
+def spawn_exclusions(radius=SPAWN_MIN_DIST):
+    """map 맵에서 과일을 놓으면 안 되는 영역: witch, NPC, arrow 주변"""
+    zones = []
+    if witch is not None:
+        zones.append(spawner.Circle(witch.x, witch.y, radius))
+    for npc in npcs:
+        zones.append(spawner.Circle(npc.x, npc.y, radius))
+    if arrow_active:
+        zones.append(spawner.Circle(arrow_x, arrow_y, radius))
+    return zones
+
+
+def spawn_fruits(fruit_types, count, width=800, height=600):
+    """fruit_types [(카탈로그 ID, name), ...]에서 무작위로 count개를 골라
+    witch/NPC/arrow와 다른 과일에서 SPAWN_MIN_DIST 이상 떨어진 곳에 놓습니다.
+    남은 자리가 부족하면 겹치게 놓지 않고 놓을 수 있는 만큼만 놓습니다."""
+    # 종류와 개수 모두 랜덤
+    fruits_to_spawn = [random.choice(fruit_types) for _ in range(count)]
+    region = (SPAWN_MARGIN, SPAWN_MARGIN, width - SPAWN_MARGIN, height - SPAWN_MARGIN)
+    points = spawner.sample(count, region, SPAWN_MIN_DIST, exclusions=spawn_exclusions())
+    for (fruit_id, fruit_name), (rx, ry) in zip(fruits_to_spawn, points):
+        try:
+            f = pool.fruits.acquire(fruit_id, name=fruit_name)
+            spawn_world_item(f, rx, ry)
+        except FileNotFoundError:
+            # 파일이 없으면 그냥 넘김
+            pass
 
 
 def end_game():
-    """게임을 엔딩 페이지로 전환합니다."""
-    global game_state
-    game_state = 'endpage'
+    """게임을 엔딩 페이지로 전환합니다. 맵과 pot 방의 에셋은 반납됩니다."""
+    scene_stack.reset(scenes.end_page)
+    sync_scene()
     print('게임 종료! 엔딩 페이지로 전환됩니다.')
 
 
+def check_npc_ending(npc):
+    """호감도가 30 이상이면 엔딩 페이지로 전환합니다. 호감도는 선물을 받을 때만 바뀌므로 선물 직후에 호출합니다."""
+    global ending_timer
+    if npc.heart >= 30 and game_state == 'game':
+        print('NPC 호감도 30 달성! 엔딩 페이지로 전환합니다.')
+        scene_stack.reset(scenes.end_page)
+        sync_scene()
+        ending_timer = 0.0  # 타이머 시작
+
+
+def is_idle():
+    """입력만 기다리면 되는 정적 화면인지 반환합니다.
+    시작 페이지와 (종료 타이머가 돌지 않는) 엔딩 페이지는 입력이 없으면 화면이 바뀌지 않습니다."""
+    if game_state == 'startpage' and not is_ready():
+        # 미리 로드하는 동안에는 매 프레임 업로드를 진행하고 진행률을 그려야 함
+        return False
+    return game_state in ('startpage', 'endpage') and ending_timer is None
+
+
+def preload_paths():
+    """시작 페이지가 떠 있는 동안 미리 읽어 둘 이미지: 맵과 pot 방, witch, 처음 배치하는 엔티티, 물약"""
+    paths = list(scenes.overworld.images) + list(scenes.pot_room.images)
+    for name in WITCH_FILE_CANDIDATES:
+        paths += Witch.texture_paths(os.path.join('resources', name))
+    for entry_id in PRELOAD_ENTITY_IDS:
+        try:
+            entry = catalog.get(entry_id)
+        except FileNotFoundError:
+            continue
+        paths.append(NPC.load_path(entry.path) if entry.kind == 'npc' else entry.path)
+    paths += [entry.path for entry in catalog.entries('item')]
+    # 아틀라스에 묶인 이미지는 아틀라스 이미지로 (중복은 Preloader가 뺌)
+    return [atlas.image_path(path) for path in paths]
+
+
+def is_ready():
+    """미리 로드가 끝나 게임을 바로 시작할 수 있으면 True"""
+    return asset_preloader is not None and asset_preloader.done
+
+
+def start_preload():
+    """나머지 게임 에셋의 미리 로드를 시작합니다. 목록을 만들 때 나중 씬의 모듈이 로드되므로 첫 화면을 그린 뒤에 호출합니다."""
+    global asset_preloader
+    if asset_preloader is None:
+        asset_preloader = preloader.Preloader(preload_paths())
+        asset_preloader.start()
+
+
+def pump_preloader():
+    """디코드가 끝난 에셋을 이번 프레임 몫만큼 텍스처로 올립니다."""
+    if asset_preloader is None or asset_preloader.done:
+        return
+    t = profiler.start()
+    asset_preloader.step()
+    profiler.stop('update.preload', t)
+    # 진행률 막대를 다시 그림 (다 끝나면 막대를 지움)
+    request_redraw()
+
+
+def request_redraw():
+    """다음 render()에서 정적 화면을 다시 그리도록 표시합니다."""
+    global needs_redraw
+    needs_redraw = True
+
+
 def respawn_world_items(width=800, height=600):
     """world_items를 랜덤 위치에 재생성합니다. witch와 npcs는 유지됩니다."""
-    global world_items
-
-    # 기존 아이템 제거
-    world_items = []
-
-    def random_pos_avoiding(avoid_points=None, margin=50, min_dist=80, max_attempts=200):
-        """랜덤 위치를 반환하되 avoid_points 리스트(각 항목은 (x,y))로부터 min_dist 이상 떨어지게 합니다."""
-        if avoid_points is None:
-            avoid_points = []
-        # 기본값 초기화
-        rx = margin
-        ry = margin
-        attempts = 0
-        while attempts < max_attempts:
-            rx = random.randint(margin, max(margin, width - margin))
-            ry = random.randint(margin, max(margin, height - margin))
-            ok = True
-            for (ax, ay) in avoid_points:
-                if math.hypot(rx - ax, ry - ay) < min_dist:
-                    ok = False
-                    break
-            if ok:
-                return rx, ry
-            attempts += 1
-        # 실패 시 마지막으로 생성한 값을 반환
-        return rx, ry
-
-    # 5가지 과일 종류 정의: (index, name)
+    # 기존 아이템은 풀에 돌려줌 (이미지를 쥔 채로 보관되어 다음 배치에 재사용)
+    for it in world_items:
+        pool.release(it)
+    world_items.clear()
+    animated_items.clear()
+
+    # 5가지 과일 종류 정의: (카탈로그 ID, name)
     fruit_types = [
-        (0, 'apple'),
-        (3, 'grape'),
-        (7, 'banana'),
-        (12, 'peach'),
-        (15, 'strawberry')
+        ('apple', 'apple'),
+        ('grape', 'grape'),
+        ('banana', 'banana'),
+        ('peach', 'peach'),
+        ('strawberry', 'strawberry')
     ]
+    spawn_fruits(fruit_types, FRUIT_COUNT, width, height)
 
-    # 랜덤하게 10개의 과일 선택 (종류와 개수 모두 랜덤)
-    fruits_to_spawn = [random.choice(fruit_types) for _ in range(10)]
 
-    # avoid list: 우선 witch 위치를 추가하여 과일이 너무 가깝게 스폰되지 않도록 함
-    avoid = [(witch.x, witch.y)]
-    # 또한 이미 스폰된 과일끼리 겹치지 않도록 처리
-    for idx, fruit_name in fruits_to_spawn:
-        try:
-            f = Fruit.from_index(idx, name=fruit_name, load_image_now=True)
-            rx, ry = random_pos_avoiding(avoid_points=avoid, min_dist=PICKUP_RADIUS + 20)
-            spawn_world_item(f, rx, ry)
-            # 새로 배치한 위치를 avoid 목록에 추가하여 다음 과일과 충돌 방지
-            avoid.append((rx, ry))
-        except FileNotFoundError:
-            # 파일이 없으면 그냥 넘김
-            pass
-
-    # 실제 리소스 폴더의 파일명 대소문자에 맞게 지정
 # --- 공개 API: init / handle_events / update / render / cleanup ---
 def init(width=800, height=600):
-    global witch, world_items, npcs, move_up, move_down, move_left, move_right
-    global arrow_image, arrow_active, current_map, game_state
+    """캔버스를 열고 시작 페이지만 로드합니다. 맵과 게임 월드는 게임을 시작할 때(start_game) 로드됩니다."""
+    global witch, world_items, npcs, near_npcs, move_up, move_down, move_left, move_right
+    global arrow_active, current_map, queue, key_table, scene_stack, world_size, asset_preloader
 
     # 캔버스 초기화 (pico2d 시작)
     open_canvas(width, height)
+    queue = render_queue.RenderQueue(width, height)
+    world_size = (width, height)
+
+    # 리소스 카탈로그 구성 (resources 폴더를 한 번만 훑음)
+    catalog.build()
+    # pot 레시피 색인 (resources/recipes.json)
+    recipes.load()
+    # 키 바인딩 (keymap.json이 있으면 덮어씀)
+    key_table = keymap.compile(ACTIONS, keymap.load_bindings())
+
+    # 시작 페이지 에셋만 로드 (맵, pot 방, 엔딩 페이지는 들어갈 때 로드됨)
+    if scene_stack is not None:
+        # 다시 초기화하는 경우 이전 씬의 에셋을 반납
+        scene_stack.clear()
+    scene_stack = scenes.SceneStack()
+    scene_stack.push(scenes.start_page)
+    sync_scene()
+
+    # 나머지 게임 에셋은 시작 페이지를 처음 그린 뒤 작업 스레드에서 디코드 시작 (render()에서)
+    if asset_preloader is not None:
+        asset_preloader.cancel()
+    asset_preloader = None
+
+    # 게임 월드는 start_game()에서 만듦
+    if witch is not None:
+        witch.unload()
+    witch = None
+    npcs = spatial.SpatialHash(GRID_CELL_SIZE)
+    near_npcs = []
+    world_items = spatial.SpatialHash(GRID_CELL_SIZE)
+    animated_items.clear()
+    arrow_active = True
+    current_map = 'map'
 
-    # 시작 페이지 로드
-    startpage.load_startpage()
-    # 엔딩 페이지 로드
-    endpage.load_endpage()
-    game_state = 'startpage'
-
-    # 타일맵 초기화
-    tilemap.load_tiles()
+    # 이동 플래그 초기화
+    move_up = move_down = move_left = move_right = False
 
-    # pot 맵 초기화
-    pot.load_tiles()
-    pot.load_pots()
 
-    # arrow 이미지 로드
-    arrow_image = load_image('resources/arrow.png')
-    arrow_active = True
-    current_map = 'map'
+def build_world():
+    """witch를 만들고 NPC와 과일을 맵에 배치합니다."""
+    global witch
+    width, height = world_size
 
     current_path = os.path.dirname(__file__)
     resources_path = os.path.join(current_path, 'resources')
-    witch_file_candidates = ['B_witch_run.png']
 
     def find_file(folder, candidates):
         for name in candidates:
@@ -169,201 +302,203 @@ def init(width=800, height=600):
                 return p
         return None
 
-    witch_file = find_file(resources_path, witch_file_candidates)
+    witch_file = find_file(resources_path, WITCH_FILE_CANDIDATES)
     # witch 파일은 필수
     if witch_file is None:
-        raise FileNotFoundError('리소스 파일을 찾을 수 없습니다: {}'.format(witch_file_candidates))
+        raise FileNotFoundError('리소스 파일을 찾을 수 없습니다: {}'.format(WITCH_FILE_CANDIDATES))
 
     witch = Witch(witch_file)
 
-    # 이동 플래그 초기화
-    move_up = move_down = move_left = move_right = False
+    # NPC 초기화 (과일이 NPC 위에 놓이지 않도록 먼저 배치)
+    try:
+        girl1 = NPC.from_id('girl1_idle', load_image_now=True)
+        spawn_npc(girl1, 600, 300)
+    except FileNotFoundError:
+        pass
 
-    # 초기 월드 아이템 설정: apple과 blue_item을 생성해 world_items에 넣음
-
-    world_items = []
-    # 캔버스 크기를 기준으로 랜덤한 위치에 과일들을 배치
-    def random_pos_avoiding(avoid_points=None, margin=50, min_dist=80, max_attempts=200):
-        """랜덤 위치를 반환하되 avoid_points 리스트(각 항목은 (x,y))로부터 min_dist 이상 떨어지게 합니다."""
-        if avoid_points is None:
-            avoid_points = []
-        # 기본값 초기화
-        rx = margin
-        ry = margin
-        attempts = 0
-        while attempts < max_attempts:
-            rx = random.randint(margin, max(margin, width - margin))
-            ry = random.randint(margin, max(margin, height - margin))
-            ok = True
-            for (ax, ay) in avoid_points:
-                if math.hypot(rx - ax, ry - ay) < min_dist:
-                    ok = False
-                    break
-            if ok:
-                return rx, ry
-            attempts += 1
-        # 실패 시 마지막으로 생성한 값을 반환
-        return rx, ry
-
-    # 5가지 과일 종류 정의: (index, name)
+    # 초기 월드 아이템 설정: 캔버스 크기를 기준으로 랜덤한 위치에 과일들을 배치
+    # 5가지 과일 종류 정의: (카탈로그 ID, name)
     fruit_types = [
-        (0, 'apple'),
-        (3, 'grape'),
-        (7, 'banana'),
-        (12, 'peach'),
-        (15, 'cherry')
+        ('apple', 'apple'),
+        ('grape', 'grape'),
+        ('banana', 'banana'),
+        ('peach', 'peach'),
+        ('strawberry', 'cherry')
     ]
+    spawn_fruits(fruit_types, FRUIT_COUNT, width, height)
+
+
+def sync_scene():
+    """씬 스택 맨 위 씬에 맞춰 game_state와 current_map을 바꿉니다. 씬을 전환한 뒤 호출합니다."""
+    global game_state, current_map
+    top = scene_stack.top
+    game_state = top.state
+    if top.map is not None:
+        current_map = top.map
+    request_redraw()
+
 
-    # 랜덤하게 10개의 과일 선택 (종류와 개수 모두 랜덤)
-    fruits_to_spawn = [random.choice(fruit_types) for _ in range(10)]
+def start_game():
+    """시작 페이지에서 맵으로 전환합니다. 처음 시작하면 게임 월드를 만듭니다.
+    미리 로드가 아직 끝나지 않았으면 남은 에셋을 모두 올릴 때까지 기다립니다."""
+    start_preload()
+    asset_preloader.finish()
+    scene_stack.replace(scenes.overworld)
+    sync_scene()
+    if witch is None:
+        build_world()
 
-    # avoid list: 우선 witch 위치을 추가하여 과일이 너무 가깝게 스폰되지 않도록 함
-    avoid = [(witch.x, witch.y)]
-    # 또한 이미 스폰된 과일끼리 겹치지 않도록 처리
-    for idx, fruit_name in fruits_to_spawn:
+
+# ---- 입력 동작 (keymap 표에서 호출됨, False를 반환하면 게임 종료) ----
+
+def action_quit():
+    return False
+
+
+def action_start():
+    """시작 페이지에서 게임 시작"""
+    start_game()
+    print('게임 시작!')
+
+
+def move_action(flag):
+    """이동 플래그 flag('move_up' 등)를 켜고 끄는 (press, release) 핸들러 쌍을 만듭니다."""
+    def press():
+        globals()[flag] = True
+
+    def release():
+        globals()[flag] = False
+    return press, release
+
+
+def action_run_press():
+    global is_shift_pressed
+    is_shift_pressed = True
+    if witch is not None:
+        witch.is_running = True
+
+
+def action_run_release():
+    global is_shift_pressed
+    is_shift_pressed = False
+    if witch is not None:
+        witch.is_running = False
+
+
+def select_slot_action(idx):
+    """숫자키: 선택 슬롯을 idx로 바꾸는 핸들러를 만듭니다."""
+    def press():
+        if witch is not None:
+            # clamp to inventory range inside select_slot
+            witch.select_slot(idx)
+    return press
+
+
+def interact_pot():
+    """pot 맵에서 E키: pot 근처에서 source 투입"""
+    if not pot.check_near_pot(witch.x, witch.y):
+        return
+    # 현재 선택된 슬롯의 아이템 가져오기
+    selected_idx = witch.get_selected_slot()
+    item = witch.get_item(selected_idx)
+    if item is None:
+        print('들고 있는 아이템이 없습니다')
+    # source 타입만 pot에 투입 가능
+    elif item.item_type != 'source':
+        print('pot에는 source만 투입할 수 있습니다')
+    # pot에 아이템 추가 (성공하면 True, 실패하면 False)
+    elif pot.add_resource_to_pot(item):
+        # 성공했으면 witch 인벤토리에서 아이템 제거
+        witch.remove_from_inventory(selected_idx)
+
+
+def interact_npc():
+    """map 맵에서 E키: 가까운 NPC에게 item 전달"""
+    for npc in npcs.query_radius(witch.x, witch.y, NPC_INTERACTION_RADIUS):
         try:
-            f = Fruit.from_index(idx, name=fruit_name, load_image_now=True)
-            rx, ry = random_pos_avoiding(avoid_points=avoid, min_dist=PICKUP_RADIUS + 20)
-            spawn_world_item(f, rx, ry)
-            # 새로 배치한 위치를 avoid 목록에 추가하여 다음 과일과 충돌 방지
-            avoid.append((rx, ry))
-        except FileNotFoundError:
-            # 파일이 없으면 그냥 넘김
-            pass
+            # 현재 선택된 슬롯의 아이템 가져오기
+            selected_idx = witch.get_selected_slot()
+            item = witch.get_item(selected_idx)
+            if item is None:
+                print('들고 있는 아이템이 없습니다')
+            # item 타입만 NPC에게 전달 가능
+            elif item.item_type != 'item':
+                print('NPC에게는 item만 전달할 수 있습니다')
+            else:
+                # NPC에게 아이템 전달
+                npc.receive_item(item)
+                # witch 인벤토리에서 아이템 제거
+                witch.remove_from_inventory(selected_idx)
+                # 건넨 아이템은 풀로 돌아감
+                pool.release(item)
+                check_npc_ending(npc)
+        except Exception as ex:
+            print('상호작용 중 오류:', ex)
+
+
+def action_interact():
+    """게임 중 E키: NPC 상호작용 또는 pot에 아이템 투입"""
+    if witch is None:
+        return
+    if current_map == 'pot':
+        interact_pot()
+    elif current_map == 'map' and npcs:
+        interact_npc()
+
+
+# 동작 목록: 어떤 키에 묶이는지는 keymap.DEFAULT_BINDINGS / keymap.json이 정함
+ACTIONS = [
+    keymap.Action('quit', action_quit),
+    keymap.Action('start', action_start, states=('startpage',)),
+    # Q키를 누르면 엔딩 페이지로 전환 (게임 중일 때만)
+    keymap.Action('end_game', end_game, states=('game',)),
+    # F3키: 프레임 프로파일 오버레이 켜기/끄기
+    keymap.Action('toggle_profiler', profiler.toggle_overlay),
+    keymap.Action('move_up', *move_action('move_up')),
+    keymap.Action('move_down', *move_action('move_down')),
+    keymap.Action('move_left', *move_action('move_left')),
+    keymap.Action('move_right', *move_action('move_right')),
+    # Shift 키: 달리기
+    keymap.Action('run', action_run_press, action_run_release),
+    keymap.Action('interact', action_interact, states=('game',)),
+] + [keymap.Action('slot_{}'.format(i), select_slot_action(i)) for i in range(10)]
 
-    # NPC 초기화
-    npcs = []
-    try:
-        girl1 = NPC.from_filename('girl1_idle.png', load_image_now=True)
-        girl1.x = 600
-        girl1.y = 300
-        npcs.append(girl1)
-    except FileNotFoundError:
-        pass
 
 def handle_events():
-    """이벤트 처리: 종료 이벤트가 감지되면 False를 반환합니다."""
-    global move_up, move_down, move_left, move_right, game_state, is_shift_pressed
-
-    events = get_events()
-    for e in events:
+    """이벤트 처리: 종료 이벤트가 감지되면 False를 반환합니다.
+    키 이벤트는 (게임 상태, 이벤트 종류, 키) 표에서 핸들러를 한 번에 찾아 호출합니다."""
+    for e in get_events():
         if e.type == SDL_QUIT:
             return False
-        elif e.type == SDL_KEYDOWN:
-            if e.key == SDLK_ESCAPE:
-                return False
-            # 시작 페이지에서 E키를 누르면 게임 시작
-            elif e.key == SDLK_e and game_state == 'startpage':
-                game_state = 'game'
-                print('게임 시작!')
-            # Q키를 누르면 엔딩 페이지로 전환 (게임 중일 때만)
-            elif e.key == SDLK_q and game_state == 'game':
-                end_game()
-            elif e.key == SDLK_UP or e.key == SDLK_w:
-                move_up = True
-            elif e.key == SDLK_DOWN or e.key == SDLK_s:
-                move_down = True
-            elif e.key == SDLK_LEFT or e.key == SDLK_a:
-                move_left = True
-            elif e.key == SDLK_RIGHT or e.key == SDLK_d:
-                move_right = True
-            # Shift 키: 달리기
-            elif e.key == SDLK_LSHIFT or e.key == SDLK_RSHIFT:
-                is_shift_pressed = True
-                if witch is not None:
-                    witch.is_running = True
-            # 숫자키(0~9) 입력: 선택 슬롯 변경
-            elif e.key in (SDLK_0, SDLK_1, SDLK_2, SDLK_3, SDLK_4, SDLK_5, SDLK_6, SDLK_7, SDLK_8, SDLK_9):
-                key_to_index = {
-                    SDLK_0:0, SDLK_1:1, SDLK_2:2, SDLK_3:3, SDLK_4:4,
-                    SDLK_5:5, SDLK_6:6, SDLK_7:7, SDLK_8:8, SDLK_9:9
-                }
-                idx = key_to_index.get(e.key, None)
-                if idx is not None and witch is not None:
-                    # clamp to inventory range inside select_slot
-                    witch.select_slot(idx)
-            # e키 입력: NPC 상호작용 또는 pot에 아이템 투입
-            elif e.key == SDLK_e:
-                if game_state != 'game':
-                    # 게임 상태가 아니면 무시
-                    pass
-                elif current_map == 'pot' and witch is not None:
-                    # pot 맵에서 E키: pot 근처에서 source 투입
-                    if pot.check_near_pot(witch.x, witch.y):
-                        # 현재 선택된 슬롯의 아이템 가져오기
-                        selected_idx = witch.get_selected_slot()
-                        item = witch.get_item(selected_idx)
-                        if item is not None:
-                            # source 타입만 pot에 투입 가능
-                            if getattr(item, 'item_type', None) == 'source':
-                                # pot에 아이템 추가 (성공하면 True, 실패하면 False)
-                                if pot.add_resource_to_pot(item):
-                                    # 성공했으면 witch 인벤토리에서 아이템 제거
-                                    witch.remove_from_inventory(selected_idx)
-                            else:
-                                print('pot에는 source만 투입할 수 있습니다')
-                        else:
-                            print('들고 있는 아이템이 없습니다')
-                elif current_map == 'map' and witch is not None and npcs:
-                    # map 맵에서 E키: NPC와 상호작용
-                    # 가까운 NPC 찾기
-                    for npc in npcs:
-                        try:
-                            dx = npc.x - witch.x
-                            dy = npc.y - witch.y
-                            dist = math.hypot(dx, dy)
-                            # NPC 근처에서 e키를 누르면 item 전달
-                            if dist <= NPC_INTERACTION_RADIUS:
-                                # 현재 선택된 슬롯의 아이템 가져오기
-                                selected_idx = witch.get_selected_slot()
-                                item = witch.get_item(selected_idx)
-                                if item is not None:
-                                    # item 타입만 NPC에게 전달 가능
-                                    if getattr(item, 'item_type', None) == 'item':
-                                        # NPC에게 아이템 전달
-                                        npc.receive_item(item)
-                                        # witch 인벤토리에서 아이템 제거
-                                        witch.remove_from_inventory(selected_idx)
-                                    else:
-                                        print('NPC에게는 item만 전달할 수 있습니다')
-                                else:
-                                    print('들고 있는 아이템이 없습니다')
-                        except Exception as ex:
-                            print('상호작용 중 오류:', ex)
-        elif e.type == SDL_KEYUP:
-            if e.key == SDLK_UP or e.key == SDLK_w:
-                move_up = False
-            elif e.key == SDLK_DOWN or e.key == SDLK_s:
-                move_down = False
-            elif e.key == SDLK_LEFT or e.key == SDLK_a:
-                move_left = False
-            elif e.key == SDLK_RIGHT or e.key == SDLK_d:
-                move_right = False
-            # Shift 키를 뗄 때: 달리기 종료
-            elif e.key == SDLK_LSHIFT or e.key == SDLK_RSHIFT:
-                is_shift_pressed = False
-                if witch is not None:
-                    witch.is_running = False
+        handler = key_table.get((game_state, e.type, e.key))
+        if handler is not None and handler() is False:
+            return False
     return True
 
 
-def update():
-    global witch, world_items, move_up, move_down, move_left, move_right
+def update(dt=0.05):
+    """게임 상태를 dt(초)만큼 진행합니다. 종료해야 하면 False를 반환합니다."""
+    global witch, world_items, near_npcs, move_up, move_down, move_left, move_right
     global arrow_active, current_map, game_state, ending_timer
 
     # 엔딩 타이머 업데이트
     if ending_timer is not None:
-        ending_timer += 0.05  # main.py의 delay(0.05)와 동일
+        ending_timer += dt
         if ending_timer >= ending_delay:
             # 2초가 지나면 프로그램 종료
             return False  # 게임 종료 신호
 
+    # 시작 페이지에서는 미리 로드한 에셋의 업로드만 진행
+    if game_state == 'startpage':
+        pump_preloader()
+
     # 시작 페이지 또는 엔딩 페이지 상태에서는 업데이트하지 않음
     if game_state == 'startpage' or game_state == 'endpage':
         return
 
+    t = profiler.start()
     if witch:
-        witch.update()
+        witch.update(dt)
     # 이동 벡터 계산 (8방향)
     vx = (1 if move_right else 0) - (1 if move_left else 0)
     vy = (1 if move_up else 0) - (1 if move_down else 0)
@@ -372,10 +507,10 @@ def update():
         length = math.hypot(vx, vy)
         nx = vx / length
         ny = vy / length
-        # 달릴 때는 속도 2배 증가
+        # 달릴 때는 속도 2배 증가 (speed는 픽셀/초)
         current_speed = witch.speed * 2 if witch.is_running else witch.speed
-        dx = nx * current_speed
-        dy = ny * current_speed
+        dx = nx * current_speed * dt
+        dy = ny * current_speed * dt
 
         # 이동 전 위치 저장
         prev_x = witch.x
@@ -397,8 +532,9 @@ def update():
         dy = arrow_y - witch.y
         dist = math.hypot(dx, dy)
         if dist <= PICKUP_RADIUS:
-            # 맵을 pot으로 전환
-            current_map = 'pot'
+            # 맵을 pot으로 전환 (맵은 스택에 남은 채로 pot 방을 올림)
+            scene_stack.push(scenes.pot_room)
+            sync_scene()
             arrow_active = False
             pot.arrow_active = True  # pot 맵의 arrow 활성화
             print('맵이 pot으로 전환되었습니다!')
@@ -409,148 +545,143 @@ def update():
         dy = pot.ARROW_Y - witch.y
         dist = math.hypot(dx, dy)
         if dist <= PICKUP_RADIUS:
-            # 맵을 map으로 전환
-            current_map = 'map'
+            # 맵을 map으로 전환 (pot 방 에셋은 반납됨)
+            scene_stack.pop()
+            sync_scene()
             pot.arrow_active = False
             arrow_active = True  # map의 arrow 활성화
             # world_items 랜덤 재생성 (witch와 npcs는 유지)
             respawn_world_items()
             print('맵이 map으로 전환되었습니다! 아이템이 재생성되었습니다.')
+    profiler.stop('update.movement', t)
 
     # pot 맵 애니메이션 및 제작 업데이트
+    t = profiler.start()
     if current_map == 'pot':
-        result = pot.update_pots()
+        result = pot.update_pots(dt)
         # 아이템 생성
         if result and result.startswith('create_item:'):
             try:
                 # 결과 아이템 파일명 추출
                 item_filename = result.split(':', 1)[1]
-                from item import Item
-                new_item = Item.from_filename(item_filename, load_image_now=True)
-                # pot 하단의 랜덤 위치에 스폰
-                import random
+                new_item = pool.items.acquire(catalog.get_by_filename('item', item_filename))
+                # pot 하단의 랜덤 위치에 스폰 (pot 몸통과 이미 놓인 물약은 피함)
                 # pot 하단 영역: x는 pot 주변, y는 pot 아래쪽
-                spawn_x = random.randint(pot.POT_X - 100, pot.POT_X + 100)
-                spawn_y = random.randint(100, 200)  # pot 하단 영역
+                region = (pot.POT_X - 100, 100, pot.POT_X + 100, 200)
+                zones = [spawner.Rect(pot.POT_BBOX_LEFT, pot.POT_BBOX_BOTTOM, pot.POT_BBOX_RIGHT, pot.POT_BBOX_TOP)]
+                zones += [spawner.Circle(it.x, it.y, CRAFTED_ITEM_MIN_DIST) for it in pot_world_items]
+                points = spawner.sample(1, region, CRAFTED_ITEM_MIN_DIST, exclusions=zones)
+                if points:
+                    spawn_x, spawn_y = points[0]
+                else:
+                    # 자리가 없으면 겹치더라도 영역 안에 놓음
+                    spawn_x = random.uniform(region[0], region[2])
+                    spawn_y = random.uniform(region[1], region[3])
                 new_item.x = spawn_x
                 new_item.y = spawn_y
-                pot_world_items.append(new_item)
-                print(f'{item_filename} 아이템이 pot 하단에 생성되었습니다! (위치: {spawn_x}, {spawn_y})')
+                pot_world_items.insert(new_item)
+                print(f'{item_filename} 아이템이 pot 하단에 생성되었습니다! (위치: {spawn_x:.0f}, {spawn_y:.0f})')
             except Exception as ex:
                 print(f'아이템 생성 중 오류: {ex}')
+    profiler.stop('update.pot', t)
 
     # 월드 아이템 위치는 고정(줍기/버리기 시에만 변경됨)
 
-    # 월드 아이템의 애니메이션(있는 경우)을 갱신
-    for it in list(world_items):
-        try:
-            if hasattr(it, 'update'):
-                it.update()
-        except Exception:
-            pass
-
-    # NPC 업데이트
-    for npc in npcs:
-        try:
-            if hasattr(npc, 'update'):
-                npc.update()
-        except Exception:
-            pass
+    # 애니메이션이 있는 월드 아이템만 갱신 (NPC는 아직 애니메이션이 없음)
+    t = profiler.start()
+    for it in animated_items:
+        it.update(dt)
+    profiler.stop('update.animation', t)
 
     # --- 충돌 기반 자동 획득 처리 ---
-    # witch 주변의 월드 아이템을 검사하여 거리 <= PICKUP_RADIUS이면 자동으로 인벤토리에 담습니다.
+    t = profiler.start()
+    # witch 주변의 월드 아이템을 공간 해시로 찾아 거리 <= PICKUP_RADIUS이면 자동으로 인벤토리에 담습니다.
     if witch is not None and current_map == 'map' and world_items:
-        for it in list(world_items):
+        for it in world_items.query_radius(witch.x, witch.y, PICKUP_RADIUS):
+            # 충돌로 자동 획득 시도
             try:
-                dx = it.x - witch.x
-                dy = it.y - witch.y
-            except Exception:
-                # 좌표가 없으면 무시
+                idx = witch.add_to_inventory(it)
+            except ValueError:
+                # 인벤토리 가득 참: 획득 실패
+                print('인벤토리 가득: 아이템을 획득할 수 없습니다')
                 continue
-            dist = math.hypot(dx, dy)
-            if dist <= PICKUP_RADIUS:
-                # 충돌로 자동 획득 시도
-                try:
-                    idx = witch.add_to_inventory(it)
-                except ValueError:
-                    # 인벤토리 가득 참: 획득 실패
-                    print('인벤토리 가득: 아이템을 획득할 수 없습니다')
-                    continue
-                # 성공적으로 인벤토리에 담았으면 월드에서 제거 및 콘솔에 출력
-                remove_world_item(it)
-                name = getattr(it, 'name', None) or getattr(it, 'filename', str(it))
-                print('{} 획득'.format(name))
+            # 성공적으로 인벤토리에 담았으면 월드에서 제거 및 콘솔에 출력
+            remove_world_item(it)
+            name = it.name or it.filename
+            print('{} 획득'.format(name))
 
     # pot 맵에서의 아이템 획득 처리
     if witch is not None and current_map == 'pot' and pot_world_items:
-        for it in list(pot_world_items):
+        for it in pot_world_items.query_radius(witch.x, witch.y, PICKUP_RADIUS):
             try:
-                dx = it.x - witch.x
-                dy = it.y - witch.y
-            except Exception:
+                idx = witch.add_to_inventory(it)
+            except ValueError:
+                print('인벤토리 가득: 아이템을 획득할 수 없습니다')
                 continue
-            dist = math.hypot(dx, dy)
-            if dist <= PICKUP_RADIUS:
-                try:
-                    idx = witch.add_to_inventory(it)
-                except ValueError:
-                    print('인벤토리 가득: 아이템을 획득할 수 없습니다')
-                    continue
-                # 성공적으로 인벤토리에 담았으면 pot_world_items에서 제거
-                pot_world_items.remove(it)
-                name = getattr(it, 'name', None) or getattr(it, 'filename', str(it))
-                print('{} 획득'.format(name))
+            # 성공적으로 인벤토리에 담았으면 pot_world_items에서 제거
+            pot_world_items.remove(it)
+            name = it.name or it.filename
+            print('{} 획득'.format(name))
+
+    profiler.stop('update.pickup', t)
 
     # --- NPC 상호작용 처리 ---
-    # witch와 NPC의 거리를 체크하여 가까우면 메시지 표시
+    # witch 근처의 NPC만 공간 해시로 찾아 메시지 표시
+    t = profiler.start()
     if witch is not None and npcs:
-        for npc in npcs:
+        near = npcs.query_radius(witch.x, witch.y, NPC_INTERACTION_RADIUS)
+        # 지난번에 가까웠다가 멀어진 NPC는 메시지를 끔
+        for npc in near_npcs:
+            if npc not in near:
+                npc.show_message = False
+                npc.was_near = False
+        for npc in near:
             try:
-                dx = npc.x - witch.x
-                dy = npc.y - witch.y
-                dist = math.hypot(dx, dy)
-                is_near = dist <= NPC_INTERACTION_RADIUS
-
                 # 거리가 가까우면 메시지 표시
-                if is_near:
-                    npc.show_message = True
-                    # 멀었다가 다시 가까워지면 메시지 타입 결정
-                    if not npc.was_near:
-                        # 호감도가 11 이상이고 두 번째 힌트를 아직 표시하지 않았으면 두 번째 힌트 표시
-                        if npc.heart >= 11 and not npc.hint2_shown:
-                            npc.message_type = "hint2"
-                            npc.hint2_shown = True
-                            print('NPC 힌트 2: Try Only Peaches')
-                        # 호감도가 5 이상이고 첫 번째 힌트를 아직 표시하지 않았으면 첫 번째 힌트 표시
-                        elif npc.heart >= 5 and not npc.hint_shown:
-                            npc.message_type = "hint"
-                            npc.hint_shown = True
-                            print('NPC 힌트 1: Try Only Grapes')
-                        else:
-                            npc.message_type = "default"
-                else:
-                    npc.show_message = False
+                npc.show_message = True
+                # 멀었다가 다시 가까워지면 메시지 타입 결정
+                if not npc.was_near:
+                    # 호감도가 11 이상이고 두 번째 힌트를 아직 표시하지 않았으면 두 번째 힌트 표시
+                    if npc.heart >= 11 and not npc.hint2_shown:
+                        npc.message_type = "hint2"
+                        npc.hint2_shown = True
+                        print('NPC 힌트 2: Try Only Peaches')
+                    # 호감도가 5 이상이고 첫 번째 힌트를 아직 표시하지 않았으면 첫 번째 힌트 표시
+                    elif npc.heart >= 5 and not npc.hint_shown:
+                        npc.message_type = "hint"
+                        npc.hint_shown = True
+                        print('NPC 힌트 1: Try Only Grapes')
+                    else:
+                        npc.message_type = "default"
 
                 # 현재 상태를 저장
-                npc.was_near = is_near
-
-                # 호감도가 30 이상이면 엔딩 페이지로 전환
-                if npc.heart >= 30 and game_state == 'game':
-                    print('NPC 호감도 30 달성! 엔딩 페이지로 전환합니다.')
-                    game_state = 'endpage'
-                    ending_timer = 0.0  # 타이머 시작
+                npc.was_near = True
             except Exception:
                 pass
+        near_npcs = near
+    profiler.stop('update.npc', t)
 
 
 def render():
-    global current_map, arrow_active, arrow_image, game_state
+    global needs_redraw
+
+    # 정적 화면은 바뀐 것이 없으면 다시 그리지 않음
+    if is_idle() and not needs_redraw:
+        return
+    needs_redraw = False
+
     clear_canvas()
 
     # 시작 페이지 상태일 때는 시작 페이지만 표시
     if game_state == 'startpage':
-        startpage.draw_startpage()
+        progress = None
+        if not is_ready():
+            progress = asset_preloader.progress() if asset_preloader is not None else 0.0
+        startpage.draw_startpage(progress)
         update_canvas()
+        startup.mark('first_frame')
+        # 첫 화면이 나간 뒤에 미리 로드 시작
+        start_preload()
         return
 
     # 엔딩 페이지 상태일 때는 엔딩 페이지만 표시
@@ -559,55 +690,90 @@ def render():
         update_canvas()
         return
 
+    # 그리기 명령을 렌더 큐에 모은 뒤 한 번에 그림
+    # (화면 밖 명령은 제출 시 걸러지고, 같은 레이어 안에서는 텍스처별로 묶여 그려짐)
     # 현재 맵 상태에 따라 다른 맵 그리기
     if current_map == 'map':
         # 타일맵 먼저 그리기 (배경)
-        tilemap.draw_map()
+        queue.submit_call(render_queue.LAYER_BACKGROUND, 0, tilemap.draw_map)
 
         # arrow 그리기 (아직 밟지 않았다면)
+        arrow_image = tilemap.arrow_image
         if arrow_active and arrow_image:
-            arrow_image.draw(arrow_x, arrow_y)
+            queue.submit(render_queue.LAYER_GROUND, 0, arrow_image, arrow_image.draw, (arrow_x, arrow_y),
+                         arrow_x, arrow_y, arrow_image.w, arrow_image.h)
 
         # map 상태일 때만 월드 아이템과 NPC 그리기
-        # 월드 아이템 그리기
-        for it in list(world_items):
-            try:
-                # 각 아이템이 개별적으로 원하는 스케일을 가질 수 있게 지원
-                scale = getattr(it, 'draw_scale', 1.0)
-                it.draw(scale=scale)
-            except Exception:
-                pass
+        # 월드 아이템 그리기 (각 아이템의 draw_scale 사용)
+        for it in world_items:
+            it.submit_draw(queue)
         # NPC 그리기
         for npc in npcs:
-            try:
-                npc.draw()
-            except Exception:
-                pass
+            npc.submit_draw(queue)
 
     elif current_map == 'pot':
         # pot 맵 그리기
-        pot.draw_map()
-        pot.draw_pots()
+        queue.submit_call(render_queue.LAYER_BACKGROUND, 0, pot.draw_map)
+        queue.submit_call(render_queue.LAYER_GROUND, 0, pot.draw_pots)
         # pot에 투입된 아이템들 그리기
-        pot.draw_pot_resources()
+        queue.submit_call(render_queue.LAYER_GROUND, 1, pot.draw_pot_resources)
         # pot 맵의 월드 아이템 그리기
-        for it in list(pot_world_items):
-            try:
-                scale = getattr(it, 'draw_scale', 1.0)
-                it.draw(scale=scale)
-            except Exception:
-                pass
-        # pot의 arrow가 활성화되어 있으면 그리기
+        for it in pot_world_items:
+            it.submit_draw(queue)
+        # pot의 arrow가 활성화되어 있으면 그리기 (월드 아이템(z 0) 위에 보이도록 같은 레이어의 z 1)
         if pot.arrow_active:
-            pot.draw_arrow()  # y축 회전된 arrow 그리기
+            queue.submit_call(render_queue.LAYER_ITEMS, 1, pot.draw_arrow)  # y축 회전된 arrow 그리기
 
     # witch를 맨 나중에 그리기 (최상단) - 모든 맵에서 표시
     if witch:
-        witch.draw()
+        queue.submit_call(render_queue.LAYER_PLAYER, 0, witch.draw)
+        # 인벤토리 핫바 (화면 아래 가운데)
+        queue.submit_call(render_queue.LAYER_PLAYER, 1, witch.draw_hotbar, (world_size[0] // 2,))
+    queue.flush()
+
+    # 레이어별 그리기 시간을 프로파일러 단계로 옮김
+    layer_times = queue.layer_times
+    profiler.add('render.map', layer_times.get(render_queue.LAYER_BACKGROUND, 0.0) +
+                 layer_times.get(render_queue.LAYER_GROUND, 0.0))
+    profiler.add('render.items', layer_times.get(render_queue.LAYER_ITEMS, 0.0))
+    profiler.add('render.npcs', layer_times.get(render_queue.LAYER_ACTORS, 0.0) +
+                 layer_times.get(render_queue.LAYER_LABELS, 0.0))
+    profiler.add('render.witch', layer_times.get(render_queue.LAYER_PLAYER, 0.0))
+
+    # F3으로 켜는 프레임 프로파일 오버레이
+    profiler.draw_overlay()
     update_canvas()
 
 
 def cleanup():
+    global witch
+    # PROFILE_CSV가 지정되어 있으면 프레임 기록 저장
+    profiler.export_on_exit()
+    if asset_preloader is not None:
+        asset_preloader.cancel()
+    # 텍스처는 마지막 Image 참조가 사라질 때 해제되고, 렌더러가 살아 있을 때 해제되어야 함
+    # assets.clear()는 캐시 dict만 비우므로, 그 전에 이미지를 쥔 곳을 모두 반납함
+    labels.clear()
+    if scene_stack is not None:
+        # 타일, arrow, pot, 구운 배경 등 씬이 로드한 이미지
+        scene_stack.clear()
+    if witch is not None:
+        for item in witch.clear_inventory():
+            pool.release(item)
+        witch.unload()
+        witch = None
+    for items in (world_items, pot_world_items):
+        for it in items:
+            pool.release(it)
+        items.clear()
+    animated_items.clear()
+    for npc in npcs:
+        npc.unload()
+    npcs.clear()
+    near_npcs.clear()
+    pot.clear_pot_resources()
+    pool.clear()
+    assets.clear()
     close_canvas()
 
 
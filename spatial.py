@@ -0,0 +1,112 @@
+import math
+
+# 균일 격자 공간 해시
+# 위치(x, y 속성)를 가진 엔티티를 cell_size 크기의 칸에 나누어 담습니다.
+# 반경 검색은 원이 걸치는 칸만 훑으므로, 전체 엔티티 수가 아니라 주변 밀도에 비례해 비용이 듭니다.
+#
+# 사용법:
+#   items = SpatialHash(80)
+#   items.insert(fruit)                       # fruit.x, fruit.y 기준으로 칸에 넣음
+#   for it in items.query_radius(x, y, 60):   # (x, y)에서 60픽셀 안의 엔티티
+#       ...
+#   items.remove(fruit)                       # O(1)
+# 엔티티를 옮긴 뒤에는 move(entity)로 칸을 다시 정해야 합니다.
+#
+# 반복(for it in items), len(), in 은 넣은 순서를 따릅니다.
+
+
+class SpatialHash:
+    """엔티티를 격자 칸별로 보관하는 집합. 삽입/삭제 O(1), 반경 검색은 걸치는 칸 수에 비례."""
+
+    def __init__(self, cell_size=80):
+        self.cell_size = cell_size
+        # (cx, cy) -> {entity: None} (넣은 순서를 유지하는 집합으로 사용)
+        self._cells = {}
+        # entity -> 들어 있는 칸. 넣은 순서대로 반복하는 데에도 사용
+        self._entity_cells = {}
+
+    def _cell_of(self, x, y):
+        size = self.cell_size
+        return int(x // size), int(y // size)
+
+    def insert(self, entity):
+        """entity를 현재 위치의 칸에 넣습니다. 이미 들어 있으면 칸만 다시 정합니다."""
+        if entity in self._entity_cells:
+            self.move(entity)
+            return
+        cell = self._cell_of(entity.x, entity.y)
+        self._entity_cells[entity] = cell
+        bucket = self._cells.get(cell)
+        if bucket is None:
+            bucket = self._cells[cell] = {}
+        bucket[entity] = None
+
+    def remove(self, entity):
+        """entity를 빼냅니다. 들어 있지 않으면 KeyError."""
+        cell = self._entity_cells.pop(entity)
+        bucket = self._cells[cell]
+        del bucket[entity]
+        if not bucket:
+            del self._cells[cell]
+
+    def discard(self, entity):
+        """entity가 들어 있으면 빼냅니다. 뺐으면 True."""
+        if entity not in self._entity_cells:
+            return False
+        self.remove(entity)
+        return True
+
+    def move(self, entity):
+        """entity의 x, y가 바뀐 뒤 호출해 칸을 다시 정합니다."""
+        old_cell = self._entity_cells[entity]
+        cell = self._cell_of(entity.x, entity.y)
+        if cell == old_cell:
+            return
+        bucket = self._cells[old_cell]
+        del bucket[entity]
+        if not bucket:
+            del self._cells[old_cell]
+        self._entity_cells[entity] = cell
+        bucket = self._cells.get(cell)
+        if bucket is None:
+            bucket = self._cells[cell] = {}
+        bucket[entity] = None
+
+    def query_radius(self, x, y, radius):
+        """(x, y)에서 거리 radius 이하인 엔티티 목록을 반환합니다."""
+        size = self.cell_size
+        min_cx = int((x - radius) // size)
+        max_cx = int((x + radius) // size)
+        min_cy = int((y - radius) // size)
+        max_cy = int((y + radius) // size)
+        cells = self._cells
+        result = []
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    continue
+                for entity in bucket:
+                    if math.hypot(entity.x - x, entity.y - y) <= radius:
+                        result.append(entity)
+        return result
+
+    def clear(self):
+        self._cells.clear()
+        self._entity_cells.clear()
+
+    def __iter__(self):
+        # 반복 중에 넣거나 뺄 때는 list(index)로 복사해서 반복하세요
+        return iter(self._entity_cells)
+
+    def __len__(self):
+        return len(self._entity_cells)
+
+    def __contains__(self, entity):
+        return entity in self._entity_cells
+
+    def __repr__(self):
+        return '<SpatialHash {} entities in {} cells, cell_size={}>'.format(
+            len(self._entity_cells), len(self._cells), self.cell_size)
+
+# end of spatial.py
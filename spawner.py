@@ -0,0 +1,143 @@
+import math
+import random
+
+# 배경 격자를 쓰는 Poisson-disk 스포너 (다트 던지기 + Bridson 채우기)
+# 영역 안에 서로 min_dist 이상 떨어진 점들을 고르게 뽑습니다.
+# 격자 칸 크기를 min_dist로 두면 후보 하나를 검사할 때 주변 3x3칸만 보면 되고, 한 칸에는 점이
+# 몇 개(최대 4개)밖에 들어가지 않습니다. 그래서 이미 놓인 점 수와 관계없이 후보 검사 비용이 일정합니다.
+#
+# 사용법:
+#   zones = [spawner.Circle(witch.x, witch.y, 80), spawner.Rect(l, b, r, t)]
+#   points = spawner.sample(10, (50, 50, 750, 550), 80, exclusions=zones)
+#
+# 남은 공간이 없으면 겹치는 점을 만들지 않고 count개보다 적게 반환합니다.
+# 난수는 rng(기본: random 모듈)에서만 뽑으므로 같은 시드면 같은 결과가 나옵니다.
+
+# 활성 점 하나 주변에서 시도할 후보 수 (Bridson 논문의 k)
+CANDIDATES = 30
+
+
+class Circle:
+    """중심 (x, y), 반지름 radius 안을 제외하는 영역"""
+
+    __slots__ = ('x', 'y', 'radius')
+
+    def __init__(self, x, y, radius):
+        self.x = x
+        self.y = y
+        self.radius = radius
+
+    def contains(self, x, y):
+        dx = x - self.x
+        dy = y - self.y
+        return dx * dx + dy * dy < self.radius * self.radius
+
+
+class Rect:
+    """(left, bottom) ~ (right, top) 사각형 안을 제외하는 영역"""
+
+    __slots__ = ('left', 'bottom', 'right', 'top')
+
+    def __init__(self, left, bottom, right, top):
+        self.left = left
+        self.bottom = bottom
+        self.right = right
+        self.top = top
+
+    def contains(self, x, y):
+        return self.left <= x <= self.right and self.bottom <= y <= self.top
+
+
+def sample(count, region, min_dist, exclusions=(), rng=random, candidates=CANDIDATES):
+    """region=(left, bottom, right, top) 안에서 서로 min_dist 이상 떨어지고
+    exclusions의 어느 영역에도 들지 않는 점을 최대 count개 반환합니다. [(x, y), ...]
+
+    자리가 넉넉하면 영역 전체에 무작위로 던진 후보 중 맞는 것을 쓰고, 빽빽하면 영역을 가득 채운 뒤
+    그중 count개를 무작위로 고르므로 어느 경우에도 점들이 한쪽에 몰리지 않습니다.
+    """
+    left, bottom, right, top = region
+    if count <= 0 or right < left or top < bottom:
+        return []
+
+    cell = min_dist
+    cols = int((right - left) / cell) + 1
+    rows = int((top - bottom) / cell) + 1
+    # 칸마다 들어 있는 점 목록
+    grid = [[] for _ in range(cols * rows)]
+    min_dist_sq = min_dist * min_dist
+    points = []
+    active = []
+
+    def fits(x, y):
+        if x < left or x > right or y < bottom or y > top:
+            return False
+        for zone in exclusions:
+            if zone.contains(x, y):
+                return False
+        cx = int((x - left) / cell)
+        cy = int((y - bottom) / cell)
+        for gy in range(max(cy - 1, 0), min(cy + 2, rows)):
+            row = gy * cols
+            for gx in range(max(cx - 1, 0), min(cx + 2, cols)):
+                for px, py in grid[row + gx]:
+                    dx = px - x
+                    dy = py - y
+                    if dx * dx + dy * dy < min_dist_sq:
+                        return False
+        return True
+
+    def add(x, y):
+        point = (x, y)
+        grid[int((y - bottom) / cell) * cols + int((x - left) / cell)].append(point)
+        points.append(point)
+        active.append(point)
+
+    # 1단계: 영역 전체에서 무작위 후보를 던져 맞는 것만 놓음 (격자 덕분에 후보 하나당 검사 비용이 일정)
+    # 자리가 넉넉하면 여기서 count개가 금방 채워지고, 점들은 영역 전체에 고르게 퍼짐
+    failures = 0
+    while len(points) < count and failures < candidates:
+        x = rng.uniform(left, right)
+        y = rng.uniform(bottom, top)
+        if fits(x, y):
+            add(x, y)
+            failures = 0
+        else:
+            failures += 1
+    if len(points) >= count:
+        return points
+
+    # 2단계: 무작위 후보가 계속 실패할 만큼 빽빽해지면, 놓인 점들 주변 [min_dist, 2*min_dist) 고리에서
+    # 후보를 뽑아 남은 틈을 채운 뒤 그중 count개를 고름 (Bridson)
+    while True:
+        while active:
+            i = rng.randrange(len(active))
+            px, py = active[i]
+            for _ in range(candidates):
+                angle = rng.uniform(0.0, 2.0 * math.pi)
+                dist = rng.uniform(min_dist, 2.0 * min_dist)
+                x = px + dist * math.cos(angle)
+                y = py + dist * math.sin(angle)
+                if fits(x, y):
+                    add(x, y)
+                    break
+            else:
+                # 더 이상 주변에 놓을 곳이 없음: 활성 목록에서 제거 (순서는 중요하지 않으므로 O(1) 교환 삭제)
+                active[i] = active[-1]
+                active.pop()
+
+        # 제외 영역 때문에 끊긴 빈 곳이 남았으면 새 씨앗 점에서 다시 채움
+        for _ in range(candidates):
+            x = rng.uniform(left, right)
+            y = rng.uniform(bottom, top)
+            if fits(x, y):
+                add(x, y)
+                break
+        else:
+            break
+
+    if len(points) > count:
+        return rng.sample(points, count)
+    rng.shuffle(points)
+    return points
+
+# end of spawner.py
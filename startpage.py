@@ -1,27 +1,55 @@
 from pico2d import *
+import assets
+import labels
 
 # 시작 페이지 이미지
 startpage_image = None
 # 폰트
 font = None
 
+# 로딩 진행률 막대 위치와 크기
+LOADING_BAR_X = 250
+LOADING_BAR_Y = 50
+LOADING_BAR_WIDTH = 300
+LOADING_BAR_HEIGHT = 8
+
 def load_startpage():
     """시작 페이지 이미지를 로드합니다."""
     global startpage_image, font
-    startpage_image = load_image('resources/tiles/start_page.png')
-    font = load_font('ENCR10B.TTF', 40)
+    if startpage_image is None:
+        startpage_image = assets.get_image('resources/tiles/start_page.png')
+    if font is None:
+        font = assets.get_font('ENCR10B.TTF', 40)
 
-def draw_startpage():
-    """시작 페이지를 화면에 그립니다."""
+def draw_startpage(progress=None):
+    """시작 페이지를 화면에 그립니다. progress(0.0~1.0)를 주면 아래에 로딩 진행률 막대를 그립니다."""
     if startpage_image:
         # 이미지를 화면 중앙에 맞춰서 그리기
         startpage_image.draw(400, 300, 800, 600)
 
     # "press E" 문구 출력
     if font:
-        font.draw(425, 100, 'press E', (255, 255, 255))
+        labels.draw_label(font, 425, 100, 'press E', (255, 255, 255))
+
+    if progress is not None:
+        draw_loading_bar(progress)
+
+def draw_loading_bar(progress):
+    """로딩 진행률 막대를 그립니다."""
+    left = LOADING_BAR_X
+    bottom = LOADING_BAR_Y
+    top = bottom + LOADING_BAR_HEIGHT
+    filled = left + int(LOADING_BAR_WIDTH * max(0.0, min(progress, 1.0)))
+    if filled > left:
+        draw_rectangle(left, bottom, filled, top, 255, 255, 255, 255, True)
+    draw_rectangle(left, bottom, left + LOADING_BAR_WIDTH, top, 255, 255, 255)
 
 def cleanup_startpage():
     """시작 페이지 리소스를 정리합니다."""
-    global startpage_image
-    startpage_image = None
\ No newline at end of file
+    global startpage_image, font
+    if startpage_image is not None:
+        assets.release_image('resources/tiles/start_page.png')
+        startpage_image = None
+    if font is not None:
+        assets.release_font('ENCR10B.TTF', 40)
+        font = None
\ No newline at end of file
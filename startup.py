@@ -0,0 +1,198 @@
+import builtins
+import importlib
+import importlib.util
+import json
+import os
+import platform
+import sys
+import time
+
+# 시작 시간 프로파일러
+# 실행할 때마다 다음을 기록해 보고서(JSON)로 남깁니다.
+#   - 모듈별 import 시간 (처음 import될 때만, 하위 import를 포함한 시간과 뺀 시간)
+#   - 파일별 에셋 로드 시간 (assets가 직접 로드한 것과 preloader가 미리 로드한 것)
+#   - 단계별 시각: imports(게임 모듈 import 끝) / init / first_frame(첫 화면) / interactive(미리 로드 끝)
+# 최신 보고서는 STARTUP_REPORT(기본: startup_report.json)에 덮어쓰고, 요약 한 줄은
+# 같은 폴더의 startup_history.jsonl에 이어 붙여 릴리스마다 시작 시간을 비교할 수 있게 합니다.
+# STARTUP_REPORT를 빈 문자열로 지정하면 보고서를 쓰지 않습니다.
+#
+# 지연 import 모드 (환경 변수 LAZY_IMPORTS=1):
+#   lazy_import(name)으로 가져온 모듈은 속성을 처음 쓸 때 실행됩니다.
+#   그래서 pot 방, 엔딩 페이지처럼 나중 씬에서만 쓰는 모듈은 첫 화면을 그린 뒤에 로드됩니다.
+#
+# 사용법 (main.py):
+#   import startup
+#   startup.begin()          # pico2d와 게임 모듈을 import하기 전에
+#   import source
+#   startup.mark('imports')
+#   startup.watch_assets()
+#   ...
+#   startup.write_report()
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPORT_PATH = os.environ.get('STARTUP_REPORT', os.path.join(BASE_DIR, 'startup_report.json'))
+HISTORY_NAME = 'startup_history.jsonl'
+
+LAZY = os.environ.get('LAZY_IMPORTS', '') not in ('', '0')
+
+_clock = time.perf_counter
+_began = None
+_original_import = None
+# import 중인 모듈마다 하위 import에 쓴 시간 합계 (self 시간 계산용)
+_import_stack = []
+# (모듈 이름, 전체 초, self 초, 시작 시각)
+_imports = []
+# (경로, 폰트 크기 또는 None, 초, 미리 로드 여부, 시각)
+_assets = []
+_marks = {}
+_written = False
+
+
+def begin():
+    """시작 시각을 기록하고 import 시간 측정을 켭니다. 가장 먼저 호출하세요."""
+    global _began, _original_import
+    if _began is not None:
+        return
+    _began = _clock()
+    _original_import = builtins.__import__
+    builtins.__import__ = _timed_import
+
+
+def _elapsed():
+    return _clock() - _began
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level:
+        package = globals.get('__package__') if globals else None
+        try:
+            full_name = importlib.util.resolve_name('.' * level + name, package)
+        except (ImportError, ValueError):
+            full_name = name
+    else:
+        full_name = name
+    if full_name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    return _timed(full_name, _original_import, name, globals, locals, fromlist, level)
+
+
+def _timed(full_name, func, *args):
+    """func(*args)를 실행하고 full_name 모듈의 import 시간으로 기록합니다."""
+    started = _clock()
+    _import_stack.append(0.0)
+    try:
+        return func(*args)
+    finally:
+        total = _clock() - started
+        children = _import_stack.pop()
+        if _import_stack:
+            _import_stack[-1] += total
+        _imports.append((full_name, total, total - children, started - _began))
+
+
+class _TimedLoader:
+    """지연 모듈이 실제로 실행될 때 걸린 시간을 import 기록에 남기는 로더 래퍼"""
+
+    def __init__(self, loader):
+        self.loader = loader
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        _timed(module.__name__, self.loader.exec_module, module)
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+
+def lazy_import(name):
+    """LAZY 모드면 속성을 처음 쓸 때 실행되는 모듈을, 아니면 보통 import한 모듈을 반환합니다."""
+    if name in sys.modules:
+        # 이미 (지연) 로드된 모듈. 여기서 import 문을 거치면 지연 모듈이 곧바로 실행되므로 그대로 반환
+        return sys.modules[name]
+    if not LAZY:
+        # builtins.__import__를 거치게 해서 import 시간 측정에 포함
+        __import__(name)
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError('모듈을 찾을 수 없습니다: {}'.format(name), name=name)
+    real_loader = spec.loader if _began is None else _TimedLoader(spec.loader)
+    loader = importlib.util.LazyLoader(real_loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def watch_assets():
+    """assets의 로드 시간을 기록하도록 연결합니다. (pico2d를 설치한 뒤에 호출)"""
+    import assets
+    assets.load_listener = record_asset
+
+
+def record_asset(path, size, seconds, preloaded=False):
+    if _began is None:
+        return
+    _assets.append((path, size, seconds, preloaded, _elapsed()))
+
+
+def mark(name):
+    """단계 시각을 기록합니다. 같은 이름은 처음 한 번만 기록됩니다."""
+    if _began is not None and name not in _marks:
+        _marks[name] = _elapsed()
+
+
+def marked(name):
+    return name in _marks
+
+
+def _ms(seconds):
+    return round(seconds * 1000.0, 3)
+
+
+def report():
+    """보고서 dict를 반환합니다."""
+    imports = sorted(_imports, key=lambda rec: rec[2], reverse=True)
+    assets = sorted(_assets, key=lambda rec: rec[2], reverse=True)
+    return {
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'lazy_imports': LAZY,
+        'marks_ms': {name: _ms(t) for name, t in sorted(_marks.items(), key=lambda item: item[1])},
+        'imports': [{'module': name, 'total_ms': _ms(total), 'self_ms': _ms(own), 'at_ms': _ms(at)}
+                    for name, total, own, at in imports],
+        'assets': [{'path': os.path.relpath(path, BASE_DIR), 'size': size, 'ms': _ms(seconds),
+                    'preloaded': preloaded, 'at_ms': _ms(at)}
+                   for path, size, seconds, preloaded, at in assets],
+    }
+
+
+def write_report(path=REPORT_PATH):
+    """보고서를 path에 쓰고 요약을 기록 파일에 한 줄 추가합니다. 한 번 실행에 한 번만 씁니다."""
+    global _written
+    if _began is None or _written or not path:
+        return None
+    _written = True
+    data = report()
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    summary = {
+        'time': data['time'],
+        'lazy_imports': LAZY,
+        'marks_ms': data['marks_ms'],
+        'import_ms': _ms(sum(own for _, _, own, _ in _imports)),
+        'asset_ms': _ms(sum(seconds for _, _, seconds, _, _ in _assets)),
+        'assets': len(_assets),
+    }
+    with open(os.path.join(os.path.dirname(os.path.abspath(path)), HISTORY_NAME), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(summary, ensure_ascii=False) + '\n')
+    marks = data['marks_ms']
+    print('시작 시간: 첫 화면 {} ms, 상호작용 가능 {} ms (보고서: {})'.format(
+        marks.get('first_frame', '-'), marks.get('interactive', '-'), path))
+    return data
+
+# end of startup.py
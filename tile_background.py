@@ -0,0 +1,76 @@
+import gfx
+
+# 구워 둔 타일 배경
+# map.py와 pot.py가 함께 씁니다. 타일을 매 프레임 한 장씩 그리지 않고,
+# 처음 그릴 때 화면 크기 텍스처 한 장으로 구워 두고 그 텍스처만 그립니다.
+# 구울 때 맵 데이터와 타일 표의 사본을 남겨 두고, 그릴 때 지금 내용과 비교해 달라졌으면 다시 굽습니다.
+# (리스트/dict 비교라 새 객체를 만들지 않음) 같은 객체의 이미지 내용만 바뀐 경우처럼
+# 비교로 알 수 없는 변경은 invalidate()로 알려 주세요.
+# 굽기에 실패하면(렌더 타깃 미지원 등) 타일을 직접 그리고, 내용이 바뀌거나 invalidate()할 때까지 다시 굽지 않습니다.
+#
+# 사용법:
+#   background = TileBackground(MAP_DATA, tile_images, 50, 800, 600)
+#   MAP_DATA[3][4] = 2        # 다음 draw()에서 알아서 다시 구움
+#   background.invalidate()   # 비교로 알 수 없는 변경을 알릴 때
+#   background.draw()         # 필요할 때만 굽고, 구운 텍스처를 그림
+
+
+class TileBackground:
+    """map_data(행 목록, 위쪽 행부터)의 타일 번호를 tiles(번호 -> atlas.Sprite)로 그린 배경.
+    map_data와 tiles는 참조로 보관하고, 내용이 구울 때와 달라지면 다음 draw()에서 다시 굽습니다."""
+
+    def __init__(self, map_data, tiles, tile_size, width, height):
+        self.map_data = map_data
+        self.tiles = tiles
+        self.tile_size = tile_size
+        self.width = width
+        self.height = height
+        self.image = None
+        # 다시 구워야 하는지 (invalidate()가 켬)
+        self.dirty = True
+        # 굽기에 실패했는지. 실패한 내용 그대로면 다시 시도하지 않고 타일을 직접 그림
+        self.failed = False
+        # 마지막으로 구운(또는 굽기에 실패한) 맵 데이터와 타일 표의 사본
+        self._baked_rows = None
+        self._baked_tiles = None
+
+    def invalidate(self):
+        """구운 배경을 버립니다. 다음 draw()에서 다시 굽습니다."""
+        self.image = None
+        self.dirty = True
+
+    def is_stale(self):
+        """구운 뒤 invalidate()가 불렸거나 맵 데이터/타일 표가 바뀌었는지"""
+        return self.dirty or self.map_data != self._baked_rows or self.tiles != self._baked_tiles
+
+    def draw_tiles(self):
+        """타일을 한 장씩 그립니다. (배경 텍스처를 구울 때와 굽기 실패 시 사용)"""
+        size = self.tile_size
+        tiles = self.tiles
+        for row, line in enumerate(self.map_data):
+            # 화면 좌표 계산 (왼쪽 아래가 (0,0))
+            y = self.height - (row * size + size // 2)
+            for col, tile_num in enumerate(line):
+                sprite = tiles.get(tile_num)
+                if sprite is not None:
+                    sprite.draw(col * size + size // 2, y, size, size)
+
+    def draw(self):
+        """구운 배경을 그립니다. 내용이 바뀌었거나 invalidate() 이후 처음 그릴 때만 다시 굽습니다."""
+        if self.is_stale():
+            self._baked_rows = [list(row) for row in self.map_data]
+            self._baked_tiles = dict(self.tiles)
+            self.dirty = False
+            try:
+                self.image = gfx.bake_image(self.width, self.height, self.draw_tiles)
+                self.failed = False
+            except IOError:
+                # 렌더 타깃을 지원하지 않는 환경: 내용이 바뀔 때까지 매 프레임 타일을 직접 그림
+                self.image = None
+                self.failed = True
+        if self.failed:
+            self.draw_tiles()
+        else:
+            self.image.draw(self.width // 2, self.height // 2)
+
+# end of tile_background.py
@@ -1,49 +1,115 @@
 from pico2d import *
+import os
+import animation
+import assets
+import inventory
+import labels
 
-class Run:
-    def __init__(self, witch):
-        self.witch = witch
+# 상태 이름 -> (시트 파일, 프레임 크기, 프레임 수, 프레임 길이(초), 반복 여부)
+# run 시트는 Witch(image_path)로 바꿀 수 있습니다. 시트는 그 상태를 처음 재생할 때 로드됩니다.
+BLUE_WITCH_DIR = os.path.join('resources', 'Blue_witch')
+CLIPS = {
+    'run': (os.path.join('resources', 'B_witch_run.png'), (32, 48), 8, 0.1, True),
+    'idle': (os.path.join(BLUE_WITCH_DIR, 'B_witch_idle.png'), (32, 48), 6, 0.1, True),
+    'charge': (os.path.join(BLUE_WITCH_DIR, 'B_witch_charge.png'), (48, 48), 5, 0.1, True),
+    'attack': (os.path.join(BLUE_WITCH_DIR, 'B_witch_attack.png'), (104, 46), 9, 0.08, False),
+    'take_damage': (os.path.join(BLUE_WITCH_DIR, 'B_witch_take_damage.png'), (32, 48), 3, 0.1, False),
+    'death': (os.path.join(BLUE_WITCH_DIR, 'B_witch_death.png'), (32, 48), 10, 0.1, False),
+}
 
-    def enter(self, e):
-        # 방향을 로컬 변수가 아니라 witch 인스턴스 속성으로 설정합니다.
-        self.witch.dir = 1
-        self.witch.face_dir = 1
 
-    def exit(self, e):
-        pass
+class ItemView:
+    """아이템 한 종류를 인벤토리에서 그리는 방법. 그 종류가 처음 인벤토리에 들어올 때 한 번 정하고
+    같은 종류의 슬롯들이 함께 씁니다. 매 프레임에는 여기 담긴 텍스처와 영역만 씁니다.
+    (그릴 때 속성 확인이나 파일 로드가 없음)
+      - image, rect: 텍스처와 clip_draw 영역 (left, bottom, w, h)
+      - draw_func: 텍스처를 알 수 없는 객체는 그 객체의 draw(x, y)
+      - icon_size: 핫바 칸에 맞춘 크기
+      - source: 만들 때의 item.image (같은 이름이어도 이미지가 다르면 다시 만듦)
+    """
 
-    def do(self):
-        self.witch.frame = (self.witch.frame + 1) % 8
-        self.witch.x += self.witch.dir * 5
+    __slots__ = ('image', 'rect', 'draw_func', 'icon_size', 'source')
+
+    def __init__(self, item, icon_box=28):
+        self.image = None
+        self.rect = None
+        self.draw_func = None
+        if getattr(item, 'image', None) is None and hasattr(item, 'load'):
+            item.load()
+        image = self.source = getattr(item, 'image', None)
+        rects = getattr(item, 'rects', None)
+        if image is not None and rects:
+            # 프레임 애니메이션 아이템: 인벤토리에서는 진행하지 않으므로 지금 프레임으로 고정
+            self.rect = rects[getattr(item, 'frame', 0)]
+        elif image is not None and getattr(item, 'w', None) is not None:
+            self.rect = (getattr(item, 'clip_x', 0), getattr(item, 'clip_y', 0), item.w, item.h)
+        elif image is not None:
+            self.rect = (0, 0, image.w, image.h)
+        elif callable(getattr(item, 'draw', None)):
+            self.draw_func = item.draw
+        if self.rect is not None:
+            self.image = image
+            w, h = self.rect[2], self.rect[3]
+            k = min(icon_box / w, icon_box / h)
+            self.icon_size = (round(w * k), round(h * k))
+        else:
+            self.icon_size = (icon_box, icon_box)
+
+    def draw(self, x, y, w=None, h=None):
+        """(x, y) 중심에 그립니다. 크기를 주지 않으면 원본 크기."""
+        if self.image is not None:
+            left, bottom, fw, fh = self.rect
+            self.image.clip_draw(left, bottom, fw, fh, x, y, w or fw, h or fh)
+        elif self.draw_func is not None:
+            self.draw_func(x, y)
 
-    def draw(self):
-        if self.witch.face_dir == 1: # right
-            self.witch.image.clip_draw(self.witch.frame * 100, 100, 100, 100, self.witch.x, self.witch.y)
-        else: #face_dir == -1: # left
-            self.witch.image.clip_draw(self.witch.frame * 100, 0, 100, 100, self.witch.x, self.witch.y)
 
 class Witch:
-    """Witch 클래스: 이미지 경로를 받아 인스턴스 생성 시 이미지를 로드합니다.
+    """Witch 클래스: run 시트 경로(생략하면 CLIPS의 기본값)를 받습니다.
+    생성할 때는 run 시트만 로드하고, 나머지 상태의 시트는 처음 재생할 때 로드합니다.
     open_canvas()는 반드시 호출된 뒤에 인스턴스를 생성하세요.
     """
-    def __init__(self, image_path):
-        # load_image는 캔버스가 열린 상태에서 호출되어야 안전합니다.
-        self.image = load_image(image_path)
+    # 원본 32x48 프레임을 100x100으로 그리는 배율. 모든 시트에 같은 배율을 써서 캐릭터 크기를 맞춤
+    DRAW_SCALE = (100 / 32, 100 / 48)
+    # 인벤토리 칸 수 (숫자 키 0~9로 고르는 칸)
+    INVENTORY_SLOTS = 10
+    # 핫바: 화면 아래쪽에 모든 칸을 한 줄로 표시 (칸 크기, 칸 간격, 중심 높이, 아이콘 크기)
+    HOTBAR_SLOT_SIZE = 32
+    HOTBAR_SPACING = 36
+    HOTBAR_Y = 24
+    HOTBAR_ICON_SIZE = 26
+    # 쌓인 개수 라벨
+    COUNT_FONT = ('ENCR10B.TTF', 12)
+    COUNT_COLOR = (255, 255, 255)
+
+    def __init__(self, image_path=None):
+        # 시트 로드는 캔버스가 열린 상태에서만 안전하므로 open_canvas() 이후에 생성하세요.
+        self.clips = self.make_clips(image_path)
+        self.anim = animation.Player()
         self.x = 400
         self.y = 300
-        self.frame = 0
         # 방향 속성 추가 (기본값)
         self.dir = 1
         self.face_dir = 1
-        # 이동 속도 (픽셀/프레임)
-        self.speed = 5
+        # 이동 속도 (픽셀/초). 20 FPS 기준 프레임당 5픽셀과 같음
+        self.speed = 100
         # 달리기 상태
         self.is_running = False
-        # 애니메이션 업데이트 카운터
-        self.frame_counter = 0
+        # play()로 재생 중인 한 번짜리 동작 (attack 등). 끝나면 run으로 돌아감
+        self.action = None
+        self.anim.play(self.clips['run'])
 
-        # 인벤토리: 15칸 고정 (None은 빈 슬롯)
-        self.inventory = [None] * 10
+        # 인벤토리: INVENTORY_SLOTS칸, 같은 아이템은 한 칸에 쌓임 (inventory.py)
+        self.inventory = inventory.Inventory(self.INVENTORY_SLOTS)
+        # 슬롯별 ItemView / 쌓인 개수 / 개수 라벨 (빈 슬롯은 None, 0, None)
+        # 인벤토리를 바꾸는 메서드가 바뀐 슬롯만 갱신함
+        self.slot_views = [None] * self.inventory.capacity
+        self.slot_counts = [0] * self.inventory.capacity
+        self.slot_labels = [None] * self.inventory.capacity
+        # 아이템 이름 -> ItemView, 개수 -> 라벨 (종류마다/개수마다 한 번만 만듦)
+        self.item_views = {}
+        self.count_labels = {}
+        self.count_font = None
 
         # 화면에 표시할 선택 슬롯 (0~9 입력으로 변경 가능)
         # 기본값은 0번 슬롯
@@ -51,22 +117,59 @@ class Witch:
 
          # 슬롯->오프셋 매핑: 모든 슬롯이 witch로부터 같은 위치에 표시되도록 고정
          # witch 옆 20픽셀 떨어진 곳에 고정
-        self.slot_offsets = {i: (20, 0) for i in range(len(self.inventory))}
+        self.slot_offsets = {i: (20, 0) for i in range(self.inventory.capacity)}
 
-    def update(self):
-        # 애니메이션 프레임 갱신 (달릴 때는 더 빠르게)
-        self.frame_counter += 1
+    @classmethod
+    def make_clips(cls, run_path=None):
+        """상태 이름 -> animation.Clip. 시트는 아직 로드하지 않습니다."""
+        sx, sy = cls.DRAW_SCALE
+        clips = {}
+        for name, (path, frame_size, count, frame_time, loop) in CLIPS.items():
+            if name == 'run' and run_path is not None:
+                path = run_path
+            draw_size = (round(frame_size[0] * sx), round(frame_size[1] * sy))
+            sheet = animation.Sheet(path, frame_size, draw_size, count)
+            clips[name] = animation.Clip(sheet, frame_time, loop, name)
+        return clips
 
-        if self.is_running:
-            # 달릴 때는 2배 빠르게 (매 프레임마다)
-            if self.frame_counter >= 1:
-                self.frame = (self.frame + 1) % 8
-                self.frame_counter = 0
-        else:
-            # 걸을 때는 기본 속도 (2프레임마다 1번)
-            if self.frame_counter >= 2:
-                self.frame = (self.frame + 1) % 8
-                self.frame_counter = 0
+    @classmethod
+    def texture_paths(cls, run_path=None, states=('run',)):
+        """states의 시트를 로드할 때 읽는 파일 (미리 로드 목록용)"""
+        clips = cls.make_clips(run_path)
+        return [clips[name].sheet.texture_path() for name in states]
+
+    def play(self, name):
+        """한 번짜리 동작(attack, take_damage, death 등)을 재생합니다. 반복 클립이면 stop()까지 계속됩니다."""
+        self.action = name
+        self.anim.play(self.clips[name], restart=True)
+
+    def stop(self):
+        """play()로 시작한 동작을 멈추고 run으로 돌아갑니다."""
+        self.action = None
+
+    def update(self, dt=0.05):
+        """애니메이션을 dt(초)만큼 진행합니다. 서 있을 때도 run 프레임을 돌림 (달릴 때는 2배 빠르게)"""
+        if self.action is not None and self.anim.done and self.action != 'death':
+            self.action = None
+        if self.action is None:
+            self.anim.play(self.clips['run'])
+        self.anim.speed = 2.0 if self.is_running else 1.0
+        self.anim.update(dt)
+
+    def unload(self):
+        """로드한 시트를 모두 반납합니다."""
+        for clip in self.clips.values():
+            clip.sheet.unload()
+        if self.count_font is not None:
+            assets.release_font(*self.COUNT_FONT)
+            self.count_font = None
+        # 라벨과 아이템 그림은 반납한 텍스처를 가리키므로 함께 버림
+        capacity = self.inventory.capacity
+        self.item_views.clear()
+        self.count_labels.clear()
+        self.slot_views = [None] * capacity
+        self.slot_counts = [0] * capacity
+        self.slot_labels = [None] * capacity
 
     def move(self, dx, dy):
         """외부에서 호출하는 이동 메서드: dx,dy는 픽셀 단위 이동량입니다."""
@@ -88,13 +191,12 @@ class Witch:
         - base_x, base_y: 좌표(기본은 witch.x, witch.y)
         - scale: 출력 크기 비율(1.0이면 원본 크기)
 
-        이 함수는 아이템이 None이면 아무 것도 하지 않습니다.
-        아이템이 자체 draw()를 제공하면 호출하고, 그렇지 않으면 image 속성을 사용해 그립니다.
+        그리는 방법은 아이템이 슬롯에 들어올 때 정해 둔 slot_views에서 꺼냅니다. 빈 슬롯이면 아무 것도 하지 않습니다.
         """
-        if slot_index < 0 or slot_index >= len(self.inventory):
+        if slot_index < 0 or slot_index >= self.inventory.capacity:
             return
-        it = self.inventory[slot_index]
-        if it is None:
+        view = self.slot_views[slot_index]
+        if view is None:
             return
 
         bx = self.x if base_x is None else base_x
@@ -106,55 +208,35 @@ class Witch:
         draw_x = bx + self.dir * ox
         draw_y = by + oy
 
-        # 우선 item.draw(surface_x, surface_y, scale)를 호출할 수 있는지 확인
-        # (프로젝트 관습상 draw 메서드는 보통 draw() 또는 draw(x,y) 형태임)
-        if hasattr(it, 'draw'):
-            try:
-                # 시그니처가 여러 가지일 수 있으니 안전하게 호출
-                it.draw(draw_x, draw_y)
-                return
-            except TypeError:
-                try:
-                    it.draw()
-                    return
-                except Exception:
-                    pass
-
-        # draw()가 없거나 실패하면 image 속성을 사용
-        img = getattr(it, 'image', None)
-        # 일부 객체는 filename/name 만 가지므로 파일에서 직접 로드 시도
-        if img is None:
-            fname = getattr(it, 'filename', None) or getattr(it, 'name', None)
-            if isinstance(fname, str):
-                try:
-                    img = load_image(fname)
-                except Exception:
-                    img = None
-
-        # 이미지가 있으면 중심 기준으로 그리되, scale에 따라 크기 변환
-        if img is not None:
-            try:
-                # 이미지 크기를 알 수 없으므로 기본 박스 크기 16x16 또는 48x48을 사용
-                w, h = getattr(it, 'w', None), getattr(it, 'h', None)
-                if w is None or h is None:
-                    # try to get image size (pico2d Image 객체는 .w .h 속성이 없음)
-                    # 안전하게 16x16 기본값 사용
-                    w, h = 16, 16
-                img.draw(draw_x, draw_y)
-            except Exception:
-                # 마지막 수단: clip_draw 전체 이미지
-                try:
-                    img.draw(draw_x, draw_y)
-                except Exception:
-                    pass
+        if scale == 1.0 or view.rect is None:
+            view.draw(draw_x, draw_y)
+        else:
+            view.draw(draw_x, draw_y, int(view.rect[2] * scale), int(view.rect[3] * scale))
+
+    def draw_hotbar(self, center_x, y=None):
+        """모든 인벤토리 칸을 center_x를 가운데로 한 줄로 그립니다. 선택한 칸은 노란 테두리."""
+        y = self.HOTBAR_Y if y is None else y
+        size = self.HOTBAR_SLOT_SIZE
+        half = size / 2
+        views = self.slot_views
+        count_labels = self.slot_labels
+        x = center_x - (len(views) - 1) * self.HOTBAR_SPACING / 2
+        for i, view in enumerate(views):
+            if i == self.selected_slot:
+                draw_rectangle(x - half, y - half, x + half, y + half, 255, 220, 0)
+            else:
+                draw_rectangle(x - half, y - half, x + half, y + half, 255, 255, 255)
+            if view is not None:
+                view.draw(x, y, *view.icon_size)
+                label = count_labels[i]
+                if label is not None:
+                    # 칸의 오른쪽 아래에 개수
+                    labels.draw_image_label(label, x + half - label.w - 1, y - half + 7)
+            x += self.HOTBAR_SPACING
 
     def draw(self):
-        # 기존 소스와 동일한 clip_draw 호출을 유지합니다.
-        # (left, bottom, w, h, dx, dy, dw, dh)
-        if self.face_dir == 1: # right
-            self.image.clip_draw(0, self.frame * 48, 48, 48, self.x, self.y, 100, 100)
-        else: #face_dir == -1: # left
-            self.image.clip_composite_draw(0, self.frame * 48, 48, 48, 0, 'h', self.x, self.y, 100, 100)
+        # 프레임 영역은 시트를 로드할 때 만든 표에서 꺼냄 (왼쪽을 볼 때는 좌우 반전)
+        self.anim.draw(self.x, self.y, flip='' if self.face_dir == 1 else 'h')
 
         # 현재 선택된 슬롯의 아이템을 witch의 옆에 그립니다.
         # 선택 슬롯은 게임 루프에서 witch.select_slot(n)으로 변경할 수 있습니다.
@@ -172,53 +254,91 @@ class Witch:
         # 권장 입력 범위 0~9, 내부적으로는 0~len(inventory)-1로 제한
         if idx < 0:
             idx = 0
-        if idx >= len(self.inventory):
-            idx = len(self.inventory) - 1
+        if idx >= self.inventory.capacity:
+            idx = self.inventory.capacity - 1
         self.selected_slot = idx
 
     def get_selected_slot(self):
         return getattr(self, 'selected_slot', 0)
 
     # --- Inventory helper methods ---
+    # 인벤토리는 아래 메서드로만 바꾸세요. 바뀐 슬롯의 표시 정보(slot_views 등)를 함께 갱신합니다.
+    # slot_counts는 인벤토리의 슬롯별 개수와 항상 같으므로, 넣고 뺄 때 인벤토리를 다시 묻지 않습니다.
+    def _item_view(self, item):
+        """item 종류의 ItemView. 종류마다 한 번 만들고, 그 사이 이미지가 바뀌었을 때만 다시 만듦"""
+        key = inventory.item_key(item)
+        view = self.item_views.get(key)
+        if view is None or view.source is not getattr(item, 'image', None):
+            view = self.item_views[key] = ItemView(item, self.HOTBAR_ICON_SIZE)
+        return view
+
+    def _count_label(self, count):
+        """쌓인 개수 라벨. 2개 미만이면 None"""
+        if count < 2:
+            return None
+        label = self.count_labels.get(count)
+        if label is None:
+            if self.count_font is None:
+                self.count_font = assets.get_font(*self.COUNT_FONT)
+            label = self.count_labels[count] = labels.get_label(self.count_font, str(count), self.COUNT_COLOR)
+        return label
+
     def add_to_inventory(self, item):
-        """첫 번째 빈 슬롯에 item을 넣습니다. 성공하면 인덱스를 반환하고, 가득 차 있으면 ValueError를 발생시킵니다."""
-        for i in range(len(self.inventory)):
-            if self.inventory[i] is None:
-                self.inventory[i] = item
-                return i
-        raise ValueError('Inventory is full')
+        """같은 아이템이 쌓인 슬롯이나 첫 번째 빈 슬롯에 item을 넣습니다.
+        성공하면 인덱스를 반환하고, 넣을 곳이 없으면 ValueError(InventoryFull)를 발생시킵니다."""
+        index = self.inventory.add(item)
+        count = self.slot_counts[index] + 1
+        self.slot_counts[index] = count
+        if count == 1:
+            self.slot_views[index] = self._item_view(item)
+        else:
+            # 같은 종류가 쌓임: 그림은 그대로, 개수 라벨만 바꿈
+            self.slot_labels[index] = self._count_label(count)
+        return index
 
     def remove_from_inventory(self, index):
-        """주어진 인덱스의 아이템을 제거하고 반환합니다. 인덱스가 비어있으면 None을 반환합니다."""
-        if index < 0 or index >= len(self.inventory):
-            raise IndexError('Inventory index out of range')
-        item = self.inventory[index]
-        self.inventory[index] = None
+        """주어진 인덱스의 맨 위 아이템 하나를 제거하고 반환합니다. 인덱스가 비어있으면 None을 반환합니다."""
+        item = self.inventory.remove(index)
+        if item is not None:
+            count = self.slot_counts[index] - 1
+            self.slot_counts[index] = count
+            self.slot_labels[index] = self._count_label(count)
+            if not count:
+                self.slot_views[index] = None
         return item
 
     def swap_inventory(self, i, j):
-        """두 인덱스에 있는 아이템을 교환합니다."""
-        if not (0 <= i < len(self.inventory)) or not (0 <= j < len(self.inventory)):
-            raise IndexError('Inventory index out of range')
-        self.inventory[i], self.inventory[j] = self.inventory[j], self.inventory[i]
+        """두 인덱스에 있는 아이템(쌓인 것 전체)을 교환합니다."""
+        self.inventory.swap(i, j)
+        for table in (self.slot_views, self.slot_counts, self.slot_labels):
+            table[i], table[j] = table[j], table[i]
+
+    def clear_inventory(self):
+        """인벤토리를 비우고 들어 있던 아이템 목록을 반환합니다."""
+        capacity = self.inventory.capacity
+        self.slot_views = [None] * capacity
+        self.slot_counts = [0] * capacity
+        self.slot_labels = [None] * capacity
+        return self.inventory.clear()
 
     def get_item(self, index):
-        """인덱스에 있는 아이템을 반환(읽기 전용)."""
-        if index < 0 or index >= len(self.inventory):
-            raise IndexError('Inventory index out of range')
-        return self.inventory[index]
+        """인덱스의 맨 위 아이템을 반환(읽기 전용)."""
+        return self.inventory.get(index)
+
+    def count_item(self, name):
+        """이름이 name인 아이템의 전체 개수"""
+        return self.inventory.count(name)
 
     def inventory_summary(self):
-        """인벤토리의 요약 리스트를 반환합니다: (index, item_name_or_None)."""
+        """인벤토리의 요약 리스트를 반환합니다: (index, item_name_or_None, count)."""
         summary = []
         for i, it in enumerate(self.inventory):
             if it is None:
-                summary.append((i, None))
+                summary.append((i, None, 0))
             else:
-                name = getattr(it, 'name', None) or getattr(it, 'filename', repr(it))
-                summary.append((i, name))
+                summary.append((i, inventory.item_key(it), self.inventory.count_at(i)))
         return summary
 
-    def has_space(self):
-        """빈 슬롯이 있는지 여부를 반환합니다."""
-        return any(x is None for x in self.inventory)
\ No newline at end of file
+    def has_space(self, item=None):
+        """빈 슬롯이 있는지 여부를 반환합니다. item을 주면 그 아이템을 쌓을 자리도 셉니다."""
+        return self.inventory.has_space(item)